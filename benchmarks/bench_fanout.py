@@ -0,0 +1,101 @@
+"""Coordinator update fan-out: one listener per entity vs. the entry dispatcher.
+
+Builds the real per-car sensors for N cars against a fake coordinator and times one
+update until every entity has rendered its state (value + attributes), with per-entity
+listeners and with `CarUpdateDispatcher`.
+
+    python benchmarks/bench_fanout.py [--cars 1 10 50 100] [--rounds 20]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for path in (ROOT, os.path.join(ROOT, "tests", "stubs")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from custom_components.ha_opencarwings import sensor as sensor_mod  # noqa: E402
+from custom_components.ha_opencarwings.dispatcher import CarUpdateDispatcher  # noqa: E402
+
+
+class _Coordinator:
+    def __init__(self, data):
+        self.data = data
+        self.last_update_time = None
+        self._listeners = []
+
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def update(self, data):
+        self.data = data
+        for listener in list(self._listeners):
+            listener()
+
+
+def _cars(n: int, soc: int) -> list[dict]:
+    return [
+        {
+            "vin": f"VIN{i:05d}",
+            "nickname": f"Car {i}",
+            "model_name": "Leaf",
+            "odometer": 1000 + i,
+            "ev_info": {"soc": soc, "range_acon": 100, "range_acoff": 120, "charging": False, "plugged_in": True},
+        }
+        for i in range(n)
+    ]
+
+
+def _render(entity) -> None:
+    # What a state write evaluates
+    entity.native_value
+    entity.extra_state_attributes
+    entity.name
+
+
+async def _measure(n: int, dispatch: bool, rounds: int) -> tuple[int, float]:
+    coord = _Coordinator(_cars(n, 50))
+    data = {"coordinator": coord}
+    if dispatch:
+        data["dispatcher"] = CarUpdateDispatcher(None, coord)
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": data}}})()
+    entry = type("E", (), {"entry_id": "e1"})()
+
+    added = []
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+    entities = [e for e in added if isinstance(e, sensor_mod.OpenCarwingsCarEntity)]
+    for entity in entities:
+        entity.async_write_ha_state = lambda entity=entity: _render(entity)
+        await entity.async_added_to_hass()
+
+    total = 0.0
+    for r in range(rounds):
+        snapshot = _cars(n, 50 + r % 10)
+        start = time.perf_counter()
+        coord.update(snapshot)
+        await asyncio.sleep(0)  # let the batched flush run
+        total += time.perf_counter() - start
+    return len(entities), total / rounds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    print(f"{'cars':>5} {'entities':>9} {'listeners ms':>13} {'dispatcher ms':>14}")
+    for n in args.cars:
+        count, per_entity = asyncio.run(_measure(n, False, args.rounds))
+        _count, dispatched = asyncio.run(_measure(n, True, args.rounds))
+        print(f"{n:>5} {count:>9} {per_entity * 1000:>13.2f} {dispatched * 1000:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Event-loop blocking while decoding and merging fleet payloads.
+
+Runs a full `/api/car/` + per-VIN detail refresh against an in-memory session and
+reports the longest stall seen by a heartbeat task on the event loop, for inline
+decoding (stdlib / orjson) and for executor offloading.
+
+    python benchmarks/bench_json_decode.py [--cars 50] [--rounds 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+for path in (ROOT, os.path.join(ROOT, "tests", "stubs")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+from custom_components.ha_opencarwings import api, util  # noqa: E402
+from custom_components.ha_opencarwings import _merge_car_details  # noqa: E402
+
+
+def _detail(i: int) -> dict:
+    vin = f"SJNFAAZE0U{i:07d}"
+    return {
+        "vin": vin,
+        "nickname": f"Leaf {i}",
+        "model_name": "Leaf",
+        "odometer": 40000 + i,
+        "ev_info": {"soc": 50 + i % 50, "range_acon": 120, "range_acoff": 140, "charging": False,
+                    "last_updated": "2026-01-04T12:00:00Z"},
+        "location": {"lat": "60.1", "lon": "24.9", "home": False},
+        "tcu_configuration": {f"param_{k}": "x" * 32 for k in range(200)},
+        "favorite_channels": [{"id": k, "name": f"Channel {k}", "url": "https://example.com/" + "y" * 40}
+                              for k in range(100)],
+        "route_plans": [{"id": k, "points": [[60.0 + p / 1000, 24.0 + p / 1000] for p in range(200)]}
+                        for k in range(5)],
+    }
+
+
+class _Response:
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+
+class _Session:
+    def __init__(self, cars: list[dict]) -> None:
+        self._list = json.dumps([{"vin": c["vin"], "nickname": c["nickname"]} for c in cars]).encode()
+        self._detail = {c["vin"]: json.dumps(c).encode() for c in cars}
+
+    async def request(self, method, url, headers=None, **kwargs):
+        await asyncio.sleep(0)
+        vin = url.rstrip("/").rsplit("/", 1)[-1]
+        return _Response(self._detail.get(vin, self._list))
+
+
+class _Hass:
+    async def async_add_executor_job(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
+
+
+async def _refresh(client) -> list:
+    cars = await client.async_get_cars()
+    details = await asyncio.gather(*(client.async_get_car_by_vin(c["vin"]) for c in cars))
+    if client.offload_threshold is not None:
+        return await client.hass.async_add_executor_job(_merge_car_details, cars, details)
+    return _merge_car_details(cars, details)
+
+
+async def _measure(session, offload: bool, rounds: int) -> tuple[float, float]:
+    client = api.OpenCarWingsAPI(_Hass())
+    client._session = session
+    client.offload_threshold = 0 if offload else None
+
+    worst = 0.0
+    stop = False
+
+    async def heartbeat():
+        nonlocal worst
+        loop = asyncio.get_running_loop()
+        while not stop:
+            before = loop.time()
+            await asyncio.sleep(0.001)
+            worst = max(worst, loop.time() - before - 0.001)
+
+    beat = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.01)
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await _refresh(client)
+    elapsed = (time.perf_counter() - start) / rounds
+    stop = True
+    await beat
+    return worst, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, default=50)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    cars = [_detail(i) for i in range(args.cars)]
+    session = _Session(cars)
+    size = sum(len(b) for b in session._detail.values())
+    print(f"{args.cars} cars, {size / 1024:.0f} KiB of detail per refresh, backend={util.JSON_BACKEND}")
+
+    for label, offload in (("inline", False), ("executor", True)):
+        worst, elapsed = asyncio.run(_measure(session, offload, args.rounds))
+        print(f"{label:>8}: max loop stall {worst * 1000:7.2f} ms, refresh {elapsed * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
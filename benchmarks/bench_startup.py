@@ -0,0 +1,104 @@
+"""Integration startup: cold import time and setup until the first entity state.
+
+Each run is a fresh interpreter, so module imports are really cold. A run imports the
+integration package, sets up one config entry against an in-memory client (N cars),
+forwards the platforms and renders the first sensor's state. The setup phase timings
+the integration records for diagnostics are reported as well.
+
+    python benchmarks/bench_startup.py [--cars 10] [--runs 5]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _single(cars: int) -> dict:
+    for path in (ROOT, os.path.join(ROOT, "tests", "stubs")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    start = time.perf_counter()
+    integration = importlib.import_module("custom_components.ha_opencarwings")
+    import_ms = (time.perf_counter() - start) * 1000
+
+    class Client:
+        def __init__(self, hass=None, base_url=None):
+            pass
+
+        def set_tokens(self, access, refresh):
+            pass
+
+        async def async_get_cars(self):
+            return [
+                {"vin": f"VIN{i:05d}", "nickname": f"Car {i}", "ev_info": {"soc": 50, "last_updated": "2026-01-04T12:00:00Z"}}
+                for i in range(cars)
+            ]
+
+        async def async_get_car_by_vin(self, vin):
+            return {"vin": vin, "odometer": 1000}
+
+    entities: list = []
+
+    async def _forward(self, entry, platforms):
+        for name in platforms:
+            platform = importlib.import_module(f"custom_components.ha_opencarwings.{name}")
+            await platform.async_setup_entry(hass, entry, entities.extend)
+
+    config_entries = type("C", (), {"async_forward_entry_setups": _forward, "async_start_reauth": lambda *a: None})()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries})()
+    entry = type("E", (), {"entry_id": "bench", "data": {}, "options": {}, "title": "bench"})()
+    integration.OpenCarWingsAPI = Client
+
+    async def _setup() -> float:
+        start = time.perf_counter()
+        await integration.async_setup_entry(hass, entry)
+        first = next(e for e in entities if getattr(e, "unique_id", "").startswith("ha_opencarwings_soc_"))
+        first.native_value
+        return (time.perf_counter() - start) * 1000
+
+    setup_ms = asyncio.run(_setup())
+    return {
+        "import_ms": import_ms,
+        "setup_to_first_state_ms": setup_ms,
+        **hass.data["ha_opencarwings"]["bench"]["setup_timings"],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cars", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(_single(args.cars)))
+        return
+
+    runs = []
+    for _ in range(args.runs):
+        out = subprocess.run(
+            [sys.executable, __file__, "--single", "--cars", str(args.cars)],
+            check=True,
+            capture_output=True,
+            text=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f"{args.cars} cars, median of {args.runs} cold runs")
+    for key in runs[0]:
+        print(f"{key:>26}: {statistics.median(r[key] for r in runs):8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,135 @@
 from __future__ import annotations
 
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta, timezone
 import asyncio
+import importlib
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
 from .api import OpenCarWingsAPI, AuthenticationError, RequestError
+from .alerts import AlertFeed, DEFAULT_ALERTS_SCAN_INTERVAL_MIN
+from .battery import BatteryHealthTracker
+from .cache import ResponseCache
+from .charging import ChargingSessionTracker
+from .commands import CommandTracker
+from .details import DetailCache, DEFAULT_DETAIL_RETRY_INTERVAL_SEC, DEFAULT_STATIC_REFRESH_MIN
+from .dispatcher import CarUpdateDispatcher
+from .fields import car_projection
+from .fleet import FleetScheduler
+from .location import LocationProber, DEFAULT_PROBE_INTERVAL_RUNNING_SEC
+from .range_estimator import RangeEstimator
+from .staleness import StaleDataCache, DEFAULT_MAX_STALENESS_MIN
+from .statistics import StatisticsAggregator
+from .store import async_create_store
+from .timers import TimerCache
+from .tracing import RefreshTracer, span as trace_span
+from .trips import TripTracker
 
 DOMAIN = "ha_opencarwings"
 PLATFORMS = ["sensor", "switch", "device_tracker", "button"]
 
 # default: 15 minutes
 DEFAULT_SCAN_INTERVAL_MIN = 15
+# watch mode (watch.py) is opt-in
+DEFAULT_WATCH_INTERVAL_SEC = 0
 
 _LOGGER = logging.getLogger(__name__)
 
 
+def _merge_car_details(cars: list, details: list) -> list:
+    """Merge detail documents into the lite car list by VIN (detail wins)."""
+    by_vin: dict[str, dict] = {}
+    for c in cars:
+        if isinstance(c, dict) and c.get("vin"):
+            by_vin[str(c["vin"])] = c
+
+    for d in details:
+        if isinstance(d, Exception) or not isinstance(d, dict):
+            continue
+        vin = d.get("vin")
+        if not vin:
+            continue
+        vin = str(vin)
+        by_vin[vin] = {**by_vin.get(vin, {}), **d}
+
+    # Preserve list order
+    out: list[dict] = []
+    for c in cars:
+        if isinstance(c, dict) and c.get("vin"):
+            out.append(by_vin.get(str(c["vin"]), c))
+        elif isinstance(c, dict):
+            out.append(c)
+
+    return out
+
+
+async def _async_import_job(hass, func, *args):
+    """Run an import-heavy callable in Home Assistant's import executor when available."""
+    for name in ("async_add_import_executor_job", "async_add_executor_job"):
+        job = getattr(hass, name, None)
+        if job is not None:
+            return await job(func, *args)
+    return func(*args)
+
+
+def _leave_fleet(hass, entry_id: str) -> None:
+    """Take an entry off the fleet schedule; the last entry out stops the ticker."""
+    fleet = hass.data.get(DOMAIN, {}).get("fleet")
+    if fleet is not None:
+        fleet.async_unregister(entry_id)
+        if not len(fleet):
+            hass.data[DOMAIN].pop("fleet", None)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the OpenCARWINGS integration from a config entry with a DataUpdateCoordinator."""
     hass.data.setdefault(DOMAIN, {})
+    # Setup phase durations (ms), published in the diagnostics download
+    setup_start = time.perf_counter()
+    timings: dict[str, float] = {}
+
+    def _mark(phase: str, since: float) -> float:
+        now = time.perf_counter()
+        timings[phase] = round((now - since) * 1000, 1)
+        return now
 
     # Respect configured API base URL (options override initial data)
     opts = getattr(entry, "options", {}) or {}
     base_url = opts.get("api_base_url", entry.data.get("api_base_url"))
     client = OpenCarWingsAPI(hass, base_url=base_url) if base_url else OpenCarWingsAPI(hass)
     client.set_tokens(entry.data.get("access_token"), entry.data.get("refresh_token"))
+    # Cap requests in flight (suggested from the latency probed by the config flow)
+    max_requests = opts.get("max_concurrent_requests", entry.data.get("max_concurrent_requests"))
+    if max_requests and hasattr(client, "set_concurrency_limit"):
+        client.set_concurrency_limit(max_requests)
+    # Keep only the car fields the platforms read (full detail stays available
+    # on demand through diagnostics). Collecting them imports the platform and
+    # subsystem modules, so do it off the event loop; the optional watch mode is
+    # only imported when enabled.
+    watch_interval = opts.get("watch_interval", DEFAULT_WATCH_INTERVAL_SEC)
+    watch_mod = None
+    if watch_interval:
+        watch_mod = await _async_import_job(hass, importlib.import_module, f"{__name__}.watch")
+    client.car_projection = await _async_import_job(
+        hass, car_projection, watch_mod.CAR_FIELDS if watch_mod is not None else ()
+    )
+    # Responses (and detail merges) at least this large are decoded in the executor
+    if "json_offload_bytes" in opts:
+        client.offload_threshold = opts["json_offload_bytes"]
+    # Reuse responses of rarely changing endpoints, also across reloads (cache.py)
+    if opts.get("response_cache", True) and hasattr(client, "response_cache"):
+        client.response_cache = ResponseCache(
+            async_create_store(hass, f"{DOMAIN}.http_cache_{entry.entry_id}"),
+            persist_car_detail=opts.get("persist_car_detail", False),
+        )
+        await client.response_cache.async_load()
+    # Duplicate car detail calls slower than p95, within this % of extra requests
+    if opts.get("hedge_budget_pct") and hasattr(client, "set_hedging"):
+        client.set_hedging(opts["hedge_budget_pct"])
 
     # Ensure base_url is accessible on the client instance (helps tests and some clients)
     if base_url:
@@ -39,7 +141,28 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
             pass
 
     # Store client in hass.data under the entry id
-    hass.data[DOMAIN][entry.entry_id] = {"client": client}
+    hass.data[DOMAIN][entry.entry_id] = {"client": client, "setup_timings": timings}
+    # Span traces of the last refreshes (export_trace service / diagnostics)
+    tracer = RefreshTracer()
+    hass.data[DOMAIN][entry.entry_id]["tracer"] = tracer
+    phase_start = _mark("client_ms", setup_start)
+
+    # Server-side command timers, re-fetched only when a car's timer_commands change
+    timer_cache = TimerCache(client)
+    hass.data[DOMAIN][entry.entry_id]["timers"] = timer_cache
+
+    async def _sync_timers(cars: list) -> None:
+        """Refresh the timer cache for cars whose embedded timer_commands changed."""
+        if not isinstance(cars, list) or not hasattr(client, "async_get_timers"):
+            return
+        by_vin = {str(c["vin"]): c for c in cars if isinstance(c, dict) and c.get("vin")}
+        results = await asyncio.gather(
+            *(timer_cache.async_sync(vin, car) for vin, car in by_vin.items()),
+            return_exceptions=True,
+        )
+        for vin, res in zip(by_vin, results):
+            if isinstance(res, Exception):
+                _LOGGER.debug("Could not sync timers for %s: %s", vin, res)
 
     async def _enrich_cars_with_details(cars: list) -> list:
         """Enrich lite car objects (from /api/car/) with detail fetched by VIN."""
@@ -48,49 +171,128 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         if not hasattr(client, "async_get_car_by_vin"):
             return cars
 
-        vins: list[str] = []
-        tasks = []
-        for c in cars:
-            if isinstance(c, dict) and c.get("vin"):
-                vin = str(c["vin"])
-                vins.append(vin)
-                tasks.append(client.async_get_car_by_vin(vin))
-
-        if not tasks:
+        if not any(isinstance(c, dict) and c.get("vin") for c in cars):
             return cars
 
-        details = await asyncio.gather(*tasks, return_exceptions=True)
-
-        # Merge by VIN: detail wins, list fills missing fields
-        by_vin: dict[str, dict] = {}
-        for c in cars:
-            if isinstance(c, dict) and c.get("vin"):
-                by_vin[str(c["vin"])] = c
-
-        for d in details:
-            if isinstance(d, Exception) or not isinstance(d, dict):
-                continue
-            vin = d.get("vin")
-            if not vin:
-                continue
-            vin = str(vin)
-            by_vin[vin] = {**by_vin.get(vin, {}), **d}
-
-        # Preserve list order
-        out: list[dict] = []
-        for c in cars:
-            if isinstance(c, dict) and c.get("vin"):
-                out.append(by_vin.get(str(c["vin"]), c))
-            elif isinstance(c, dict):
-                out.append(c)
-
-        return out
-
-    async def _async_update_data():
+        decoded_before = getattr(client, "bytes_decoded", 0)
+        # Only due cars are fetched; the others (and failed fetches) get their
+        # last good detail under the fresh list entry
+        with trace_span("car details", "refresh"):
+            details = await detail_cache.async_fetch_due(cars)
+        return await _async_merge_details(cars, details, decoded_before)
+
+    async def _async_merge_details(cars: list, details: list, decoded_before: int) -> list:
+        """Merge fetched details into the car list, in the executor for large payloads."""
+        threshold = getattr(client, "offload_threshold", None)
+        decoded = getattr(client, "bytes_decoded", 0) - decoded_before
+        if threshold is not None and decoded >= threshold and hasattr(hass, "async_add_executor_job"):
+            with trace_span("merge details (executor)", "refresh"):
+                return await hass.async_add_executor_job(_merge_car_details, cars, details)
+        with trace_span("merge details", "refresh"):
+            return _merge_car_details(cars, details)
+
+    async def _async_fetch_cars_streaming() -> list:
+        """Stream /api/car/ and start each car's detail fetch as soon as it is parsed."""
+        decoded_before = getattr(client, "bytes_decoded", 0)
+        cars: list = []
+        vins: list[str] = []
+        tasks: list[asyncio.Future] = []
+        reused: list[dict] = []
+        try:
+            with trace_span("car list (streamed)", "refresh"):
+                async for car in client.async_iter_cars():
+                    cars.append(car)
+                    if not isinstance(car, dict) or not car.get("vin"):
+                        continue
+                    if detail_cache.is_due(car):
+                        vins.append(str(car["vin"]))
+                        tasks.append(asyncio.ensure_future(detail_cache.async_fetch_one(vins[-1])))
+                    else:
+                        reused.append(detail_cache.reuse(car))
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        with trace_span("car details (remaining)", "refresh", cars=len(vins)):
+            details = await asyncio.gather(*tasks, return_exceptions=True)
+        details = detail_cache.resolve(cars, vins, details) + reused
+        return await _async_merge_details(cars, details, decoded_before)
+
+    # Static car detail: fetched when due (new car data, or older than the static
+    # refresh interval), otherwise reused under the fresh list entry. Failing VINs
+    # keep their last good detail and are retried on their own shorter schedule.
+    detail_cache = DetailCache(
+        hass, client, static_refresh_min=opts.get("static_refresh_interval", DEFAULT_STATIC_REFRESH_MIN)
+    )
+    hass.data[DOMAIN][entry.entry_id]["details"] = detail_cache
+
+    # Last command status and round-trip latency per car; a car with a pending
+    # command gets its detail (where the command fields are) on every refresh
+    command_tracker = CommandTracker()
+    detail_cache.force_due = command_tracker.is_pending
+    hass.data[DOMAIN][entry.entry_id]["commands"] = command_tracker
+
+    # Location history and trip segmentation, fed one sample per car per refresh
+    trip_tracker = TripTracker()
+    hass.data[DOMAIN][entry.entry_id]["trips"] = trip_tracker
+
+    # Charging sessions (energy added, average rate, duration) folded in per refresh;
+    # the lifetime energy total is persisted
+    charging_tracker = ChargingSessionTracker(async_create_store(hass, f"{DOMAIN}.charging_{entry.entry_id}"))
+    await charging_tracker.async_load()
+    hass.data[DOMAIN][entry.entry_id]["charging"] = charging_tracker
+
+    # Battery health series, persisted so degradation trends survive restarts
+    battery_tracker = BatteryHealthTracker(async_create_store(hass, f"{DOMAIN}.battery_{entry.entry_id}"))
+    await battery_tracker.async_load()
+    hass.data[DOMAIN][entry.entry_id]["battery"] = battery_tracker
+
+    # Learned km-per-percent for the predicted range sensor
+    range_estimator = RangeEstimator(async_create_store(hass, f"{DOMAIN}.range_{entry.entry_id}"))
+    await range_estimator.async_load()
+    hass.data[DOMAIN][entry.entry_id]["range"] = range_estimator
+
+    # Hourly SoC/range/odometer aggregates, bulk-imported as external statistics;
+    # hours cached locally but not yet imported are imported right away
+    statistics = StatisticsAggregator(hass, async_create_store(hass, f"{DOMAIN}.statistics_{entry.entry_id}"))
+    await statistics.async_load()
+    statistics.async_flush()
+    hass.data[DOMAIN][entry.entry_id]["statistics"] = statistics
+
+    async def _async_process_cars(cars: list) -> None:
+        """Feed a fresh snapshot to the per-car subsystems."""
+        with trace_span("process cars", "refresh"):
+            await _sync_timers(cars)
+            for name, tracker in (
+                ("trips", trip_tracker),
+                ("charging sessions", charging_tracker),
+                ("battery health", battery_tracker),
+                ("range estimate", range_estimator),
+                ("commands", command_tracker),
+            ):
+                try:
+                    tracker.update(cars)
+                except Exception as err:  # pragma: no cover - defensive
+                    _LOGGER.debug("Could not update %s: %s", name, err)
+            try:
+                if statistics.update(cars):
+                    statistics.async_flush()
+            except Exception as err:  # pragma: no cover - defensive
+                _LOGGER.debug("Could not update statistics: %s", err)
+
+    # Parse /api/car/ incrementally and overlap it with the detail fetches
+    stream_car_list = opts.get("stream_car_list", True)
+
+    async def _async_fetch_cars():
         """Fetch data from API."""
-        from datetime import datetime, timezone
-
         try:
+            # Stream the car list so detail fetches overlap with its download
+            if stream_car_list and hasattr(client, "async_iter_cars") and hasattr(client, "async_get_car_by_vin"):
+                cars = await _async_fetch_cars_streaming()
+                await _async_process_cars(cars)
+                coordinator.last_update_time = datetime.now(timezone.utc)
+                return cars
+
             # Prefer dedicated helper if available
             if hasattr(client, "async_get_cars"):
                 cars = await client.async_get_cars()
@@ -101,6 +303,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 except Exception as err:
                     _LOGGER.debug("Could not enrich car list with details: %s", err)
 
+                await _async_process_cars(cars)
+
                 # Track the last successful update time for CarLastRequestedSensor
                 coordinator.last_update_time = datetime.now(timezone.utc)
                 return cars
@@ -115,6 +319,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
                 except Exception as err:
                     _LOGGER.debug("Could not enrich car list with details: %s", err)
 
+                await _async_process_cars(result)
+
                 coordinator.last_update_time = datetime.now(timezone.utc)
                 return result
 
@@ -130,6 +336,50 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     # Determine scan interval from options (or fallback to default)
     scan_min = opts.get("scan_interval", entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL_MIN))
+    # Last good snapshot per VIN, served while refreshes fail (up to max_staleness)
+    stale_cache = StaleDataCache(
+        opts.get("max_staleness", DEFAULT_MAX_STALENESS_MIN), timedelta(minutes=scan_min)
+    )
+
+    async def _async_update_data():
+        """Fetch data from API, serving the last good snapshot while refreshes fail."""
+        try:
+            with tracer.trace("refresh"):
+                return await _async_refresh_cars()
+        finally:
+            # Manual refreshes count too: the next scheduled poll keeps its distance
+            fleet.refreshed(entry.entry_id)
+
+    def _set_poll_interval(interval: timedelta) -> None:
+        if fleet.owns_schedule:
+            fleet.set_interval(entry.entry_id, interval)
+        else:
+            coordinator.update_interval = interval
+
+    async def _async_refresh_cars():
+        try:
+            cars = await _async_fetch_cars()
+        except UpdateFailed as err:
+            try:
+                cars = stale_cache.serve(err)
+            finally:
+                # Retry with backoff instead of every scan interval
+                _set_poll_interval(stale_cache.next_interval())
+            # Warn once per outage; the retries that follow are logged at debug level
+            log = _LOGGER.warning if stale_cache.failures == 1 else _LOGGER.debug
+            log(
+                "OpenCARWINGS refresh failed (%s); serving last good data, retrying in %s",
+                err,
+                stale_cache.next_interval(),
+            )
+            return cars
+        _set_poll_interval(stale_cache.scan_interval)
+        return stale_cache.record(cars)
+
+    async def _async_process_pushed(cars: list) -> None:
+        """Process a snapshot published outside a refresh (watch mode, detail retries)."""
+        await _async_process_cars(cars)
+        stale_cache.record(cars)
 
     coordinator = DataUpdateCoordinator(
         hass,
@@ -139,9 +389,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         update_interval=timedelta(minutes=scan_min),
     )
 
+    # Car entities read data age / expiry from the coordinator (like last_update_time)
+    coordinator.stale_cache = stale_cache
+    detail_cache.coordinator = coordinator
+    detail_cache.process = _async_process_pushed
+
     # store coordinator
     hass.data[DOMAIN][entry.entry_id]["coordinator"] = coordinator
 
+    # One scheduler for all entries: spreads their polls across the interval and
+    # shares a requests-per-minute budget between them (fleet.py)
+    fleet = hass.data[DOMAIN].get("fleet")
+    if fleet is None:
+        fleet = hass.data[DOMAIN]["fleet"] = FleetScheduler(hass)
+    fleet.async_register(
+        entry.entry_id,
+        coordinator,
+        timedelta(minutes=scan_min),
+        opts.get("max_requests_per_minute"),
+    )
+    if hasattr(client, "request_budget"):
+        client.request_budget = fleet.budget
+    if fleet.async_start():
+        # The fleet ticker triggers this coordinator's refreshes from now on
+        coordinator.update_interval = None
+    # One coordinator listener for all per-car sensors, with batched state writes
+    hass.data[DOMAIN][entry.entry_id]["dispatcher"] = CarUpdateDispatcher(hass, coordinator, tracer)
+
+    # Location-only refresh path (probe service/button and faster polling while running)
+    prober = LocationProber(hass, client, coordinator, trips=trip_tracker)
+    hass.data[DOMAIN][entry.entry_id]["location_prober"] = prober
+
+    # Opt-in watch mode: fast list-only polls, detail fetched just for changed cars
+    if watch_mod is not None:
+        hass.data[DOMAIN][entry.entry_id]["watcher"] = watch_mod.CarWatcher(
+            hass, client, coordinator, process=_async_process_pushed
+        )
+    phase_start = _mark("subsystems_ms", phase_start)
+
     # Do initial refresh to populate data
     try:
         await coordinator.async_config_entry_first_refresh()
@@ -149,6 +434,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     except AuthenticationError:
         _LOGGER.warning("Tokens invalid or expired; requesting reauthentication")
         hass.config_entries.async_start_reauth(entry.entry_id)
+        # The entry is not set up: keep it off the shared schedule and budget
+        _leave_fleet(hass, entry.entry_id)
         return False
     except Exception:
         # Log the error but continue setup so platforms can use cached data if available
@@ -156,42 +443,63 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.data[DOMAIN][entry.entry_id]["cars"] = hass.data[DOMAIN][entry.entry_id].get("cars", [])
         # Don't abort setup; proceed to forward platforms so entity platforms can be set up
         pass
+    phase_start = _mark("first_refresh_ms", phase_start)
+
+    # Alerts are polled on their own (shorter) cadence by a second coordinator so
+    # plug-in / charge-finished notifications don't require full car detail polls
+    alert_feed = AlertFeed(hass, client)
+
+    async def _async_update_alerts():
+        """Poll /api/alerts/{vin}/ for every known car."""
+        if not hasattr(client, "async_get_alerts"):
+            return {}
+        cars = coordinator.data or hass.data[DOMAIN][entry.entry_id].get("cars") or []
+        vins = [str(c["vin"]) for c in cars if isinstance(c, dict) and c.get("vin")]
+        try:
+            return await alert_feed.async_update(vins)
+        except AuthenticationError:
+            raise
+        except Exception as err:  # pragma: no cover - network or unexpected
+            raise UpdateFailed(err)
+
+    alerts_min = opts.get("alerts_scan_interval", DEFAULT_ALERTS_SCAN_INTERVAL_MIN)
+    alerts_coordinator = DataUpdateCoordinator(
+        hass,
+        _LOGGER,
+        name=f"{DOMAIN}_{entry.entry_id}_alerts",
+        update_method=_async_update_alerts,
+        update_interval=timedelta(minutes=alerts_min),
+    )
+    hass.data[DOMAIN][entry.entry_id]["alerts"] = alert_feed
+    hass.data[DOMAIN][entry.entry_id]["alerts_coordinator"] = alerts_coordinator
+
+    # Seed the alert cursors before entities are created (no events for old alerts)
+    try:
+        await alerts_coordinator.async_refresh()
+    except Exception:
+        _LOGGER.debug("Could not seed OpenCARWINGS alerts during setup")
+    phase_start = _mark("alerts_ms", phase_start)
 
     # Forward setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    phase_start = _mark("platforms_ms", phase_start)
 
-    # Register integration service to allow manual refresh via service call
-    # Register only once per hass instance
-    if not hass.data[DOMAIN].get("_service_refresh_registered"):
-        async def _handle_refresh(call):
-            """Handle service call to refresh OpenCARWINGS data."""
-            entry_id = (call.data or {}).get("entry_id") if call else None
-            if entry_id:
-                data = hass.data.get(DOMAIN, {}).get(entry_id)
-                if not data:
-                    _LOGGER.warning("Refresh requested for unknown entry %s", entry_id)
-                    return
-                coord = data.get("coordinator")
-                if coord:
-                    await coord.async_request_refresh()
-            else:
-                # refresh all coordinators
-                for d in hass.data.get(DOMAIN, {}).values():
-                    # skip non-dict sentinel values stored in hass.data (like flags)
-                    if not isinstance(d, dict):
-                        continue
-                    coord = d.get("coordinator")
-                    if coord:
-                        await coord.async_request_refresh()
+    # Trackers are registered with the prober now; start probing running cars
+    if hasattr(client, "async_probe_location"):
+        prober.async_start(opts.get("probe_interval_running", DEFAULT_PROBE_INTERVAL_RUNNING_SEC))
+    if hasattr(client, "async_get_car_by_vin"):
+        detail_cache.async_start(opts.get("detail_retry_interval", DEFAULT_DETAIL_RETRY_INTERVAL_SEC))
+    watcher = hass.data[DOMAIN][entry.entry_id].get("watcher")
+    if watcher is not None and hasattr(client, "async_get_cars") and hasattr(client, "async_get_car_by_vin"):
+        watcher.async_start(watch_interval)
 
-        try:
-            hass.services.async_register(DOMAIN, "refresh", _handle_refresh)
-            hass.data[DOMAIN]["_service_refresh_registered"] = True
-        except Exception:
-            # If hass.services isn't available in tests/stubs, ignore
-            _LOGGER.debug("Could not register refresh service (services not available in hass stub)")
+    # Register integration services once per hass instance
+    from .services import async_setup_services
+
+    async_setup_services(hass)
 
-    _LOGGER.info("OpenCARWINGS setup complete for %s", entry.title)
+    _mark("total_ms", setup_start)
+    _LOGGER.info("OpenCARWINGS setup complete for %s in %.0f ms", entry.title, timings["total_ms"])
     return True
 
 
@@ -200,5 +508,10 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     # Remove stored data
-    hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+    data = hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+    for key in ("location_prober", "details", "dispatcher", "watcher"):
+        helper = data.get(key) if isinstance(data, dict) else None
+        if helper is not None:
+            helper.async_stop()
+    _leave_fleet(hass, entry.entry_id)
     return unload_ok
@@ -0,0 +1,127 @@
+"""Incremental alert feed backed by `/api/alerts/{vin}/`.
+
+Alerts are polled per VIN on their own cadence. A cursor (highest alert `id`, then
+`timestamp`) is kept per car so each poll only processes alerts that are new since the
+previous one; those are fired on the Home Assistant event bus and appended to a small
+ring buffer of recent alerts per car.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timezone
+import logging
+
+from .api import AuthenticationError
+from .util import parse_ts
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_ALERT = "ha_opencarwings_alert"
+
+# How many recent alerts are kept in memory per car
+DEFAULT_ALERT_BUFFER_SIZE = 20
+# Alerts are cheap compared to full car detail, so poll them more often
+DEFAULT_ALERTS_SCAN_INTERVAL_MIN = 5
+
+_MIN_TS = datetime.min.replace(tzinfo=timezone.utc)
+
+
+def _alert_key(alert: dict) -> tuple[int, datetime]:
+    """Ordering key for an alert: server id first, timestamp as tie-breaker."""
+    try:
+        alert_id = int(alert.get("id"))
+    except (TypeError, ValueError):
+        alert_id = -1
+    ts = alert.get("timestamp")
+    parsed = parse_ts(ts) if isinstance(ts, str) else None
+    if parsed is not None and parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return alert_id, parsed or _MIN_TS
+
+
+class AlertFeed:
+    """Track alerts per VIN and surface only the ones not seen before.
+
+    The first poll for a VIN only seeds the cursor and the ring buffer, so a restart
+    does not replay the whole alert history as events.
+    """
+
+    def __init__(self, hass, client, buffer_size: int = DEFAULT_ALERT_BUFFER_SIZE) -> None:
+        self.hass = hass
+        self._client = client
+        self._buffer_size = buffer_size
+        self._cursors: dict[str, tuple[int, datetime]] = {}
+        self._recent: dict[str, deque] = {}
+
+    def cursor(self, vin: str) -> tuple[int, datetime] | None:
+        return self._cursors.get(vin)
+
+    def recent(self, vin: str) -> list[dict]:
+        """Recent alerts for a car, newest first."""
+        return list(reversed(self._recent.get(vin, ())))
+
+    def latest(self, vin: str) -> dict | None:
+        buf = self._recent.get(vin)
+        return buf[-1] if buf else None
+
+    def process(self, vin: str, alerts: list) -> list[dict]:
+        """Process a full alert listing for a VIN and return only the new alerts."""
+        items = [a for a in (alerts or []) if isinstance(a, dict)]
+        first_poll = vin not in self._cursors
+        cursor = self._cursors.get(vin)
+
+        new = sorted(
+            (a for a in items if cursor is None or _alert_key(a) > cursor),
+            key=_alert_key,
+        )
+        buf = self._recent.setdefault(vin, deque(maxlen=self._buffer_size))
+        if not new:
+            if first_poll:
+                self._cursors[vin] = (-1, _MIN_TS)
+            return []
+
+        buf.extend(new)
+        self._cursors[vin] = _alert_key(new[-1])
+
+        if first_poll:
+            return []
+
+        for alert in new:
+            self._fire(vin, alert)
+        return new
+
+    def _fire(self, vin: str, alert: dict) -> None:
+        bus = getattr(self.hass, "bus", None)
+        if bus is None:
+            return
+        try:
+            bus.async_fire(
+                EVENT_ALERT,
+                {
+                    "vin": vin,
+                    "id": alert.get("id"),
+                    "type": alert.get("type"),
+                    "type_display": alert.get("type_display"),
+                    "timestamp": alert.get("timestamp"),
+                    "command_id": alert.get("command_id"),
+                    "additional_data": alert.get("additional_data"),
+                },
+            )
+        except Exception:  # pragma: no cover - bus not available in tests
+            _LOGGER.debug("Could not fire alert event for %s", vin)
+
+    async def async_poll(self, vin: str) -> list[dict]:
+        """Fetch alerts for a single VIN and process the new ones."""
+        alerts = await self._client.async_get_alerts(vin)
+        return self.process(vin, alerts)
+
+    async def async_update(self, vins: list[str]) -> dict[str, list[dict]]:
+        """Poll all VINs concurrently; returns recent alerts per VIN (newest first)."""
+        results = await asyncio.gather(*(self.async_poll(v) for v in vins), return_exceptions=True)
+        for vin, res in zip(vins, results):
+            if isinstance(res, AuthenticationError):
+                raise res
+            if isinstance(res, Exception):
+                _LOGGER.debug("Could not poll alerts for %s: %s", vin, res)
+        return {vin: self.recent(vin) for vin in vins}
@@ -6,6 +6,7 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 from typing import Optional
 
 try:
@@ -13,11 +14,25 @@ try:
 except Exception:  # pragma: no cover - aiohttp not available in tests
     ClientResponse = object
 
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import aiohttp_client
+
+from .cache import CachedResponse, ResponseCache, endpoint_ttl
+from .fields import project
+from .fleet import RequestBudget
+from .tracing import span as trace_span
+from .util import JsonArrayStream, LatencyWindow, json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_API_BASE = "https://opencarwings.viaaq.eu"
+# Response bodies at least this large (bytes) are decoded in the executor
+DEFAULT_JSON_OFFLOAD_BYTES = 64 * 1024
+# Read size when streaming the car list
+STREAM_CHUNK_SIZE = 16 * 1024
+# Detail latency percentile after which a hedged (duplicate) request is sent
+HEDGE_PERCENTILE = 95
+# Unused hedging budget that may accumulate, in requests
+HEDGE_BURST = 3
 
 
 class AuthenticationError(Exception):
@@ -31,16 +46,11 @@ class RequestError(Exception):
 class OpenCarWingsAPI:
     def __init__(self, hass, base_url: str = DEFAULT_API_BASE) -> None:
         self.hass = hass
-        # Import the helper dynamically so tests that monkeypatch
-        # `homeassistant.helpers.aiohttp_client.async_get_clientsession`
-        # will be respected.
+        # Look the helper up on the module (resolved once at import) so tests that
+        # monkeypatch `homeassistant.helpers.aiohttp_client.async_get_clientsession`
+        # are respected.
         try:
-            import importlib
-
-            aiohttp_mod = importlib.import_module(
-                "homeassistant.helpers.aiohttp_client"
-            )
-            self._session = aiohttp_mod.async_get_clientsession(hass)
+            self._session = aiohttp_client.async_get_clientsession(hass)
         except Exception:  # pragma: no cover - fallback for tests
             self._session = None
 
@@ -48,11 +58,63 @@ class OpenCarWingsAPI:
         self._access: Optional[str] = None
         self._refresh: Optional[str] = None
         self._lock = asyncio.Lock()
+        # Optional cap on requests in flight (see set_concurrency_limit)
+        self._semaphore: asyncio.Semaphore | None = None
+        # Requests-per-minute budget shared with the other entries (fleet.py; None: unlimited)
+        self.request_budget: RequestBudget | None = None
+        # Payload size above which JSON decoding leaves the event loop (None: never)
+        self.offload_threshold: int | None = DEFAULT_JSON_OFFLOAD_BYTES
+        # Running total of decoded response bytes (lets callers size follow-up work)
+        self.bytes_decoded = 0
+        # Projection tree (fields.py) applied to car documents right after decode
+        self.car_projection: dict | None = None
+        # Cache of GET responses of rarely changing endpoints (None: disabled)
+        self.response_cache: ResponseCache | None = None
+        # Recent car detail latencies; slow detail calls may be hedged (set_hedging)
+        self.detail_latency = LatencyWindow()
+        self.hedge_budget_pct = 0.0
+        # Earned hedging budget in percent of a request (100 buys one hedge)
+        self._hedge_credit = 0.0
+        self.detail_requests = 0
+        self.hedged_requests = 0
+        self.hedge_wins = 0
 
     def set_tokens(self, access: str | None, refresh: str | None) -> None:
         self._access = access
         self._refresh = refresh
 
+    def set_concurrency_limit(self, limit: int | None) -> None:
+        """Allow at most `limit` requests in flight (None or 0: unlimited)."""
+        self._semaphore = asyncio.Semaphore(limit) if limit else None
+
+    def set_hedging(self, budget_pct: float | None) -> None:
+        """Hedge slow car detail calls, sending at most `budget_pct`% extra requests.
+
+        0 or None disables hedging.
+        """
+        self.hedge_budget_pct = max(float(budget_pct or 0), 0.0)
+        self._hedge_credit = 0.0
+
+    async def async_check_connection(self) -> float:
+        """Reach the API with one cheap unauthenticated request; returns latency in ms.
+
+        Any HTTP answer below 500 (typically 401 for the car list) means the base URL
+        points at a reachable OpenCARWINGS server.
+        """
+        url = f"{self._base}/api/car/"
+        start = time.monotonic()
+        try:
+            resp = await self._session.request("GET", url)
+        except Exception as err:
+            raise RequestError(err) from err
+        latency_ms = (time.monotonic() - start) * 1000
+        release = getattr(resp, "release", None)
+        if release is not None:
+            release()
+        if resp.status >= 500:
+            raise RequestError(f"Server error during connection check: {resp.status}")
+        return latency_ms
+
     async def async_obtain_token(self, username: str, password: str) -> dict:
         url = f"{self._base}/api/token/obtain/"
         payload = {"username": username, "password": password}
@@ -105,19 +167,114 @@ class OpenCarWingsAPI:
             _LOGGER.debug("Failed to fetch cars: %s %s", resp.status, text)
             raise RequestError(f"Failed fetching cars: {resp.status}")
 
-        data = await resp.json()
         # Expecting an array of car objects
-        return data
+        return await self._async_json(resp, self._project_cars)
+
+    async def async_iter_cars(self):
+        """Yield the cars of /api/car/ one by one while the list is still downloading.
+
+        Each array element is decoded as soon as it is complete, so callers can start
+        per-car work (e.g. the detail fetch) before the whole body has arrived. Falls
+        back to decoding the whole body when the response cannot be streamed.
+        """
+        resp = await self.async_request("GET", "/api/car/")
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to fetch cars")
+        if resp.status != 200:
+            text = await resp.text()
+            _LOGGER.debug("Failed to fetch cars: %s %s", resp.status, text)
+            raise RequestError(f"Failed fetching cars: {resp.status}")
 
-    async def async_request(self, method: str, path: str, **kwargs) -> ClientResponse:
-        url = f"{self._base}{path if path.startswith('/') else '/' + path}"
+        content = getattr(resp, "content", None)
+        if not hasattr(content, "iter_chunked"):
+            for car in await self._async_json(resp, self._project_cars) or []:
+                yield car
+            return
+
+        splitter = JsonArrayStream()
+        async for chunk in content.iter_chunked(STREAM_CHUNK_SIZE):
+            self.bytes_decoded += len(chunk)
+            try:
+                cars = [self._project_car(json_loads(raw)) for raw in splitter.feed(chunk)]
+            except ValueError as err:
+                raise RequestError(f"Invalid JSON in car list: {err}") from err
+            for car in cars:
+                yield car
+        if not splitter.closed:
+            raise RequestError("Car list response ended before the end of the array")
+
+    def _project_car(self, data):
+        if self.car_projection is None or not isinstance(data, dict):
+            return data
+        return project(data, self.car_projection)
+
+    def _project_cars(self, data):
+        if self.car_projection is None or not isinstance(data, list):
+            return data
+        return [self._project_car(car) for car in data]
+
+    async def _async_json(self, resp: ClientResponse, transform=None):
+        """Decode a JSON response body, off the event loop for large payloads.
+
+        `transform` (e.g. a field projection) runs right after decoding, in the
+        same thread, so only its result is kept.
+        """
+        read = getattr(resp, "read", None)
+        if read is None:
+            # Responses without a raw body (e.g. test doubles) decode themselves
+            data = await resp.json()
+            return transform(data) if transform is not None else data
+
+        body = await read()
+        if not body or not body.strip():
+            return None
+        self.bytes_decoded += len(body)
+
+        def _decode():
+            data = json_loads(body)
+            return transform(data) if transform is not None else data
+
+        try:
+            if (
+                self.offload_threshold is not None
+                and len(body) >= self.offload_threshold
+                and hasattr(self.hass, "async_add_executor_job")
+            ):
+                with trace_span("decode (executor)", bytes=len(body)):
+                    return await self.hass.async_add_executor_job(_decode)
+            with trace_span("decode", bytes=len(body)):
+                return _decode()
+        except ValueError as err:
+            raise RequestError(f"Invalid JSON in response: {err}") from err
+
+    async def async_request(self, method: str, path: str, cache: bool = True, **kwargs) -> ClientResponse:
+        """Send an authenticated request.
+
+        With a response cache, GETs of cacheable endpoints are answered from it while
+        fresh (unless `cache` is False) and writes drop the cached responses of
+        their car.
+        """
+        path = path if path.startswith("/") else "/" + path
+        url = f"{self._base}{path}"
         headers = kwargs.pop("headers", {}) or {}
 
+        response_cache = self.response_cache
+        if response_cache is not None:
+            if method != "GET":
+                response_cache.invalidate_for(path)
+            elif not cache:
+                response_cache.bypasses += 1
+            else:
+                body = response_cache.get(path)
+                if body is not None:
+                    with trace_span(f"cache hit {path}"):
+                        return CachedResponse(body)
+
         if self._access:
             headers["Authorization"] = f"Bearer {self._access}"
 
         try:
-            resp = await self._session.request(method, url, headers=headers, **kwargs)
+            resp = await self._send(method, url, headers, **kwargs)
         except Exception as err:  # pragma: no cover - network error
             _LOGGER.exception("Request to OpenCARWINGS failed")
             raise RequestError(err)
@@ -127,25 +284,91 @@ class OpenCarWingsAPI:
             _LOGGER.debug("Received 401, attempting token refresh")
             async with self._lock:
                 try:
-                    await self.async_refresh_token()
+                    with trace_span("token refresh"):
+                        await self.async_refresh_token()
                 except AuthenticationError:
                     _LOGGER.debug("Refresh failed during retry")
                     raise
                 headers["Authorization"] = f"Bearer {self._access}"
-                resp = await self._session.request(method, url, headers=headers, **kwargs)
-
+                resp = await self._send(method, url, headers, **kwargs)
+
+        if (
+            response_cache is not None
+            and method == "GET"
+            and resp.status == 200
+            and endpoint_ttl(path)
+            and hasattr(resp, "read")
+        ):
+            response_cache.put(path, await resp.read())
         return resp
 
-    async def async_get_car_by_vin(self, vin: str) -> dict:
-        """Retrieve full car detail by VIN."""
+    async def _send(self, method: str, url: str, headers: dict, **kwargs) -> ClientResponse:
+        name = f"{method} {url[len(self._base):] if url.startswith(self._base) else url}"
+        if self.request_budget is not None:
+            with trace_span("wait for request budget"):
+                await self.request_budget.async_acquire()
+        if self._semaphore is None:
+            with trace_span(name):
+                return await self._session.request(method, url, headers=headers, **kwargs)
+        with trace_span("wait for request slot"):
+            await self._semaphore.acquire()
+        try:
+            with trace_span(name):
+                return await self._session.request(method, url, headers=headers, **kwargs)
+        finally:
+            self._semaphore.release()
+
+    async def async_get_car_by_vin(self, vin: str, full: bool = False, cache: bool = True) -> dict:
+        """Retrieve car detail by VIN.
+
+        The detail is projected to the fields the integration uses unless `full`
+        is set (e.g. for diagnostics); `cache=False` skips a cached response (see
+        cache.py). With hedging enabled, a call still pending
+        after the p95 detail latency gets a second identical request and the first
+        successful answer wins.
+        """
         vin = (vin or "").strip()
         if not vin:
             raise RequestError("VIN missing")
 
+        self.detail_requests += 1
+        if not self.hedge_budget_pct:
+            return await self._async_fetch_detail(vin, full, cache)
+        self._hedge_credit = min(self._hedge_credit + self.hedge_budget_pct, HEDGE_BURST * 100)
+        delay_ms = self.detail_latency.percentile(HEDGE_PERCENTILE)
+        if delay_ms is None:
+            return await self._async_fetch_detail(vin, full, cache)
+
+        primary = asyncio.ensure_future(self._async_fetch_detail(vin, full, cache))
+        pending = {primary}
+        try:
+            done, _ = await asyncio.wait(pending, timeout=delay_ms / 1000)
+            if done or self._hedge_credit < 100:
+                return await primary
+            self._hedge_credit -= 100
+            self.hedged_requests += 1
+            _LOGGER.debug("Hedging car detail request for %s after %.0f ms", vin, delay_ms)
+            hedge = asyncio.ensure_future(self._async_fetch_detail(vin, full, cache))
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if not task.cancelled() and task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both failed: report the original request's error
+            return primary.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _async_fetch_detail(self, vin: str, full: bool, cache: bool) -> dict:
         # TODO: if your spec says a different path, change ONLY this line:
         path = f"/api/car/{vin}/"
 
-        resp = await self.async_request("GET", path)
+        start = time.monotonic()
+        resp = await self.async_request("GET", path, cache=cache)
         if resp.status == 401:
             raise AuthenticationError("Not authorized to fetch car detail")
         if resp.status != 200:
@@ -153,4 +376,83 @@ class OpenCarWingsAPI:
             _LOGGER.debug("Failed to fetch car detail by VIN %s: %s %s", vin, resp.status, text)
             raise RequestError(f"Failed fetching car detail by VIN: {resp.status}")
 
-        return await resp.json()
+        detail = await self._async_json(resp, None if full else self._project_car)
+        # Cached answers would skew the latency hedging is based on
+        if not isinstance(resp, CachedResponse):
+            self.detail_latency.add((time.monotonic() - start) * 1000)
+        return detail
+
+    async def async_get_alerts(self, vin: str) -> list:
+        """Retrieve the alert history (`AlertHistory` items) for a car by VIN."""
+        vin = (vin or "").strip()
+        if not vin:
+            raise RequestError("VIN missing")
+
+        resp = await self.async_request("GET", f"/api/alerts/{vin}/")
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to fetch alerts")
+        if resp.status != 200:
+            text = await resp.text()
+            _LOGGER.debug("Failed to fetch alerts for VIN %s: %s %s", vin, resp.status, text)
+            raise RequestError(f"Failed fetching alerts: {resp.status}")
+
+        data = await self._async_json(resp)
+        return data if isinstance(data, list) else []
+
+    async def async_get_timers(self, vin: str, cache: bool = True) -> list:
+        """Retrieve the server-side command timers (`CommandTimerSetting`) for a car."""
+        vin = (vin or "").strip()
+        if not vin:
+            raise RequestError("VIN missing")
+
+        resp = await self.async_request("GET", f"/api/car/{vin}/timers/", cache=cache)
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to fetch timers")
+        if resp.status != 200:
+            text = await resp.text()
+            _LOGGER.debug("Failed to fetch timers for VIN %s: %s %s", vin, resp.status, text)
+            raise RequestError(f"Failed fetching timers: {resp.status}")
+
+        data = await self._async_json(resp)
+        return data if isinstance(data, list) else []
+
+    async def async_create_timer(self, vin: str, timer: dict) -> dict:
+        """Create a new command timer for a car."""
+        resp = await self.async_request("POST", f"/api/car/{vin}/timers/", json=timer)
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to create timer")
+        if resp.status not in (200, 201):
+            text = await resp.text()
+            _LOGGER.debug("Failed to create timer for VIN %s: %s %s", vin, resp.status, text)
+            raise RequestError(f"Failed creating timer: {resp.status}")
+
+        return await self._async_json(resp)
+
+    async def async_update_timer(self, vin: str, timer_id: int, timer: dict) -> dict:
+        """Replace an existing command timer (PUT with the full timer body)."""
+        resp = await self.async_request("PUT", f"/api/car/{vin}/timers/{timer_id}", json=timer)
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to update timer")
+        if resp.status != 200:
+            text = await resp.text()
+            _LOGGER.debug("Failed to update timer %s for VIN %s: %s %s", timer_id, vin, resp.status, text)
+            raise RequestError(f"Failed updating timer: {resp.status}")
+
+        return await self._async_json(resp)
+
+    async def async_probe_location(self, vin: str) -> dict:
+        """Ask the server for the car's current location only (`/api/probe/location/{vin}/`)."""
+        vin = (vin or "").strip()
+        if not vin:
+            raise RequestError("VIN missing")
+
+        resp = await self.async_request("GET", f"/api/probe/location/{vin}/")
+        if resp.status == 401:
+            raise AuthenticationError("Not authorized to probe location")
+        if resp.status != 200:
+            text = await resp.text()
+            _LOGGER.debug("Failed to probe location for VIN %s: %s %s", vin, resp.status, text)
+            raise RequestError(f"Failed probing location: {resp.status}")
+
+        data = await self._async_json(resp)
+        return data if isinstance(data, dict) else {}
@@ -0,0 +1,240 @@
+"""Battery state-of-health trends per car.
+
+`soh`, `cap_bars`, `max_gids` and `gids` are downsampled into fixed time buckets and
+kept in an array-backed ring buffer (persisted in `.storage`). For each metric the
+series keeps running least-squares sums (n, Σt, Σt², Σy, Σty). Adding a sample,
+replacing a bucket mean or evicting the oldest row therefore updates every metric's
+linear trend in O(1); the history is never rescanned.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+import math
+
+from .charging import WH_PER_GID
+from .store import async_load
+from .util import parse_ts
+
+METRICS = ("soh", "cap_bars", "max_gids", "gids")
+# Car fields read by the health tracker (see fields.py)
+CAR_FIELDS = ("ev_info.last_updated",) + tuple(f"ev_info.{key}" for key in METRICS)
+
+# One downsampled row per 6 hours, about a year of history per car
+DOWNSAMPLE_SEC = 6 * 3600
+DEFAULT_SERIES_SIZE = 4 * 366
+# Delay (seconds) before writing the series to disk after a change
+SAVE_DELAY = 300
+
+_DAY = 86400.0
+_NAN = float("nan")
+
+
+class BatterySeries:
+    """Downsampled time series of battery metrics with O(1) linear-trend updates."""
+
+    def __init__(self, capacity: int = DEFAULT_SERIES_SIZE, origin: float | None = None) -> None:
+        self._capacity = capacity
+        self._origin = origin
+        self._bucket = array("q", [0]) * capacity
+        self._count = array("l", [0]) * capacity
+        self._cols = [array("d", [_NAN]) * capacity for _ in METRICS]
+        self._head = 0
+        self._size = 0
+        # Per-metric sufficient statistics: n, Σt, Σt², Σy, Σty (t in days since origin)
+        self._sums = [[0.0] * 5 for _ in METRICS]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _t(self, bucket: int) -> float:
+        return (bucket * DOWNSAMPLE_SEC - (self._origin or 0.0)) / _DAY
+
+    def _accumulate(self, i: int, sign: float) -> None:
+        t = self._t(self._bucket[i])
+        for m, col in enumerate(self._cols):
+            y = col[i]
+            if math.isnan(y):
+                continue
+            s = self._sums[m]
+            s[0] += sign
+            s[1] += sign * t
+            s[2] += sign * t * t
+            s[3] += sign * y
+            s[4] += sign * t * y
+
+    def _last_index(self) -> int | None:
+        return (self._head - 1) % self._capacity if self._size else None
+
+    def add(self, ts: float, values: dict) -> None:
+        """Add one sample; folds into the current bucket mean or opens a new bucket."""
+        if self._origin is None:
+            self._origin = float(int(ts // DOWNSAMPLE_SEC) * DOWNSAMPLE_SEC)
+        bucket = int(ts // DOWNSAMPLE_SEC)
+        last = self._last_index()
+
+        if last is not None and self._bucket[last] == bucket:
+            # Replace the bucket's contribution with its updated running mean
+            self._accumulate(last, -1.0)
+            n = self._count[last]
+            for m, key in enumerate(METRICS):
+                y = _as_float(values.get(key))
+                if y is None:
+                    continue
+                col = self._cols[m]
+                col[last] = y if math.isnan(col[last]) else col[last] + (y - col[last]) / (n + 1)
+            self._count[last] = n + 1
+            self._accumulate(last, 1.0)
+            return
+
+        if last is not None and bucket < self._bucket[last]:
+            # Out-of-order sample older than the newest bucket: ignore
+            return
+
+        i = self._head
+        if self._size == self._capacity:
+            # Evict the oldest row from the running sums before overwriting it
+            self._accumulate(i, -1.0)
+        else:
+            self._size += 1
+        self._bucket[i] = bucket
+        self._count[i] = 1
+        for m, key in enumerate(METRICS):
+            y = _as_float(values.get(key))
+            self._cols[m][i] = _NAN if y is None else y
+        self._head = (i + 1) % self._capacity
+        self._accumulate(i, 1.0)
+
+    def latest(self) -> dict:
+        last = self._last_index()
+        if last is None:
+            return {}
+        return {key: (None if math.isnan(self._cols[m][last]) else self._cols[m][last]) for m, key in enumerate(METRICS)}
+
+    def fit(self) -> dict[str, tuple[float, float] | None]:
+        """Least-squares (slope per day, intercept) for every metric at once."""
+        out: dict[str, tuple[float, float] | None] = {}
+        for key, (n, st, stt, sy, sty) in zip(METRICS, self._sums):
+            det = n * stt - st * st
+            if n < 2 or abs(det) < 1e-9:
+                out[key] = None
+                continue
+            slope = (n * sty - st * sy) / det
+            out[key] = (slope, (sy - slope * st) / n)
+        return out
+
+    def project(self, key: str, ts: float) -> float | None:
+        """Value of a metric's linear trend at epoch time `ts`."""
+        fit = self.fit().get(key)
+        if fit is None or self._origin is None:
+            return None
+        slope, intercept = fit
+        return intercept + slope * (ts - self._origin) / _DAY
+
+    def as_dict(self) -> dict:
+        start = (self._head - self._size) % self._capacity
+        rows = []
+        for k in range(self._size):
+            i = (start + k) % self._capacity
+            rows.append(
+                [self._bucket[i], self._count[i]]
+                + [None if math.isnan(col[i]) else col[i] for col in self._cols]
+            )
+        return {"origin": self._origin, "rows": rows}
+
+    @classmethod
+    def from_dict(cls, data: dict, capacity: int = DEFAULT_SERIES_SIZE) -> "BatterySeries":
+        series = cls(capacity, origin=data.get("origin"))
+        for row in (data.get("rows") or [])[-capacity:]:
+            try:
+                bucket, count, *vals = row
+            except (TypeError, ValueError):
+                continue
+            i = series._head
+            series._bucket[i] = int(bucket)
+            series._count[i] = int(count)
+            for m in range(len(METRICS)):
+                v = vals[m] if m < len(vals) else None
+                series._cols[m][i] = _NAN if v is None else float(v)
+            series._head = (i + 1) % capacity
+            series._size += 1
+            series._accumulate(i, 1.0)
+        return series
+
+
+def _as_float(value) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class BatteryHealthTracker:
+    """Per-VIN battery series, persisted through an optional `Store`."""
+
+    def __init__(self, store=None) -> None:
+        self._store = store
+        self._series: dict[str, BatterySeries] = {}
+        self._last_key: dict[str, object] = {}
+
+    async def async_load(self) -> None:
+        data = await async_load(self._store)
+        for vin, raw in data.items():
+            if isinstance(raw, dict):
+                self._series[vin] = BatterySeries.from_dict(raw)
+
+    def _data_to_save(self) -> dict:
+        return {vin: series.as_dict() for vin, series in self._series.items()}
+
+    def series(self, vin: str) -> BatterySeries | None:
+        return self._series.get(vin)
+
+    def add_sample(self, vin: str, ev: dict, now: datetime | None = None) -> bool:
+        if not isinstance(ev, dict) or all(ev.get(k) is None for k in METRICS):
+            return False
+        raw_ts = ev.get("last_updated")
+        key = (raw_ts,) + tuple(ev.get(k) for k in METRICS)
+        if raw_ts and self._last_key.get(vin) == key:
+            return False
+        self._last_key[vin] = key
+
+        parsed = parse_ts(raw_ts) if isinstance(raw_ts, str) else None
+        if parsed is not None and parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        ts = (parsed or now or datetime.now(timezone.utc)).timestamp()
+        self._series.setdefault(vin, BatterySeries()).add(ts, ev)
+        return True
+
+    def update(self, cars: list, now: datetime | None = None) -> None:
+        """Feed one coordinator snapshot (list of car dicts)."""
+        changed = False
+        for car in cars or []:
+            if isinstance(car, dict) and car.get("vin"):
+                changed |= self.add_sample(str(car["vin"]), car.get("ev_info") or {}, now=now)
+        if changed and self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def health(self, vin: str, now: datetime | None = None) -> dict:
+        """Current SoH, usable capacity and projected capacity one year ahead."""
+        series = self._series.get(vin)
+        if series is None or not len(series):
+            return {}
+        latest = series.latest()
+        now_ts = (now or datetime.now(timezone.utc)).timestamp()
+        fit = series.fit()
+
+        max_gids = latest.get("max_gids")
+        projected_gids = series.project("max_gids", now_ts + 365 * _DAY)
+        soh_fit = fit.get("soh")
+        gids_fit = fit.get("max_gids")
+        return {
+            "soh": latest.get("soh"),
+            "cap_bars": latest.get("cap_bars"),
+            "usable_kwh": max_gids * WH_PER_GID / 1000 if max_gids is not None else None,
+            "projected_kwh": max(0.0, projected_gids * WH_PER_GID / 1000) if projected_gids is not None else None,
+            "soh_trend_per_year": soh_fit[0] * 365 if soh_fit else None,
+            "capacity_trend_kwh_per_year": gids_fit[0] * 365 * WH_PER_GID / 1000 if gids_fit else None,
+            "samples": len(series),
+        }
@@ -7,9 +7,13 @@ from homeassistant.components.button import ButtonEntity
 from typing import Any
 
 from . import DOMAIN
+from .commands import async_send_command
 
 _LOGGER = logging.getLogger(__name__)
 
+# Car fields read by the buttons (see fields.py)
+CAR_FIELDS = ("vin", "nickname", "model_name", "make")
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
@@ -24,6 +28,8 @@ async def async_setup_entry(hass, entry, async_add_entities):
         if car.get("vin"):
             entities.append(CarRefreshButton(entry.entry_id, car))
             entities.append(CarChargeStartButton(entry.entry_id, car))
+            if data.get("location_prober") is not None:
+                entities.append(CarLocationProbeButton(entry.entry_id, car))
 
     # Tests set hass on the entity for direct method calls
     for ent in entities:
@@ -92,13 +98,8 @@ class CarRefreshButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Press the button to send a 'Refresh data' command to the API for this car."""
-        client = hass_client(self.hass, self._entry_id)
         try:
-            await client.async_request(
-                "POST",
-                f"/api/command/{self._vin}/",
-                json={"vin": self._vin, "command_type": 1},
-            )
+            await async_send_command(self.hass.data[DOMAIN][self._entry_id], self._vin, 1)
         except Exception:  # pragma: no cover - network
             _LOGGER.exception("Failed to request car refresh for %s", self._vin)
             raise
@@ -152,13 +153,8 @@ class CarChargeStartButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Press the button to send a 'Charge start' command to the API for this car."""
-        client = hass_client(self.hass, self._entry_id)
         try:
-            await client.async_request(
-                "POST",
-                f"/api/command/{self._vin}/",
-                json={"vin": self._vin, "command_type": 2},
-            )
+            await async_send_command(self.hass.data[DOMAIN][self._entry_id], self._vin, 2)
         except Exception:  # pragma: no cover - network
             _LOGGER.exception("Failed to request charge start for %s", self._vin)
             raise
@@ -175,4 +171,47 @@ class CarChargeStartButton(ButtonEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        return {"entry_id": self._entry_id, "vin": self._vin}
\ No newline at end of file
+        return {"entry_id": self._entry_id, "vin": self._vin}
+
+class CarLocationProbeButton(ButtonEntity):
+    """Button that refreshes only the GPS location of a specific car."""
+
+    def __init__(self, entry_id: str, car: dict) -> None:
+        self._entry_id = entry_id
+        self._car = car
+        self._vin = car.get("vin")
+
+    @property
+    def name(self) -> str:
+        # Friendly label: prefer car nickname, then model name, then VIN
+        label = self._car.get("nickname") or self._car.get("model_name") or self._vin
+        return f"Refresh location for {label}"
+
+    @property
+    def unique_id(self) -> str:
+        return f"ha_opencarwings_car_locate_{self._vin}"
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {(DOMAIN, self._vin)},
+            "name": self._car.get("model_name"),
+            "manufacturer": self._car.get("make"),
+            "model": self._car.get("model_name"),
+        }
+
+    async def async_press(self) -> None:
+        """Press the button to probe the car location (updates only its tracker)."""
+        prober = self.hass.data[DOMAIN][self._entry_id].get("location_prober")
+        if prober is None:
+            _LOGGER.warning("Location probe pressed but prober is not available for %s", self._vin)
+            return
+        try:
+            await prober.async_probe(self._vin)
+        except Exception:  # pragma: no cover - network
+            _LOGGER.exception("Failed to probe location for %s", self._vin)
+            raise
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {"entry_id": self._entry_id, "vin": self._vin}
@@ -0,0 +1,179 @@
+"""HTTP response cache for `OpenCarWingsAPI` GET requests.
+
+Setup (and every reload), diagnostics downloads and timer syncs re-request the same
+car detail and timer lists within seconds of each other. Successful GET bodies of the
+endpoints listed in `ENDPOINT_TTLS` are kept for that endpoint's TTL in a size-bounded
+LRU. Responses of long-lived endpoints (timers) are also persisted through a `Store`
+so a reload or restart starts warm. Car detail bodies carry TCU and APN credentials
+and are only written to disk when `persist_car_detail` is set. Any write (command,
+timer update) drops the cached responses of the car it targets, and callers can
+bypass the cache per call (`cache=False`).
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import logging
+import re
+import time
+
+from .store import async_load
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds a successful GET response is reused, by path; other paths are not cached
+# (the car list, alerts and location probes must always be fresh)
+ENDPOINT_TTLS: tuple[tuple[re.Pattern, float], ...] = (
+    (re.compile(r"^/api/car/[^/]+/timers/$"), 600),
+    # Well below the shortest scan interval, so polls never get an old detail
+    (re.compile(r"^/api/car/[^/]+/$"), 30),
+)
+# Only responses kept at least this long (seconds) are persisted by default
+PERSIST_MIN_TTL = 300
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+# Seconds between a change and writing the persisted cache
+SAVE_DELAY = 10
+
+# `/api/<resource>/<vin>/...`: the car a request is about
+_CAR_PATH = re.compile(r"^/api/[^/]+/([^/]+)/")
+
+
+def endpoint_ttl(path: str) -> float:
+    for pattern, ttl in ENDPOINT_TTLS:
+        if pattern.match(path):
+            return ttl
+    return 0
+
+
+class CachedResponse:
+    """Stand-in for a 200 response whose body is already known."""
+
+    status = 200
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self) -> bytes:
+        return self._body
+
+    async def text(self) -> str:
+        return self._body.decode("utf-8", "replace")
+
+    def release(self) -> None:
+        pass
+
+
+class ResponseCache:
+    """LRU of response bodies keyed by path, with per-entry expiry (wall clock)."""
+
+    def __init__(
+        self,
+        store=None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        persist_car_detail: bool = False,
+    ) -> None:
+        self._store = store
+        self.persist_car_detail = persist_car_detail
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # path -> (expires at, body)
+        self._entries: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.bypasses = 0
+        self.evictions = 0
+
+    async def async_load(self) -> None:
+        data = await async_load(self._store)
+        now = time.time()
+        entries = data.get("entries") or {}
+        for path, (expires, body) in entries.items():
+            if expires > now and self._persisted(path):
+                self._put(path, body.encode("utf-8"), expires)
+        if any(not self._persisted(path) for path in entries):
+            # Written by a version that persisted every response: rewrite without them
+            self._schedule_save()
+
+    def _persisted(self, path: str) -> bool:
+        ttl = endpoint_ttl(path)
+        return ttl >= PERSIST_MIN_TTL or (bool(ttl) and self.persist_car_detail)
+
+    def _data_to_save(self) -> dict:
+        now = time.time()
+        return {
+            "entries": {
+                path: (expires, body.decode("utf-8", "replace"))
+                for path, (expires, body) in self._entries.items()
+                if expires > now and self._persisted(path)
+            }
+        }
+
+    def _schedule_save(self) -> None:
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+
+    def get(self, path: str) -> bytes | None:
+        entry = self._entries.get(path)
+        if entry is None or entry[0] <= time.time():
+            if entry is not None:
+                self._drop(path)
+            if endpoint_ttl(path):
+                self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, path: str, body: bytes) -> None:
+        ttl = endpoint_ttl(path)
+        if not ttl or len(body) > self.max_bytes:
+            return
+        self._put(path, body, time.time() + ttl)
+        if self._persisted(path):
+            self._schedule_save()
+
+    def _put(self, path: str, body: bytes, expires: float) -> None:
+        self._drop(path)
+        self._entries[path] = (expires, body)
+        self._bytes += len(body)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._drop(oldest)
+            self.evictions += 1
+
+    def _drop(self, path: str) -> None:
+        entry = self._entries.pop(path, None)
+        if entry is not None:
+            self._bytes -= len(entry[1])
+
+    def invalidate_for(self, path: str) -> int:
+        """Drop the cached responses of the car `path` is about; returns the count."""
+        match = _CAR_PATH.match(path)
+        if match is None:
+            return 0
+        marker = f"/{match.group(1)}/"
+        stale = [p for p in self._entries if marker in p]
+        for p in stale:
+            self._drop(p)
+        if any(self._persisted(p) for p in stale):
+            self._schedule_save()
+        return len(stale)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._schedule_save()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "bypasses": self.bypasses,
+            "evictions": self.evictions,
+        }
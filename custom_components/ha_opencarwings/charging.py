@@ -0,0 +1,171 @@
+"""Incremental charging-session tracking from `ev_info`.
+
+Each refresh is folded into the per-car session state in O(1): a session starts when
+`charging` or `quick_charging` turns on and ends when both are off (or the cable is
+unplugged). Energy added is the sum of positive battery-energy deltas while charging
+(including the one into the first charging sample of a session), taken from
+`wh_content` when the car reports it and from `gids` otherwise. The lifetime total
+and the last battery energy per car are persisted through an optional `Store`, so
+the `total_increasing` energy sensor survives restarts.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from .store import async_load
+from .util import parse_ts
+
+# Energy per GID (LeafSpy convention)
+WH_PER_GID = 77.5
+# Seconds between a change of the totals and writing them
+SAVE_DELAY = 60
+
+# Car fields read by the session tracker (see fields.py)
+CAR_FIELDS = tuple(
+    f"ev_info.{key}"
+    for key in ("last_updated", "charging", "quick_charging", "plugged_in", "wh_content", "gids", "soc")
+)
+
+
+def _energy_wh(ev: dict) -> float | None:
+    for key, scale in (("wh_content", 1.0), ("gids", WH_PER_GID)):
+        value = ev.get(key)
+        if value is None:
+            continue
+        try:
+            return float(value) * scale
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+class _CarChargeState:
+    __slots__ = (
+        "active", "quick", "start_ts", "last_ts", "last_wh", "energy_wh",
+        "start_soc", "last_soc", "total_wh", "last_session", "last_key",
+    )
+
+    def __init__(self) -> None:
+        self.active = False
+        self.quick = False
+        self.start_ts: float | None = None
+        self.last_ts: float | None = None
+        self.last_wh: float | None = None
+        self.energy_wh = 0.0
+        self.start_soc = None
+        self.last_soc = None
+        self.total_wh = 0.0
+        self.last_session: dict | None = None
+        self.last_key = None
+
+    def session(self) -> dict:
+        duration = max(0.0, (self.last_ts or 0.0) - (self.start_ts or 0.0))
+        return {
+            "start": self.start_ts,
+            "end": None if self.active else self.last_ts,
+            "energy_wh": self.energy_wh,
+            "duration_sec": duration,
+            # average charge rate in kW over the session
+            "average_kw": (self.energy_wh / 1000) / (duration / 3600) if duration > 0 else None,
+            "soc_start": self.start_soc,
+            "soc_end": self.last_soc,
+            "quick_charge": self.quick,
+        }
+
+
+class ChargingSessionTracker:
+    """Per-VIN charging sessions and cumulative energy added."""
+
+    def __init__(self, store=None) -> None:
+        self._store = store
+        self._cars: dict[str, _CarChargeState] = {}
+
+    async def async_load(self) -> None:
+        data = await async_load(self._store)
+        for vin, raw in data.items():
+            if not isinstance(raw, dict):
+                continue
+            state = self._cars.setdefault(vin, _CarChargeState())
+            try:
+                state.total_wh = float(raw.get("total_wh") or 0.0)
+                state.last_wh = float(raw["last_wh"]) if raw.get("last_wh") is not None else None
+            except (TypeError, ValueError):
+                continue
+
+    def _data_to_save(self) -> dict:
+        return {vin: {"total_wh": state.total_wh, "last_wh": state.last_wh} for vin, state in self._cars.items()}
+
+    def is_active(self, vin: str) -> bool:
+        state = self._cars.get(vin)
+        return bool(state and state.active)
+
+    def session(self, vin: str) -> dict | None:
+        """The session in progress, or else the last finished one."""
+        state = self._cars.get(vin)
+        if state is None:
+            return None
+        if state.active:
+            return state.session()
+        return state.last_session
+
+    def total_energy_wh(self, vin: str) -> float:
+        state = self._cars.get(vin)
+        return state.total_wh if state else 0.0
+
+    def add_sample(self, vin: str, ev: dict, now: datetime | None = None) -> bool:
+        """Fold one `ev_info` sample in; True when the persisted state changed."""
+        if not isinstance(ev, dict):
+            return False
+        state = self._cars.setdefault(vin, _CarChargeState())
+
+        raw_ts = ev.get("last_updated")
+        # Consecutive polls often return the same car report; process it once
+        key = (raw_ts, ev.get("charging"), ev.get("quick_charging"), ev.get("wh_content"), ev.get("gids"))
+        if raw_ts and key == state.last_key:
+            return False
+        state.last_key = key
+        persisted = (state.total_wh, state.last_wh)
+
+        parsed = parse_ts(raw_ts) if isinstance(raw_ts, str) else None
+        if parsed is not None and parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        ts = (parsed or now or datetime.now(timezone.utc)).timestamp()
+
+        charging = bool(ev.get("charging") or ev.get("quick_charging"))
+        if ev.get("plugged_in") is False:
+            charging = False
+        wh = _energy_wh(ev)
+        soc = ev.get("soc")
+
+        if not state.active and charging:
+            state.active = True
+            state.quick = bool(ev.get("quick_charging"))
+            state.start_ts = ts
+            state.energy_wh = 0.0
+            state.start_soc = soc
+        elif state.active:
+            state.quick = state.quick or bool(ev.get("quick_charging"))
+        if state.active and wh is not None and state.last_wh is not None and wh > state.last_wh:
+            # From the previous sample, also the last one before the session started
+            delta = wh - state.last_wh
+            state.energy_wh += delta
+            state.total_wh += delta
+
+        state.last_ts = ts
+        state.last_soc = soc
+        if wh is not None:
+            state.last_wh = wh
+
+        if state.active and not charging:
+            state.active = False
+            state.last_session = state.session()
+        return (state.total_wh, state.last_wh) != persisted
+
+    def update(self, cars: list, now: datetime | None = None) -> None:
+        """Feed one coordinator snapshot (list of car dicts)."""
+        changed = False
+        for car in cars or []:
+            if isinstance(car, dict) and car.get("vin"):
+                changed |= self.add_sample(str(car["vin"]), car.get("ev_info") or {}, now=now)
+        if changed and self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -0,0 +1,190 @@
+"""Command tracking per car from the `command_*` fields of the car detail.
+
+`POST /api/command/{vin}/` returns as soon as the server has queued the command; the
+car picks it up on its next TCU connection. The car detail reports the last command
+(`command_type`, `command_request_time`), whether it is still waiting
+(`command_requested`) and its outcome (`command_result`, `command_result_display`).
+The tracker folds these in per refresh: a command is pending from the moment the
+integration sends it until the server reports it done, and the round trip of every
+command seen completing (request time to the car's connection that carried it out)
+goes into a rolling per-car latency window.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import re
+
+from .api import AuthenticationError, RequestError
+from .util import LatencyWindow, parse_ts
+
+# command_type values of /api/command/{vin}/ (openapi.json)
+COMMAND_TYPES = {
+    0: "No command",
+    1: "Refresh data",
+    2: "Charge start",
+    3: "A/C on",
+    4: "A/C off",
+    5: "Read configuration",
+}
+
+_NAME_KEY = re.compile(r"[^a-z0-9]")
+# Normalized command name -> command_type ("A/C on", "ac_on" and "AC On" all match)
+_COMMANDS_BY_NAME = {_NAME_KEY.sub("", name.lower()): value for value, name in COMMAND_TYPES.items()}
+
+# Car fields read by the command tracker (see fields.py)
+CAR_FIELDS = (
+    "command_type",
+    "command_type_display",
+    "command_result",
+    "command_result_display",
+    "command_request_time",
+    "command_requested",
+    "last_connection",
+)
+
+# Round trips kept per car, and needed before percentiles are reported
+LATENCY_WINDOW = 50
+LATENCY_MIN_SAMPLES = 3
+# A sent command the server never reports is no longer considered pending
+PENDING_TIMEOUT = timedelta(minutes=30)
+
+
+class _CarCommandState:
+    __slots__ = ("seen", "request_key", "requested", "sent_at", "sent_type", "last_latency", "latency", "car")
+
+    def __init__(self) -> None:
+        self.seen = False
+        # command_request_time of the last command reported done
+        self.request_key = None
+        self.requested = False
+        self.sent_at: datetime | None = None
+        self.sent_type: int | None = None
+        self.last_latency: float | None = None
+        self.latency = LatencyWindow(LATENCY_WINDOW, LATENCY_MIN_SAMPLES)
+        self.car: dict = {}
+
+
+class CommandTracker:
+    """Last command status and command round-trip latency per VIN."""
+
+    def __init__(self) -> None:
+        self._cars: dict[str, _CarCommandState] = {}
+        self.sent = 0
+        self.completed = 0
+
+    def _state(self, vin: str) -> _CarCommandState:
+        return self._cars.setdefault(vin, _CarCommandState())
+
+    def record_sent(self, vin: str, command_type: int, now: datetime | None = None) -> None:
+        """A command was accepted by the server for `vin` (pending until reported done)."""
+        state = self._state(vin)
+        state.sent_at = now or datetime.now(timezone.utc)
+        state.sent_type = command_type
+        self.sent += 1
+
+    def update(self, cars: list, now: datetime | None = None) -> None:
+        """Fold the command fields of a fresh snapshot in."""
+        now = now or datetime.now(timezone.utc)
+        for car in cars or []:
+            vin = car.get("vin") if isinstance(car, dict) else None
+            if not vin or "command_request_time" not in car:
+                continue
+            state = self._state(str(vin))
+            state.car = car
+            key = car.get("command_request_time")
+            state.requested = bool(car.get("command_requested"))
+            if state.requested:
+                # The server has our command (or another one): it reports from here on
+                state.sent_at = None
+            elif key is not None and key != state.request_key:
+                if state.seen:
+                    self._completed(state, car, now)
+                state.request_key = key
+                state.sent_at = None
+            elif state.sent_at is not None and now - state.sent_at > PENDING_TIMEOUT:
+                state.sent_at = None
+            state.seen = True
+
+    def _completed(self, state: _CarCommandState, car: dict, now: datetime) -> None:
+        start = parse_ts(car.get("command_request_time"))
+        if start is None:
+            return
+        # The car's connection that carried the command out; the poll time otherwise
+        end = parse_ts(car.get("last_connection"))
+        if end is None or end < start or end > now:
+            end = now
+        state.last_latency = (end - start).total_seconds()
+        state.latency.add(state.last_latency)
+        self.completed += 1
+
+    def is_pending(self, vin: str) -> bool:
+        state = self._cars.get(vin)
+        return state is not None and (state.requested or state.sent_at is not None)
+
+    def pending_vins(self) -> list[str]:
+        return [vin for vin in self._cars if self.is_pending(vin)]
+
+    def latency(self, vin: str, pct: float) -> float | None:
+        """`pct` percentile of the car's recent command round trips (seconds)."""
+        state = self._cars.get(vin)
+        return state.latency.percentile(pct) if state is not None else None
+
+    def status(self, vin: str) -> dict:
+        state = self._cars.get(vin)
+        if state is None:
+            return {}
+        car = state.car
+        command_type = state.sent_type if state.sent_at is not None else car.get("command_type")
+        return {
+            "command": COMMAND_TYPES.get(command_type, car.get("command_type_display")),
+            "command_type": command_type,
+            "pending": self.is_pending(vin),
+            "result": car.get("command_result"),
+            "result_display": car.get("command_result_display"),
+            "requested_at": car.get("command_request_time"),
+            "sent_at": state.sent_at.isoformat() if state.sent_at is not None else None,
+            "last_latency": state.last_latency,
+            "latency_samples": len(state.latency),
+        }
+
+
+def record_sent(entry_data, vin: str, command_type: int) -> None:
+    """Register a command accepted for `vin` with the entry's tracker (if any)."""
+    tracker = entry_data.get("commands") if isinstance(entry_data, dict) else None
+    if tracker is not None:
+        tracker.record_sent(vin, command_type)
+
+
+def resolve_command_type(value) -> int:
+    """command_type for a number or a command name (e.g. 5 or "Read configuration").
+
+    Raises ValueError for unknown commands and for "No command".
+    """
+    if isinstance(value, str) and not value.strip().isdigit():
+        command_type = _COMMANDS_BY_NAME.get(_NAME_KEY.sub("", value.lower()))
+    else:
+        try:
+            command_type = int(value)
+        except (TypeError, ValueError):
+            command_type = None
+    if not command_type or command_type not in COMMAND_TYPES:
+        raise ValueError(f"Unknown command {value!r}")
+    return command_type
+
+
+async def async_send_command(entry_data: dict, vin: str, command_type: int) -> None:
+    """POST a command for `vin` with the entry's client and start tracking it.
+
+    Raises AuthenticationError / RequestError when the server doesn't accept the
+    command (e.g. 400 for a bad command, 404 for an unknown car); it is only
+    tracked as pending once accepted.
+    """
+    resp = await entry_data["client"].async_request(
+        "POST", f"/api/command/{vin}/", json={"vin": vin, "command_type": command_type}
+    )
+    if resp.status == 401:
+        raise AuthenticationError("Not authorized to send command")
+    if not 200 <= resp.status < 300:
+        text = await resp.text()
+        raise RequestError(f"Failed sending command: {resp.status} {text}".strip())
+    record_sent(entry_data, vin, command_type)
@@ -5,7 +5,12 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 
-from .api import OpenCarWingsAPI, AuthenticationError, DEFAULT_API_BASE
+from . import DEFAULT_WATCH_INTERVAL_SEC
+from .alerts import DEFAULT_ALERTS_SCAN_INTERVAL_MIN
+from .api import OpenCarWingsAPI, AuthenticationError, RequestError, DEFAULT_API_BASE, DEFAULT_JSON_OFFLOAD_BYTES
+from .details import DEFAULT_DETAIL_RETRY_INTERVAL_SEC, DEFAULT_STATIC_REFRESH_MIN
+from .location import DEFAULT_PROBE_INTERVAL_RUNNING_SEC
+from .staleness import DEFAULT_MAX_STALENESS_MIN
 
 # Scan interval choices in minutes with friendly labels
 SCAN_INTERVAL_CHOICES = [
@@ -27,8 +32,82 @@ DEFAULT_SCAN_INTERVAL_MIN = 15
 # Default API base URL
 DEFAULT_API_BASE_URL = DEFAULT_API_BASE
 
+# Concurrent API requests allowed per entry (suggested from the probed latency)
+DEFAULT_MAX_CONCURRENT_REQUESTS = 4
+MAX_CONCURRENT_REQUESTS_LIMIT = 16
 
-class OpenCARWINGSConfigFlow(config_entries.ConfigFlow, domain="ha_opencarwings"):
+# Longest time (minutes) the last good data is served while refreshes fail
+MAX_STALENESS_LIMIT_MIN = 7 * 24 * 60
+# Longest time (minutes) a car's unchanged detail is reused before it is fetched again
+MAX_STATIC_REFRESH_MIN = 24 * 60
+# Longest pause (seconds) between retries of failed car detail fetches
+MAX_DETAIL_RETRY_INTERVAL_SEC = 3600
+# Longest pause (seconds) between watch mode polls of the car list
+MAX_WATCH_INTERVAL_SEC = 3600
+# Smallest response size (bytes) whose JSON decoding may be moved to the executor
+MIN_JSON_OFFLOAD_BYTES = 1024
+# Longest pause (minutes) between alert polls
+MAX_ALERTS_SCAN_INTERVAL_MIN = 24 * 60
+# Longest pause (seconds) between location probes of running cars
+MAX_PROBE_INTERVAL_RUNNING_SEC = 3600
+# Highest request budget (per minute) that can be set for the fleet of entries
+MAX_REQUESTS_PER_MINUTE_LIMIT = 600
+# Hedged car detail requests allowed, in percent of the detail requests sent
+MAX_HEDGE_BUDGET_PCT = 100
+
+
+def suggest_settings(latency_ms: float | None) -> dict:
+    """Scan interval (min) and request concurrency suggested for a probed latency."""
+    if latency_ms is None:
+        return {"scan_interval": DEFAULT_SCAN_INTERVAL_MIN, "max_concurrent_requests": DEFAULT_MAX_CONCURRENT_REQUESTS}
+    if latency_ms < 250:
+        return {"scan_interval": DEFAULT_SCAN_INTERVAL_MIN, "max_concurrent_requests": 8}
+    if latency_ms < 1000:
+        return {"scan_interval": DEFAULT_SCAN_INTERVAL_MIN, "max_concurrent_requests": 4}
+    if latency_ms < 3000:
+        return {"scan_interval": 30, "max_concurrent_requests": 2}
+    return {"scan_interval": 60, "max_concurrent_requests": 1}
+
+
+class _ConnectionProbe:
+    """Per-flow cache of API clients and connection probes, keyed by base URL.
+
+    Each base URL gets one client and at most one successful probe per flow, so
+    re-submitting the form (e.g. after a typo in the password) does not repeat them.
+    """
+
+    def __init__(self, hass) -> None:
+        self._hass = hass
+        self._clients: dict[str, object] = {}
+        self._latency: dict[str, float] = {}
+
+    def client(self, base_url: str):
+        if base_url not in self._clients:
+            self._clients[base_url] = OpenCarWingsAPI(self._hass, base_url=base_url)
+        return self._clients[base_url]
+
+    async def async_latency(self, base_url: str) -> float | None:
+        """Latency in ms, None when the client cannot probe; raises RequestError."""
+        if base_url in self._latency:
+            return self._latency[base_url]
+        client = self.client(base_url)
+        if not hasattr(client, "async_check_connection"):
+            return None
+        self._latency[base_url] = await client.async_check_connection()
+        return self._latency[base_url]
+
+
+class _ProbeFlowMixin:
+    """Gives a config/options flow its per-flow connection probe cache."""
+
+    def _connection_probe(self) -> _ConnectionProbe:
+        probe = getattr(self, "_probe", None)
+        if probe is None:
+            probe = self._probe = _ConnectionProbe(getattr(self, "hass", None))
+        return probe
+
+
+class OpenCARWINGSConfigFlow(_ProbeFlowMixin, config_entries.ConfigFlow, domain="ha_opencarwings"):
     """Config flow for OpenCARWINGS."""
 
     VERSION = 1
@@ -41,25 +120,36 @@ class OpenCARWINGSConfigFlow(config_entries.ConfigFlow, domain="ha_opencarwings"
             password = user_input[CONF_PASSWORD]
             api_base = user_input.get("api_base_url", DEFAULT_API_BASE_URL)
 
-            client = OpenCarWingsAPI(getattr(self, "hass", None), base_url=api_base)
+            probe = self._connection_probe()
+            latency = None
             try:
-                tokens = await client.async_obtain_token(username, password)
+                # One cheap request first: an unreachable URL fails fast, without a token exchange
+                latency = await probe.async_latency(api_base)
+                tokens = await probe.client(api_base).async_obtain_token(username, password)
+            except RequestError:
+                errors["api_base_url"] = "cannot_connect"
             except AuthenticationError:
                 errors["base"] = "auth"
             except Exception:  # pragma: no cover - fallback
                 errors["base"] = "unknown"
             else:
-                return self.async_create_entry(
-                    title=username,
-                    data={
-                        "username": username,
-                        "access_token": tokens.get("access"),
-                        "refresh_token": tokens.get("refresh"),
-                        # persist initial scan interval choice
-                        "scan_interval": user_input.get("scan_interval", DEFAULT_SCAN_INTERVAL_MIN),
-                        "api_base_url": api_base,
-                    },
-                )
+                suggested = suggest_settings(latency)
+                scan_interval = user_input.get("scan_interval", DEFAULT_SCAN_INTERVAL_MIN)
+                if scan_interval == DEFAULT_SCAN_INTERVAL_MIN:
+                    # default left untouched: poll less often against a slow server
+                    scan_interval = max(scan_interval, suggested["scan_interval"])
+                data = {
+                    "username": username,
+                    "access_token": tokens.get("access"),
+                    "refresh_token": tokens.get("refresh"),
+                    # persist initial scan interval choice
+                    "scan_interval": scan_interval,
+                    "api_base_url": api_base,
+                    "max_concurrent_requests": suggested["max_concurrent_requests"],
+                }
+                if latency is not None:
+                    data["api_latency_ms"] = round(latency)
+                return self.async_create_entry(title=username, data=data)
 
         # Prefer to show a pretty select when Home Assistant's selector helpers
         # are available; fall back to a numeric choice list otherwise.
@@ -87,16 +177,46 @@ class OpenCARWINGSConfigFlow(config_entries.ConfigFlow, domain="ha_opencarwings"
         return self.async_show_form(step_id="user", data_schema=data_schema, errors=errors)
 
 
-class OptionsFlowHandler(config_entries.OptionsFlow):
+class OptionsFlowHandler(_ProbeFlowMixin, config_entries.OptionsFlow):
     def __init__(self, config_entry):
         self.config_entry = config_entry
 
     async def async_step_init(self, user_input=None):
-        if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
-
+        errors = {}
         current_scan = self.config_entry.options.get("scan_interval", self.config_entry.data.get("scan_interval", DEFAULT_SCAN_INTERVAL_MIN))
         current_api = self.config_entry.options.get("api_base_url", self.config_entry.data.get("api_base_url", DEFAULT_API_BASE_URL))
+        current_concurrency = self.config_entry.options.get(
+            "max_concurrent_requests",
+            self.config_entry.data.get("max_concurrent_requests", DEFAULT_MAX_CONCURRENT_REQUESTS),
+        )
+        current_staleness = self.config_entry.options.get("max_staleness", DEFAULT_MAX_STALENESS_MIN)
+        current_static_refresh = self.config_entry.options.get("static_refresh_interval", DEFAULT_STATIC_REFRESH_MIN)
+        current_detail_retry = self.config_entry.options.get("detail_retry_interval", DEFAULT_DETAIL_RETRY_INTERVAL_SEC)
+        current_watch_interval = self.config_entry.options.get("watch_interval", DEFAULT_WATCH_INTERVAL_SEC)
+        current_offload_bytes = self.config_entry.options.get("json_offload_bytes", DEFAULT_JSON_OFFLOAD_BYTES)
+        current_alerts_interval = self.config_entry.options.get("alerts_scan_interval", DEFAULT_ALERTS_SCAN_INTERVAL_MIN)
+        current_probe_interval = self.config_entry.options.get("probe_interval_running", DEFAULT_PROBE_INTERVAL_RUNNING_SEC)
+        current_stream_car_list = self.config_entry.options.get("stream_car_list", True)
+        current_request_budget = self.config_entry.options.get("max_requests_per_minute")
+        current_hedge_budget = self.config_entry.options.get("hedge_budget_pct", 0)
+        current_response_cache = self.config_entry.options.get("response_cache", True)
+        current_persist_detail = self.config_entry.options.get("persist_car_detail", False)
+
+        if user_input is not None:
+            data = {**self.config_entry.options, **user_input}
+            if "max_requests_per_minute" not in user_input:
+                # Cleared: back to the fleet default (fleet.py)
+                data.pop("max_requests_per_minute", None)
+            api_base = user_input.get("api_base_url", current_api)
+            try:
+                latency = await self._connection_probe().async_latency(api_base) if api_base != current_api else None
+            except RequestError:
+                errors["api_base_url"] = "cannot_connect"
+            else:
+                if latency is not None:
+                    data["api_latency_ms"] = round(latency)
+                return self.async_create_entry(title="", data=data)
+
         try:
             from homeassistant.helpers import selector
 
@@ -113,7 +233,41 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
             data_schema=vol.Schema({
                 vol.Required("scan_interval", default=current_scan): scan_selector,
                 vol.Required("api_base_url", default=current_api): str,
+                vol.Required("max_concurrent_requests", default=current_concurrency): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENT_REQUESTS_LIMIT)
+                ),
+                vol.Required("max_staleness", default=current_staleness): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_STALENESS_LIMIT_MIN)
+                ),
+                vol.Required("static_refresh_interval", default=current_static_refresh): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_STATIC_REFRESH_MIN)
+                ),
+                vol.Required("detail_retry_interval", default=current_detail_retry): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_DETAIL_RETRY_INTERVAL_SEC)
+                ),
+                vol.Optional("watch_interval", default=current_watch_interval): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_WATCH_INTERVAL_SEC)
+                ),
+                vol.Optional("json_offload_bytes", default=current_offload_bytes): vol.All(
+                    vol.Coerce(int), vol.Range(min=MIN_JSON_OFFLOAD_BYTES)
+                ),
+                vol.Optional("alerts_scan_interval", default=current_alerts_interval): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=MAX_ALERTS_SCAN_INTERVAL_MIN)
+                ),
+                vol.Optional("probe_interval_running", default=current_probe_interval): vol.All(
+                    vol.Coerce(int), vol.Range(min=0, max=MAX_PROBE_INTERVAL_RUNNING_SEC)
+                ),
+                vol.Optional("stream_car_list", default=current_stream_car_list): bool,
+                vol.Optional(
+                    "max_requests_per_minute", description={"suggested_value": current_request_budget}
+                ): vol.All(vol.Coerce(int), vol.Range(min=0, max=MAX_REQUESTS_PER_MINUTE_LIMIT)),
+                vol.Required("hedge_budget_pct", default=current_hedge_budget): vol.All(
+                    vol.Coerce(float), vol.Range(min=0, max=MAX_HEDGE_BUDGET_PCT)
+                ),
+                vol.Required("response_cache", default=current_response_cache): bool,
+                vol.Required("persist_car_detail", default=current_persist_detail): bool,
             }),
+            errors=errors,
         )
 
 
@@ -0,0 +1,234 @@
+"""Static car detail, fetched only when due, and tolerant of partial failures.
+
+The lite `/api/car/` list carries the fast-changing data (`ev_info`, `location`,
+report timestamps); the `/api/car/{vin}/` detail adds fields that rarely change
+(versions, TCU and vehicle data, odometer between trips). A refresh therefore only
+fetches the detail of a car when it is due: no detail yet, the last one older than
+the static refresh interval, or the list entry showing new data from the car (one of
+`CHANGE_PATHS` differs from the previous list). Every other car gets its last good
+detail underneath the fresh list entry, so a steady-state refresh is the list call
+alone.
+
+When a detail fetch fails, the car likewise keeps its last good detail instead of
+losing those fields for the cycle. Failure streaks are counted per VIN, and only the
+failing VINs are retried on a short schedule of their own until they recover, rather
+than waiting for (or forcing) a full refresh.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+import logging
+
+from .fleet import PRIORITY_ACTIVE, car_is_active, current_priority, request_priority
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between retries of the VINs whose last detail fetch failed (0 disables)
+DEFAULT_DETAIL_RETRY_INTERVAL_SEC = 60
+# Minutes a car detail is reused while its list entry shows no change (0: every poll)
+DEFAULT_STATIC_REFRESH_MIN = 60
+
+# List fields whose change means the car reported new data to the server
+# (not `last_connection`: it moves on every TCU contact, even without new data,
+# and would make the detail of a frequently reporting car due on almost every poll)
+CHANGE_PATHS = (
+    "command_request_time",
+    "ev_info.last_updated",
+    "location.last_updated",
+)
+# Car fields read for change detection (see fields.py)
+CAR_FIELDS = CHANGE_PATHS
+
+_MISSING = object()
+
+
+def _get(car: dict, path: str):
+    value = car
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def car_changed(listed: dict, known: dict) -> bool:
+    """True when a list entry reports newer data than the known car dict.
+
+    Only paths present in the list entry are compared (e.g. `command_request_time`
+    is a detail-only field).
+    """
+    for path in CHANGE_PATHS:
+        value = _get(listed, path)
+        if value is not _MISSING and value != _get(known, path):
+            return True
+    return False
+
+
+class DetailCache:
+    """Last good car detail and detail-fetch failure accounting per VIN."""
+
+    def __init__(
+        self,
+        hass,
+        client,
+        coordinator=None,
+        process=None,
+        static_refresh_min: float = DEFAULT_STATIC_REFRESH_MIN,
+    ) -> None:
+        self.hass = hass
+        self._client = client
+        self.static_refresh = timedelta(minutes=static_refresh_min) if static_refresh_min else None
+        # Set once the coordinator exists; used by the failed-VIN retries
+        self.coordinator = coordinator
+        # Called with the snapshot before a retry publishes it (subsystems)
+        self.process = process
+        self._details: dict[str, dict] = {}
+        self._streaks: dict[str, int] = {}
+        self._totals: dict[str, int] = {}
+        self._errors: dict[str, str] = {}
+        self._last_success: dict[str, datetime] = {}
+        # Previous list entry per VIN (change detection)
+        self._listed: dict[str, dict] = {}
+        # Set by the owner: VINs whose detail is fetched on every refresh for now
+        # (e.g. a pending command, reported in detail-only fields)
+        self.force_due = None
+        self._unsub = None
+        self._retrying = False
+        self.detail_fetches = 0
+        self.detail_reuses = 0
+
+    def is_due(self, car: dict, now: datetime | None = None) -> bool:
+        """Whether the detail of a listed car must be fetched in this refresh.
+
+        Also records the list entry as the reference for the next change check.
+        """
+        vin = str(car.get("vin"))
+        previous = self._listed.get(vin)
+        self._listed[vin] = car
+        if self.static_refresh is None or vin not in self._details or self.streak(vin):
+            return True
+        if self.force_due is not None and self.force_due(vin):
+            return True
+        if previous is None or car_changed(car, previous):
+            return True
+        now = now or datetime.now(timezone.utc)
+        return now - self._last_success[vin] >= self.static_refresh
+
+    def reuse(self, car: dict) -> dict:
+        """The last good detail of a car that isn't due, under its fresh list entry."""
+        self.detail_reuses += 1
+        return {**self._details[str(car.get("vin"))], **car}
+
+    async def async_fetch_due(self, cars: list) -> list:
+        """Details for the listed cars: fetched when due, the last good one otherwise.
+
+        Returned in list order, for `_merge_car_details`.
+        """
+        listed = [c for c in cars or [] if isinstance(c, dict) and c.get("vin")]
+        due = [str(c["vin"]) for c in listed if self.is_due(c)]
+        fetched = dict(zip(due, await self.async_fetch(cars, due))) if due else {}
+        return [fetched[str(c["vin"])] if str(c["vin"]) in fetched else self.reuse(c) for c in listed]
+
+    def resolve(self, cars: list, vins: list[str], details: list) -> list:
+        """Account fetch results and replace failures with the last good detail.
+
+        A failing car gets its last good detail with the fresh list entry on top
+        (the list is newer); without one the failure is passed through unchanged.
+        """
+        listed = {str(c["vin"]): c for c in cars or [] if isinstance(c, dict) and c.get("vin")}
+        now = datetime.now(timezone.utc)
+        out = []
+        for vin, detail in zip(vins, details):
+            if isinstance(detail, Exception):
+                self._streaks[vin] = self._streaks.get(vin, 0) + 1
+                self._totals[vin] = self._totals.get(vin, 0) + 1
+                self._errors[vin] = str(detail) or type(detail).__name__
+                _LOGGER.debug("Detail fetch failed for %s (%d in a row): %s", vin, self._streaks[vin], detail)
+                last_good = self._details.get(vin)
+                if last_good is not None:
+                    detail = {**last_good, **listed.get(vin, {})}
+            elif isinstance(detail, dict):
+                self._details[vin] = detail
+                self._streaks[vin] = 0
+                self._last_success[vin] = now
+            out.append(detail)
+        return out
+
+    async def async_fetch(self, cars: list, vins: list[str]) -> list:
+        """Fetch the detail of `vins` concurrently and resolve the results."""
+        details = await asyncio.gather(*(self.async_fetch_one(vin) for vin in vins), return_exceptions=True)
+        return self.resolve(cars, vins, details)
+
+    async def async_fetch_one(self, vin: str) -> dict:
+        """Fetch one car detail (unresolved; pass the result through `resolve`)."""
+        self.detail_fetches += 1
+        # Charging or moving cars go first when the fleet request budget is exhausted
+        priority = PRIORITY_ACTIVE if car_is_active(self._listed.get(vin)) else current_priority()
+        with request_priority(priority):
+            return await self._client.async_get_car_by_vin(vin)
+
+    def failing_vins(self) -> list[str]:
+        return [vin for vin, streak in self._streaks.items() if streak]
+
+    def streak(self, vin: str) -> int:
+        """Consecutive failed detail fetches of `vin`."""
+        return self._streaks.get(vin, 0)
+
+    def attributes(self, vin: str) -> dict:
+        last_success = self._last_success.get(vin)
+        return {
+            "total_failures": self._totals.get(vin, 0),
+            "last_error": self._errors.get(vin) if self.streak(vin) else None,
+            "last_success": last_success.isoformat() if last_success else None,
+            "serving_last_good": bool(self.streak(vin)) and vin in self._details,
+        }
+
+    async def async_retry_failed(self, now=None) -> list[str]:
+        """Re-fetch only the failing VINs; returns the VINs that recovered."""
+        vins = self.failing_vins()
+        data = getattr(self.coordinator, "data", None)
+        if not vins or not data or self._retrying:
+            return []
+        self._retrying = True
+        try:
+            details = await self.async_fetch(data, vins)
+        finally:
+            self._retrying = False
+        recovered = {vin: d for vin, d in zip(vins, details) if not self.streak(vin)}
+        if not recovered:
+            return []
+
+        # Detail wins over the list entry, as in a full refresh
+        data = [
+            {**c, **recovered[str(c.get("vin"))]} if str(c.get("vin")) in recovered else c
+            for c in self.coordinator.data
+        ]
+        if self.process is not None:
+            await self.process(data)
+        self.coordinator.async_set_updated_data(data)
+        return list(recovered)
+
+    async def _async_retry_logged(self, now=None) -> None:
+        try:
+            await self.async_retry_failed()
+        except Exception as err:  # pragma: no cover - defensive
+            _LOGGER.debug("Detail retry failed: %s", err)
+
+    def async_start(self, interval_sec: int = DEFAULT_DETAIL_RETRY_INTERVAL_SEC) -> None:
+        """Retry failing VINs every `interval_sec` seconds."""
+        if not interval_sec or self._unsub is not None:
+            return
+        try:
+            from homeassistant.helpers.event import async_track_time_interval
+        except Exception:  # pragma: no cover - helper not available in test stubs
+            _LOGGER.debug("Time tracking helper unavailable; failed detail retries disabled")
+            return
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_retry_logged, timedelta(seconds=interval_sec)
+        )
+
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
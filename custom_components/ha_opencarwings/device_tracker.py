@@ -10,6 +10,10 @@ except Exception:  # pragma: no cover - tests running without hass stubs
         pass
 
 from . import DOMAIN
+from .util import car_lat_lon
+
+# Car fields read by the tracker (see fields.py)
+CAR_FIELDS = ("vin", "nickname", "model_name", "make", "location", "last_location", "ev_info.last_location")
 
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
@@ -28,8 +32,11 @@ async def async_setup_entry(hass, entry, async_add_entities):
     # Only create trackers for cars with a VIN
     entities = [CarTracker(entry.entry_id, car) for car in cars if car.get("vin")]
     # Tests call entity methods directly; set hass on the entities for testability
+    prober = data.get("location_prober")
     for ent in entities:
         ent.hass = hass
+        if prober is not None:
+            prober.register_tracker(ent._vin, ent)
     async_add_entities(entities)
 
 class CarTracker(TrackerEntity):
@@ -52,27 +59,16 @@ class CarTracker(TrackerEntity):
         return SourceType.GPS
 
     def _get_lat_lon(self):
-        # Look for various forms of last location in the car data.
-        loc = self._car.get("last_location") or self._car.get("location")
-        if loc is None and isinstance(self._car.get("ev_info"), dict):
-            loc = self._car.get("ev_info", {}).get("last_location")
-
-        # If the last_location is a list, use the first element.
-        if isinstance(loc, list) and len(loc) > 0:
-            loc = loc[0]
+        return car_lat_lon(self._car)
 
-        if isinstance(loc, dict):
-            lat = loc.get("lat") or loc.get("latitude")
-            lon = loc.get("lon") or loc.get("longitude")
-            if lat is not None and lon is not None:
-                # Accept commas as decimal separators ("53,0")
-                try:
-                    lat_f = float(str(lat).replace(",", "."))
-                    lon_f = float(str(lon).replace(",", "."))
-                    return lat_f, lon_f
-                except Exception:
-                    return None, None
-        return None, None
+    def async_update_location(self, location: dict) -> None:
+        """Apply a probed location to this tracker only (no coordinator refresh)."""
+        car = {**self._car, "location": location}
+        # A probed fix supersedes any legacy last_location payload
+        car.pop("last_location", None)
+        self._car = car
+        if getattr(self, "hass", None) is not None and hasattr(self, "async_write_ha_state"):
+            self.async_write_ha_state()
 
     @property
     def latitude(self) -> float | None:
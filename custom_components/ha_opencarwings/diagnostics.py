@@ -0,0 +1,125 @@
+"""Diagnostics for OpenCARWINGS config entries.
+
+Car documents in `coordinator.data` are projected to the fields the integration
+uses (see fields.py); the diagnostics download fetches the full, unprojected detail
+of every car on demand so unknown fields can still be inspected.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from . import DOMAIN
+from .fields import projection_paths
+from .util import JSON_BACKEND
+
+TO_REDACT = {
+    # config entry
+    "access_token",
+    "refresh_token",
+    "password",
+    "username",
+    # car detail: TCU credentials and SIM / account identifiers
+    "tcu_user",
+    "tcu_pass",
+    "tcu_serial",
+    "iccid",
+    "sms_config",
+    "apn_user",
+    "apn_password",
+    "owner",
+    # positions (location payloads, send-to-car destinations, route plans)
+    "lat",
+    "lon",
+    "latitude",
+    "longitude",
+    "send_to_car_location",
+    "route_plans",
+}
+REDACTED = "**REDACTED**"
+
+
+def _redact_fallback(data, to_redact: set):
+    """Recursive redaction by key, like Home Assistant's `async_redact_data`."""
+    if isinstance(data, list):
+        return [_redact_fallback(item, to_redact) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {
+        k: (REDACTED if k in to_redact and v is not None else _redact_fallback(v, to_redact))
+        for k, v in data.items()
+    }
+
+
+def _redact(data):
+    try:
+        from homeassistant.components.diagnostics import async_redact_data
+    except Exception:  # diagnostics component not available (test stubs)
+        return _redact_fallback(data, TO_REDACT)
+    return async_redact_data(data, TO_REDACT)
+
+
+async def async_get_config_entry_diagnostics(hass, entry) -> dict[str, Any]:
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    client = data.get("client")
+    coordinator = data.get("coordinator")
+    cars = (coordinator.data if coordinator is not None else None) or data.get("cars") or []
+    stale = getattr(coordinator, "stale_cache", None)
+    detail_cache = data.get("details")
+    fleet = hass.data.get(DOMAIN, {}).get("fleet")
+    commands = data.get("commands")
+    vins = [str(c["vin"]) for c in cars if isinstance(c, dict) and c.get("vin")]
+
+    details: dict[str, Any] = {}
+    if client is not None and hasattr(client, "async_get_car_by_vin"):
+        results = await asyncio.gather(
+            *(client.async_get_car_by_vin(vin, full=True) for vin in vins),
+            return_exceptions=True,
+        )
+        for vin, res in zip(vins, results):
+            details[vin] = {"error": str(res)} if isinstance(res, Exception) else res
+
+    latency = getattr(client, "detail_latency", None)
+    return _redact({
+        "entry": dict(entry.data),
+        "options": dict(getattr(entry, "options", {}) or {}),
+        "json_backend": JSON_BACKEND,
+        "setup_timings": data.get("setup_timings"),
+        "staleness": {
+            "refresh_failures": stale.failures,
+            "last_error": stale.last_error,
+            "cars": {vin: stale.attributes(vin) for vin in vins},
+        } if stale is not None else None,
+        "detail_fetches": {
+            "fetched": detail_cache.detail_fetches,
+            "reused": detail_cache.detail_reuses,
+        } if detail_cache is not None else None,
+        "detail_failures": {
+            vin: {"streak": detail_cache.streak(vin), **detail_cache.attributes(vin)} for vin in vins
+        } if detail_cache is not None else None,
+        "detail_requests": {
+            "p50_ms": latency.percentile(50),
+            "p95_ms": latency.percentile(95),
+            "count": client.detail_requests,
+            "hedge_budget_pct": client.hedge_budget_pct,
+            "hedged": client.hedged_requests,
+            "hedge_wins": client.hedge_wins,
+        } if latency is not None else None,
+        "commands": {
+            vin: {
+                **commands.status(vin),
+                "latency_p50": commands.latency(vin, 50),
+                "latency_p95": commands.latency(vin, 95),
+            }
+            for vin in vins
+        } if commands is not None else None,
+        "fleet": fleet.stats() if fleet is not None else None,
+        "response_cache": client.response_cache.stats() if getattr(client, "response_cache", None) else None,
+        "refresh_traces": data["tracer"].export() if data.get("tracer") is not None else None,
+        # The projection compiled at setup (car_field_paths() imports modules)
+        "projected_fields": projection_paths(client.car_projection)
+        if getattr(client, "car_projection", None)
+        else None,
+        "cars": cars,
+        "car_details": details,
+    })
@@ -0,0 +1,140 @@
+"""Single coordinator listener per entry, fanning updates out to the per-car entities.
+
+With ~20 coordinator entities per car, letting each register its own listener means
+one refresh runs hundreds of callbacks that each scan `coordinator.data` for their
+car. The dispatcher is the only listener: it indexes the snapshot by VIN once per
+update, hands every entity its (seed-merged) car dict from that index, and writes
+all entity states in one batch on the next event-loop iteration, so updates arriving
+in the same iteration (refresh, location probe, ...) cost one write per entity.
+With a tracer (tracing.py), the fan-out and the entity writes following a refresh
+are recorded as spans of that refresh's trace.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Callable
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CarUpdateDispatcher:
+    """Per-entry fan-out of coordinator updates to entities grouped by VIN."""
+
+    def __init__(self, hass, coordinator, tracer=None) -> None:
+        self.hass = hass
+        self.coordinator = coordinator
+        self._tracer = tracer
+        # Trace of the refresh whose state writes are pending
+        self._trace = None
+        self._entities: dict[str, set] = {}
+        self._unsub: Callable[[], None] | None = None
+        # Snapshot index, rebuilt only when coordinator.data is replaced
+        self._data = None
+        self._by_vin: dict[str, dict] = {}
+        # vin -> (seed car, seed merged with the snapshot car)
+        self._merged: dict[str, tuple[dict, dict]] = {}
+        self._pending: set = set()
+        self._flush_handle = None
+        self.version = 0
+
+    def _snapshot(self) -> dict[str, dict]:
+        data = self.coordinator.data
+        if data is not self._data:
+            self._data = data
+            self._by_vin = {
+                str(c["vin"]): c for c in data or [] if isinstance(c, dict) and c.get("vin")
+            }
+            self._merged = {}
+            self.version += 1
+        return self._by_vin
+
+    def car(self, vin: str, seed: dict | None = None) -> dict:
+        """Car dict for `vin` (coordinator wins, seed fills missing fields)."""
+        seed = seed or {}
+        current = self._snapshot().get(vin)
+        if current is None:
+            return seed
+        cached = self._merged.get(vin)
+        if cached is not None and cached[0] is seed:
+            return cached[1]
+        merged = {**seed, **current}
+        self._merged[vin] = (seed, merged)
+        return merged
+
+    def async_register(self, vin: str, entity) -> Callable[[], None]:
+        """Deliver coordinator updates to `entity`; returns the unregister callback."""
+        self._entities.setdefault(vin, set()).add(entity)
+        if self._unsub is None:
+            self._unsub = self.coordinator.async_add_listener(self._handle_coordinator_update)
+
+        def _remove() -> None:
+            entities = self._entities.get(vin)
+            if entities is not None:
+                entities.discard(entity)
+                if not entities:
+                    del self._entities[vin]
+            self._pending.discard(entity)
+            if not self._entities:
+                self.async_stop()
+
+        return _remove
+
+    @property
+    def entity_count(self) -> int:
+        return sum(len(e) for e in self._entities.values())
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        trace = self._tracer.take_fanout() if self._tracer is not None else None
+        if trace is not None:
+            with trace.span("listener fan-out", "fan-out", entities=self.entity_count):
+                self._collect()
+            self._trace = self._trace or trace
+        else:
+            self._collect()
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # called outside the event loop (tests): write right away
+            self._flush()
+            return
+        self._flush_handle = loop.call_soon(self._flush)
+
+    def _collect(self) -> None:
+        self._snapshot()
+        for entities in self._entities.values():
+            self._pending.update(entities)
+
+    @callback
+    def _flush(self) -> None:
+        self._flush_handle = None
+        pending, self._pending = self._pending, set()
+        trace, self._trace = self._trace, None
+        if trace is None:
+            for entity in pending:
+                self._write(entity)
+            return
+        with trace.span("entity writes", "fan-out", entities=len(pending)):
+            for entity in pending:
+                name = getattr(entity, "entity_id", None) or getattr(entity, "unique_id", None)
+                with trace.span(f"write {name}", "fan-out"):
+                    self._write(entity)
+
+    @staticmethod
+    def _write(entity) -> None:
+        try:
+            entity.async_write_ha_state()
+        except Exception:  # pragma: no cover - one broken entity must not stop the batch
+            _LOGGER.exception("Error writing state of %s", getattr(entity, "entity_id", entity))
+
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
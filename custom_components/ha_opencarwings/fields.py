@@ -0,0 +1,92 @@
+"""Projection of car documents down to the fields the integration actually reads.
+
+Every platform and per-car subsystem declares the car fields it uses as `CAR_FIELDS`
+(dotted paths; a bare key keeps the whole value, `ev_info.soc` keeps only `soc` inside
+`ev_info`). The union is compiled once into a projection tree that the API client
+applies right after decoding, so large detail blobs (route plans, TCU configuration,
+favourite channels, ...) never reach `coordinator.data`. The full document can still
+be fetched on demand, e.g. from the diagnostics download.
+"""
+from __future__ import annotations
+
+from typing import Iterable
+
+# Identity fields used for device info and entity names everywhere
+BASE_FIELDS = ("vin", "nickname", "model_name", "make")
+
+# Modules declaring CAR_FIELDS (imported lazily: the platforms import the package)
+_FIELD_MODULES = (
+    "sensor",
+    "device_tracker",
+    "switch",
+    "button",
+    "trips",
+    "charging",
+    "battery",
+    "statistics",
+    "range_estimator",
+    "timers",
+    "location",
+    "details",
+    "commands",
+)
+
+
+def build_projection(paths: Iterable[str]) -> dict:
+    """Compile dotted field paths into a nested projection tree (True keeps a subtree)."""
+    tree: dict = {}
+    for path in paths:
+        node = tree
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            if node.get(part) is True:
+                break
+            if i == len(parts) - 1:
+                node[part] = True
+            else:
+                node = node.setdefault(part, {})
+    return tree
+
+
+def projection_paths(projection: dict, prefix: str = "") -> list[str]:
+    """Sorted dotted paths kept by a projection tree (inverse of `build_projection`)."""
+    paths: list[str] = []
+    for key, sub in projection.items():
+        path = f"{prefix}{key}"
+        if sub is True:
+            paths.append(path)
+        else:
+            paths.extend(projection_paths(sub, f"{path}."))
+    return sorted(paths)
+
+
+def project(doc: dict, projection: dict) -> dict:
+    """Copy of `doc` with only the fields in `projection`."""
+    out = {}
+    for key, sub in projection.items():
+        if key not in doc:
+            continue
+        value = doc[key]
+        if sub is True or not isinstance(value, dict):
+            out[key] = value
+        else:
+            out[key] = project(value, sub)
+    return out
+
+
+def car_field_paths(extra: Iterable[str] = ()) -> list[str]:
+    """Sorted union of the CAR_FIELDS declared by the platforms and subsystems.
+
+    Imports the platform modules; call it from an executor in async code.
+    """
+    import importlib
+
+    paths = set(BASE_FIELDS) | set(extra)
+    for name in _FIELD_MODULES:
+        module = importlib.import_module(f"{__package__}.{name}")
+        paths.update(getattr(module, "CAR_FIELDS", ()))
+    return sorted(paths)
+
+
+def car_projection(extra: Iterable[str] = ()) -> dict:
+    return build_projection(car_field_paths(extra))
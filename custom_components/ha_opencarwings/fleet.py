@@ -0,0 +1,281 @@
+"""Domain-level fleet scheduler and global request budget for all config entries.
+
+Each entry's coordinator would otherwise schedule itself, so several accounts poll
+the OpenCARWINGS server at uncoordinated times and rates. The fleet scheduler
+(`hass.data[DOMAIN]["fleet"]`) owns the refreshes of every entry instead:
+
+- one ticker triggers each entry's refresh at its scan interval, with the entries'
+  polls spread evenly across the interval (phase offsets, kept when a refresh is
+  requested manually in between);
+- every HTTP request of every entry takes a token from one shared budget of
+  requests per minute, refilled evenly (unlimited for a single entry unless
+  configured);
+- requests for cars that are charging or moving, and the refreshes of entries with
+  such cars, go first when the budget is exhausted.
+"""
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+import heapq
+import itertools
+import logging
+import math
+import time
+
+_LOGGER = logging.getLogger(__name__)
+
+# Requests per minute shared by all entries (0: unlimited), applied by default only
+# while more than one entry is configured: a single account is not throttled
+DEFAULT_MAX_REQUESTS_PER_MINUTE = 60
+# Share of a minute's budget that may be spent in one burst
+BURST_FRACTION = 0.1
+# Seconds between scheduler checks for due entries
+TICK_SEC = 5
+
+# Request priorities (lower goes first)
+PRIORITY_ACTIVE = 0
+PRIORITY_NORMAL = 1
+
+_PRIORITY: ContextVar[int] = ContextVar("opencarwings_request_priority", default=PRIORITY_NORMAL)
+
+
+def car_is_active(car) -> bool:
+    """True for a car that is charging or moving (its data changes quickly)."""
+    ev = car.get("ev_info") if isinstance(car, dict) else None
+    return isinstance(ev, dict) and bool(ev.get("charging") or ev.get("car_running"))
+
+
+@contextmanager
+def request_priority(priority: int):
+    """Requests sent in this context (and tasks started from it) use `priority`."""
+    token = _PRIORITY.set(priority)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+def current_priority() -> int:
+    return _PRIORITY.get()
+
+
+class RequestBudget:
+    """Token bucket of requests per minute with a priority queue of waiters."""
+
+    def __init__(self, per_minute: float = DEFAULT_MAX_REQUESTS_PER_MINUTE, clock=time.monotonic) -> None:
+        self._clock = clock
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wake_handle = None
+        self.waited = 0
+        self.set_rate(per_minute)
+
+    def set_rate(self, per_minute: float | None) -> None:
+        self.per_minute = per_minute or 0
+        self.capacity = max(1.0, self.per_minute * BURST_FRACTION)
+        self._tokens = self.capacity
+        self._updated = self._clock()
+        if self._wake_handle is not None:
+            self._wake_handle.cancel()
+            self._wake_handle = None
+        if self._waiters:
+            # Serve the queue at the new rate (all of it when now unlimited)
+            self._wake()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.per_minute / 60)
+        self._updated = now
+
+    async def async_acquire(self, priority: int | None = None) -> None:
+        """Wait for a request token (requests of lower `priority` values go first)."""
+        if not self.per_minute:
+            return
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return
+        self.waited += 1
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (current_priority() if priority is None else priority, next(self._seq), future))
+        self._schedule_wake()
+        await future
+
+    def _schedule_wake(self) -> None:
+        if self._wake_handle is not None or not self._waiters or not self.per_minute:
+            return
+        delay = max(0.0, (1 - self._tokens) * 60 / self.per_minute)
+        self._wake_handle = asyncio.get_running_loop().call_later(delay, self._wake)
+
+    def _wake(self) -> None:
+        self._wake_handle = None
+        self._refill()
+        while self._waiters and (not self.per_minute or self._tokens >= 1):
+            _, _, future = heapq.heappop(self._waiters)
+            if future.done():  # cancelled while waiting
+                continue
+            if self.per_minute:
+                self._tokens -= 1
+            future.set_result(None)
+        # drop cancelled waiters at the head so they don't keep the timer alive
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters)
+        self._schedule_wake()
+
+    @property
+    def queued(self) -> int:
+        return sum(1 for _, _, f in self._waiters if not f.done())
+
+
+class _Member:
+    def __init__(self, coordinator, interval: timedelta, budget: float | None) -> None:
+        self.coordinator = coordinator
+        self.interval = interval.total_seconds()
+        self.budget = budget
+        self.phase = 0.0
+        self.last_refresh: float | None = None
+        self.refreshing = False
+
+    def active(self) -> bool:
+        return any(car_is_active(c) for c in getattr(self.coordinator, "data", None) or [])
+
+
+class FleetScheduler:
+    """Owns the refresh schedule of every entry and the shared request budget."""
+
+    def __init__(self, hass, clock=time.monotonic) -> None:
+        self.hass = hass
+        self._clock = clock
+        self._epoch = clock()
+        self._members: dict[str, _Member] = {}
+        self.budget = RequestBudget(0, clock)
+        self._unsub = None
+        self.refreshes = 0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    # -- membership ---------------------------------------------------------
+
+    def async_register(
+        self, entry_id: str, coordinator, interval: timedelta, max_requests_per_minute: float | None = None
+    ) -> None:
+        """Schedule an entry; `max_requests_per_minute` None means not configured."""
+        self._members[entry_id] = _Member(coordinator, interval, max_requests_per_minute)
+        self._rebalance()
+
+    def async_unregister(self, entry_id: str) -> None:
+        self._members.pop(entry_id, None)
+        self._rebalance()
+        if not self._members:
+            self.async_stop()
+
+    def _rebalance(self) -> None:
+        """Spread the entries' polls evenly and apply the strictest configured budget."""
+        count = len(self._members)
+        for index, member in enumerate(self._members.values()):
+            member.phase = index / count
+        default = DEFAULT_MAX_REQUESTS_PER_MINUTE if count > 1 else 0
+        budgets = [m.budget if m.budget is not None else default for m in self._members.values()]
+        budgets = [b for b in budgets if b]
+        rate = min(budgets) if budgets else 0
+        if rate != self.budget.per_minute:
+            self.budget.set_rate(rate)
+
+    @property
+    def owns_schedule(self) -> bool:
+        """True while the ticker runs (the coordinators don't schedule themselves)."""
+        return self._unsub is not None
+
+    def set_interval(self, entry_id: str, interval: timedelta) -> None:
+        """Change an entry's poll interval (e.g. failure backoff)."""
+        member = self._members.get(entry_id)
+        if member is not None:
+            member.interval = interval.total_seconds()
+
+    def interval(self, entry_id: str) -> timedelta | None:
+        member = self._members.get(entry_id)
+        return timedelta(seconds=member.interval) if member is not None else None
+
+    def refreshed(self, entry_id: str) -> None:
+        """Record a finished refresh of an entry, whatever triggered it."""
+        member = self._members.get(entry_id)
+        if member is not None:
+            member.last_refresh = self._clock()
+
+    # -- scheduling ---------------------------------------------------------
+
+    def next_due(self, entry_id: str) -> float | None:
+        """Next poll time: on the entry's phase grid, at least half an interval after its last refresh."""
+        member = self._members.get(entry_id)
+        if member is None or member.interval <= 0:
+            return None
+        base = self._epoch + member.phase * member.interval
+        earliest = (member.last_refresh if member.last_refresh is not None else self._clock()) + member.interval / 2
+        return base + max(math.ceil((earliest - base) / member.interval), 0) * member.interval
+
+    def due_entries(self) -> list[str]:
+        """Entries due now, those with charging or moving cars first."""
+        now = self._clock()
+        due = [
+            entry_id
+            for entry_id, member in self._members.items()
+            if not member.refreshing and (self.next_due(entry_id) or math.inf) <= now
+        ]
+        return sorted(due, key=lambda e: not self._members[e].active())
+
+    async def async_tick(self, now=None) -> list[str]:
+        """Refresh every due entry; returns the refreshed entry ids."""
+        due = self.due_entries()
+        await asyncio.gather(*(self._async_refresh(entry_id) for entry_id in due))
+        return due
+
+    async def _async_refresh(self, entry_id: str) -> None:
+        member = self._members[entry_id]
+        member.refreshing = True
+        priority = PRIORITY_ACTIVE if member.active() else PRIORITY_NORMAL
+        try:
+            with request_priority(priority):
+                await member.coordinator.async_refresh()
+        except Exception as err:  # pragma: no cover - the coordinator logs its own failures
+            _LOGGER.debug("Scheduled refresh of %s failed: %s", entry_id, err)
+        finally:
+            member.refreshing = False
+            member.last_refresh = self._clock()
+            self.refreshes += 1
+
+    def async_start(self) -> bool:
+        """Start the ticker; returns whether the scheduler now owns the refreshes."""
+        if self._unsub is not None:
+            return True
+        try:
+            from homeassistant.helpers.event import async_track_time_interval
+        except Exception:  # pragma: no cover - helper not available in test stubs
+            _LOGGER.debug("Time tracking helper unavailable; coordinators schedule themselves")
+            return False
+        self._unsub = async_track_time_interval(self.hass, self.async_tick, timedelta(seconds=TICK_SEC))
+        return True
+
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
+
+    def stats(self) -> dict:
+        return {
+            "entries": {
+                entry_id: {
+                    "interval_sec": member.interval,
+                    "phase": round(member.phase, 3),
+                    "active_cars": member.active(),
+                }
+                for entry_id, member in self._members.items()
+            },
+            "max_requests_per_minute": self.budget.per_minute,
+            "requests_waited": self.budget.waited,
+            "requests_queued": self.budget.queued,
+            "scheduled_refreshes": self.refreshes,
+        }
@@ -0,0 +1,103 @@
+"""Location-only refresh path backed by `/api/probe/location/{vin}/`.
+
+Probing asks for nothing but the GPS position of one car, so it is much cheaper than a
+full coordinator refresh. Results go straight to that car's tracker; while a car is
+running the prober can also poll it on a faster schedule than the coordinator.
+"""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Seconds between location probes for cars with ev_info.car_running (0 disables)
+DEFAULT_PROBE_INTERVAL_RUNNING_SEC = 60
+# Car fields read by the prober (see fields.py)
+CAR_FIELDS = ("ev_info.car_running",)
+
+
+def extract_location(payload) -> dict | None:
+    """Return a LocationInfo-like dict (with lat/lon) from a probe response."""
+    if not isinstance(payload, dict):
+        return None
+    for candidate in (payload.get("location"), payload.get("last_location"), payload):
+        if isinstance(candidate, dict) and (
+            candidate.get("lat") is not None or candidate.get("latitude") is not None
+        ):
+            return candidate
+    return None
+
+
+class LocationProber:
+    """Probe car locations on demand (service/button) or periodically while running."""
+
+    def __init__(self, hass, client, coordinator=None, trips=None) -> None:
+        self.hass = hass
+        self._client = client
+        self._coordinator = coordinator
+        self._trips = trips
+        self._trackers: dict[str, object] = {}
+        self._unsub = None
+
+    def register_tracker(self, vin: str, tracker) -> None:
+        self._trackers[vin] = tracker
+
+    def _cars(self) -> list:
+        return getattr(self._coordinator, "data", None) or []
+
+    def running_vins(self) -> list[str]:
+        return [
+            str(c["vin"])
+            for c in self._cars()
+            if isinstance(c, dict) and c.get("vin") and (c.get("ev_info") or {}).get("car_running")
+        ]
+
+    async def async_probe(self, vin: str) -> dict | None:
+        """Probe a single car and push the new location to its tracker only."""
+        loc = extract_location(await self._client.async_probe_location(vin))
+        if loc is None:
+            _LOGGER.debug("Location probe for %s returned no coordinates", vin)
+            return None
+        tracker = self._trackers.get(vin)
+        if tracker is not None:
+            tracker.async_update_location(loc)
+        if self._trips is not None:
+            running = next(
+                (
+                    (c.get("ev_info") or {}).get("car_running")
+                    for c in self._cars()
+                    if isinstance(c, dict) and str(c.get("vin")) == vin
+                ),
+                None,
+            )
+            self._trips.add_location(vin, loc, running)
+        return loc
+
+    async def _async_probe_running(self, now=None) -> None:
+        vins = self.running_vins()
+        if not vins:
+            return
+        results = await asyncio.gather(*(self.async_probe(v) for v in vins), return_exceptions=True)
+        for vin, res in zip(vins, results):
+            if isinstance(res, Exception):
+                _LOGGER.debug("Scheduled location probe failed for %s: %s", vin, res)
+
+    def async_start(self, interval_sec: int = DEFAULT_PROBE_INTERVAL_RUNNING_SEC) -> None:
+        """Start probing running cars every `interval_sec` seconds."""
+        if not interval_sec or self._unsub is not None:
+            return
+        try:
+            from homeassistant.helpers.event import async_track_time_interval
+        except Exception:  # pragma: no cover - helper not available in test stubs
+            _LOGGER.debug("Time tracking helper unavailable; running-car probes disabled")
+            return
+        self._unsub = async_track_time_interval(
+            self.hass, self._async_probe_running, timedelta(seconds=interval_sec)
+        )
+
+    def async_stop(self) -> None:
+        if self._unsub is not None:
+            self._unsub()
+            self._unsub = None
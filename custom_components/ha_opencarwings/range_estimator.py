@@ -0,0 +1,101 @@
+"""Per-car range prediction learned from consecutive (odometer, SoC) samples.
+
+Whenever the car has driven and lost charge since the last anchor sample, the observed
+km-per-percent is folded into an exponentially weighted average, so each new sample
+costs O(1). The predicted range is the current SoC times that average, which is far
+steadier than the car's own `range_acon`/`range_acoff` estimate.
+"""
+from __future__ import annotations
+
+from .store import async_load
+
+# Weight of a new km-per-percent observation in the running average
+DEFAULT_ALPHA = 0.2
+# Only learn from drives that used at least this much SoC (%), to limit rounding noise
+MIN_SOC_DROP = 2.0
+# Plausible bounds for km per percent of SoC (rejects odometer/SoC glitches)
+MIN_KM_PER_PCT = 0.3
+MAX_KM_PER_PCT = 10.0
+SAVE_DELAY = 300
+# Car fields read by the estimator (see fields.py)
+CAR_FIELDS = ("odometer", "ev_info.soc")
+
+
+def _as_float(value) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class RangeEstimator:
+    """Exponentially weighted km-per-percent estimate per VIN."""
+
+    def __init__(self, store=None, alpha: float = DEFAULT_ALPHA) -> None:
+        self._store = store
+        self._alpha = alpha
+        # vin -> {"km_per_pct": float | None, "samples": int, "anchor": [odometer, soc] | None}
+        self._state: dict[str, dict] = {}
+
+    async def async_load(self) -> None:
+        data = await async_load(self._store)
+        self._state = {vin: dict(v) for vin, v in data.items() if isinstance(v, dict)}
+
+    def _data_to_save(self) -> dict:
+        return self._state
+
+    def km_per_pct(self, vin: str) -> float | None:
+        return (self._state.get(vin) or {}).get("km_per_pct")
+
+    def samples(self, vin: str) -> int:
+        return (self._state.get(vin) or {}).get("samples", 0)
+
+    def predict(self, vin: str, soc) -> float | None:
+        k = self.km_per_pct(vin)
+        soc = _as_float(soc)
+        if k is None or soc is None:
+            return None
+        return soc * k
+
+    def add_sample(self, vin: str, odometer, soc) -> bool:
+        """Fold one (odometer, soc) sample in; returns True when the estimate changed."""
+        odo = _as_float(odometer)
+        soc = _as_float(soc)
+        if odo is None or soc is None:
+            return False
+        state = self._state.setdefault(vin, {"km_per_pct": None, "samples": 0, "anchor": None})
+        anchor = state.get("anchor")
+        if anchor is None:
+            state["anchor"] = [odo, soc]
+            return False
+
+        distance = odo - anchor[0]
+        used = anchor[1] - soc
+        if soc > anchor[1] or distance < 0:
+            # Charged (or odometer went backwards): start a new drive segment
+            state["anchor"] = [odo, soc]
+            return False
+        if used < MIN_SOC_DROP:
+            # Not enough consumption yet; keep accumulating from the same anchor
+            return False
+
+        state["anchor"] = [odo, soc]
+        observed = distance / used
+        if not MIN_KM_PER_PCT <= observed <= MAX_KM_PER_PCT:
+            return False
+        k = state.get("km_per_pct")
+        state["km_per_pct"] = observed if k is None else k + self._alpha * (observed - k)
+        state["samples"] = state.get("samples", 0) + 1
+        return True
+
+    def update(self, cars: list) -> None:
+        """Feed one coordinator snapshot (list of car dicts)."""
+        changed = False
+        for car in cars or []:
+            if isinstance(car, dict) and car.get("vin"):
+                ev = car.get("ev_info") or {}
+                changed |= self.add_sample(str(car["vin"]), car.get("odometer"), ev.get("soc"))
+        if changed and self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
@@ -8,7 +8,8 @@ import logging
 
 from homeassistant.components.sensor import SensorEntity
 from homeassistant.const import ATTR_ATTRIBUTION, PERCENTAGE
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import BaseCoordinatorEntity, CoordinatorEntity
 
 try:
     from homeassistant.helpers.entity import EntityCategory
@@ -21,8 +22,22 @@ try:
 except Exception:  # pragma: no cover
     class SensorDeviceClass:  # type: ignore
         BATTERY = "battery"
+        DISTANCE = "distance"
+        DURATION = "duration"
+        ENERGY = "energy"
+        ENERGY_STORAGE = "energy_storage"
+        POWER = "power"
+
+try:
+    from homeassistant.components.sensor import SensorStateClass
+except Exception:  # pragma: no cover
+    class SensorStateClass:  # type: ignore
+        MEASUREMENT = "measurement"
+        TOTAL = "total"
+        TOTAL_INCREASING = "total_increasing"
 
 from . import DOMAIN
+from .util import format_dt as _format_dt, parse_ts as _parse_ts
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,33 +46,6 @@ _LOGGER = logging.getLogger(__name__)
 # Helpers
 # -----------------------------
 
-def _parse_ts(value: str | None):
-    if not value:
-        return None
-    try:
-        # support ISO8601 like `2026-01-04T12:00:00Z` or with microseconds `...10.419903Z`
-        if value.endswith("Z"):
-            try:
-                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
-            except ValueError:
-                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
-        return datetime.fromisoformat(value)
-    except Exception:
-        return None
-
-
-def _format_dt(dt: datetime | None) -> str | None:
-    if not dt:
-        return None
-    try:
-        ts = dt.isoformat()
-        if ts.endswith("+00:00"):
-            ts = ts.replace("+00:00", "Z")
-        return ts
-    except Exception:
-        return None
-
-
 def _ev_getter(key: str, fallback: str | None = None) -> Callable[[dict], Any]:
     """Get value from car['ev_info'][key], falling back to car[fallback] or car[key]."""
     def _get(car: dict):
@@ -67,6 +55,15 @@ def _ev_getter(key: str, fallback: str | None = None) -> Callable[[dict], Any]:
         if fallback:
             return car.get(fallback)
         return car.get(key)
+    _get.fields = (f"ev_info.{key}", fallback or key)
+    return _get
+
+
+def _car_getter(key: str) -> Callable[[dict], Any]:
+    """Get a top-level car[key] value."""
+    def _get(car: dict):
+        return car.get(key)
+    _get.fields = (key,)
     return _get
 
 def _to_float(v: Any) -> float | None:
@@ -97,15 +94,38 @@ class OpenCarwingsCarEntity(CoordinatorEntity):
 
     - merges seed car dict (from initial cars list) with coordinator car dict
       so fields like odometer don't disappear if coordinator payload is missing them
+    - when the entry has a dispatcher (see dispatcher.py), updates arrive through it
+      instead of a listener per entity, and the car dict comes from its VIN index
+    - while refreshes fail the coordinator serves the last good car data (see
+      staleness.py); past the maximum staleness the entity becomes unavailable
     """
 
+    _dispatcher = None
+
     def __init__(self, coordinator, entry_id: str, vin: str, seed_car: dict | None = None) -> None:
         super().__init__(coordinator)
         self._entry_id = entry_id
         self._vin = vin
         self._seed_car = seed_car or {}
 
+    async def async_added_to_hass(self) -> None:
+        if self._dispatcher is None:
+            await super().async_added_to_hass()
+            return
+        # Skip BaseCoordinatorEntity, which would add this entity's own listener
+        # (and a second state write per update); the entry dispatcher fans updates out
+        await super(BaseCoordinatorEntity, self).async_added_to_hass()
+        self.async_on_remove(self._dispatcher.async_register(self._vin, self))
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        # Updates arrive through the dispatcher's batched write when there is one
+        if self._dispatcher is None:
+            super()._handle_coordinator_update()
+
     def _get_car(self) -> dict:
+        if self._dispatcher is not None:
+            return self._dispatcher.car(self._vin, self._seed_car)
         # Merge: seed -> coordinator (coordinator wins, seed fills missing fields)
         if self.coordinator and getattr(self.coordinator, "data", None):
             for c in self.coordinator.data:
@@ -113,6 +133,16 @@ class OpenCarwingsCarEntity(CoordinatorEntity):
                     return {**self._seed_car, **(c or {})}
         return self._seed_car or {}
 
+    def _stale_cache(self):
+        return getattr(self.coordinator, "stale_cache", None)
+
+    @property
+    def available(self) -> bool:
+        stale = self._stale_cache()
+        if stale is not None and stale.expired(self._vin):
+            return False
+        return getattr(super(), "available", True)
+
     @property
     def device_info(self) -> dict[str, Any]:
         car = self._get_car()
@@ -133,6 +163,12 @@ class CarSensorSpec:
     transform: Optional[Callable[[Any], Any]] = None
     device_class: Optional[str] = None
     unit_of_measurement: Optional[str] = None
+    state_class: Optional[str] = None
+
+    @property
+    def fields(self) -> tuple[str, ...]:
+        """Car fields read by the value getter (see fields.py)."""
+        return getattr(self.value, "fields", ())
 
 
 def _to_int(v: Any) -> int | None:
@@ -155,6 +191,7 @@ CAR_SENSORS: list[CarSensorSpec] = [
         _ev_getter("range_acon"),
         transform=_to_float,
         unit_of_measurement="km",
+        state_class=SensorStateClass.MEASUREMENT,
     ),
     CarSensorSpec(
         "range_acoff",
@@ -162,10 +199,11 @@ CAR_SENSORS: list[CarSensorSpec] = [
         _ev_getter("range_acoff"),
         transform=_to_float,
         unit_of_measurement="km",
+        state_class=SensorStateClass.MEASUREMENT,
     ),
-    CarSensorSpec("soc", "State of Charge", _ev_getter("soc"), transform=_round_1, device_class=SensorDeviceClass.BATTERY, unit_of_measurement=PERCENTAGE),
-    CarSensorSpec("soc_display", "State of Charge Display", _ev_getter("soc_display"), transform=_round_1, device_class=SensorDeviceClass.BATTERY, unit_of_measurement=PERCENTAGE),
-    CarSensorSpec("charge_bars", "Charge Bars", _ev_getter("charge_bars")),
+    CarSensorSpec("soc", "State of Charge", _ev_getter("soc"), transform=_round_1, device_class=SensorDeviceClass.BATTERY, unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT),
+    CarSensorSpec("soc_display", "State of Charge Display", _ev_getter("soc_display"), transform=_round_1, device_class=SensorDeviceClass.BATTERY, unit_of_measurement=PERCENTAGE, state_class=SensorStateClass.MEASUREMENT),
+    CarSensorSpec("charge_bars", "Charge Bars", _ev_getter("charge_bars"), state_class=SensorStateClass.MEASUREMENT),
     CarSensorSpec("plugged_in", "Charge Cable", _ev_getter("plugged_in"), transform=_plugged_to_str),
     CarSensorSpec("charging", "Charging", _ev_getter("charging")),
     CarSensorSpec("charge_finish", "Charge Finish", _ev_getter("charge_finish")),
@@ -173,12 +211,58 @@ CAR_SENSORS: list[CarSensorSpec] = [
     CarSensorSpec("ac_status", "AC Status", _ev_getter("ac_status")),
     CarSensorSpec("eco_mode", "Eco Mode", _ev_getter("eco_mode")),
     CarSensorSpec("car_running", "Running", _ev_getter("car_running")),
-    CarSensorSpec("odometer", "Odometer", lambda car: car.get("odometer"), transform=_to_int, unit_of_measurement="km",),
+    CarSensorSpec("odometer", "Odometer", _car_getter("odometer"), transform=_to_int, unit_of_measurement="km", state_class=SensorStateClass.TOTAL_INCREASING),
     CarSensorSpec("full_chg_time", "Full Charge Time", _ev_getter("full_chg_time")),
     CarSensorSpec("limit_chg_time", "Limit Charge Time", _ev_getter("limit_chg_time")),
     CarSensorSpec("obc_6kw", "OBC 6kW", _ev_getter("obc_6kw")),
 ]
 
+# Car fields read by the sensors: the value specs plus status/diagnostic sensors
+CAR_FIELDS = tuple(sorted(
+    {field for spec in CAR_SENSORS for field in spec.fields}
+    | {
+        "ev_info.charging",
+        "ev_info.car_running",
+        "ev_info.ac_status",
+        "ev_info.soc",
+        "ev_info.range_acoff",
+        "ev_info.last_updated",
+        "location.last_updated",
+        "last_connection",
+        "signal_level",
+    }
+))
+
+
+class CarPredictedRangeSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Range predicted from current SoC and the learned km-per-percent of this car."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_device_class = SensorDeviceClass.DISTANCE
+    _attr_native_unit_of_measurement = "km"
+
+    def __init__(self, coordinator, entry_id: str, vin: str, estimator, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._estimator = estimator
+        self._attr_unique_id = f"ha_opencarwings_predicted_range_{vin}"
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} Predicted Range"
+
+    @property
+    def native_value(self) -> float | None:
+        return _round_1(self._estimator.predict(self._vin, _ev_getter("soc")(self._get_car())))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return {
+            "km_per_percent": _round_1(self._estimator.km_per_pct(self._vin)),
+            "samples": self._estimator.samples(self._vin),
+        }
+
 
 class CarValueSensor(OpenCarwingsCarEntity, SensorEntity):
     """Generic per-car sensor based on CarSensorSpec."""
@@ -191,6 +275,8 @@ class CarValueSensor(OpenCarwingsCarEntity, SensorEntity):
             self._attr_device_class = spec.device_class
         if spec.unit_of_measurement:
             self._attr_native_unit_of_measurement = spec.unit_of_measurement
+        if spec.state_class:
+            self._attr_state_class = spec.state_class
 
     @property
     def name(self) -> str:
@@ -242,12 +328,14 @@ class CarStatusSensor(OpenCarwingsCarEntity, SensorEntity):
         # Keep this SMALL and SAFE (optional). Remove entirely if you want no attributes.
         car = self._get_car()
         ev = car.get("ev_info", {}) or {}
+        stale = self._stale_cache()
         return {
             ATTR_ATTRIBUTION: "Data provided by OpenCARWINGS",
             "last_connection": car.get("last_connection"),
             "signal_level": car.get("signal_level"),
             "soc": ev.get("soc"),
             "range_acoff": ev.get("range_acoff"),
+            "data_age": stale.attributes(self._vin)["data_age"] if stale is not None else None,
         }
 
 
@@ -323,6 +411,293 @@ class CarLastRequestedSensor(OpenCarwingsCarEntity, SensorEntity):
         dt = getattr(coord, "last_update_time", None) if coord else None
         return _format_dt(dt) or "unknown"
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        # Age of the served data and the refresh failures since the last good one
+        stale = self._stale_cache()
+        return stale.attributes(self._vin) if stale is not None else {}
+
+
+class CarDetailFailuresSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Diagnostic: consecutive failed detail fetches for the car (see details.py)."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry_id: str, vin: str, details, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._details = details
+        self._attr_unique_id = f"ha_opencarwings_detail_failures_{vin}"
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} Detail Failures"
+
+    @property
+    def native_value(self) -> int:
+        return self._details.streak(self._vin)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self._details.attributes(self._vin)
+
+
+class CarLastCommandSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Status of the last command sent to the car (see commands.py)."""
+
+    def __init__(self, coordinator, entry_id: str, vin: str, commands, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._commands = commands
+        self._attr_unique_id = f"ha_opencarwings_last_command_{vin}"
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} Last Command"
+
+    @property
+    def native_value(self) -> str | None:
+        status = self._commands.status(self._vin)
+        if status.get("pending"):
+            return "pending"
+        return status.get("result_display")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        return self._commands.status(self._vin)
+
+
+class CarCommandLatencySensor(OpenCarwingsCarEntity, SensorEntity):
+    """Diagnostic: command round-trip latency percentile over the recent commands."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_native_unit_of_measurement = "s"
+
+    # key -> (name, percentile)
+    _KINDS = {
+        "p50": ("Command Latency p50", 50),
+        "p95": ("Command Latency p95", 95),
+    }
+
+    def __init__(self, coordinator, entry_id: str, vin: str, commands, key: str, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._commands = commands
+        self._label, self._pct = self._KINDS[key]
+        self._attr_unique_id = f"ha_opencarwings_command_latency_{key}_{vin}"
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} {self._label}"
+
+    @property
+    def native_value(self) -> float | None:
+        return _round_1(self._commands.latency(self._vin, self._pct))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        status = self._commands.status(self._vin)
+        return {
+            "last_latency": _round_1(status.get("last_latency")),
+            "samples": status.get("latency_samples", 0),
+        }
+
+
+class CarLastAlertSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Most recent alert for the car, fed by the alerts coordinator."""
+
+    def __init__(self, coordinator, entry_id: str, vin: str, feed, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._feed = feed
+        self._attr_unique_id = f"ha_opencarwings_last_alert_{vin}"
+
+    def _get_car(self) -> dict:
+        # The alerts coordinator carries alerts, not car dicts
+        return self._seed_car or {}
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} Last Alert"
+
+    @property
+    def native_value(self) -> str | None:
+        alert = self._feed.latest(self._vin)
+        if not alert:
+            return None
+        return alert.get("type_display") or alert.get("type")
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        alert = self._feed.latest(self._vin) or {}
+        return {
+            ATTR_ATTRIBUTION: "Data provided by OpenCARWINGS",
+            "alert_id": alert.get("id"),
+            "alert_type": alert.get("type"),
+            "timestamp": alert.get("timestamp"),
+            "additional_data": alert.get("additional_data"),
+            "recent_alerts": self._feed.recent(self._vin),
+        }
+
+
+class CarTripSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Current trip (or the last finished one) computed incrementally by the TripTracker."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator, entry_id: str, vin: str, trips, key: str, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._trips = trips
+        self._key = key
+        self._attr_unique_id = f"ha_opencarwings_trip_{key}_{vin}"
+        if key == "distance":
+            self._attr_device_class = SensorDeviceClass.DISTANCE
+            self._attr_native_unit_of_measurement = "km"
+        else:
+            self._attr_device_class = SensorDeviceClass.DURATION
+            self._attr_native_unit_of_measurement = "min"
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} Trip {self._key.capitalize()}"
+
+    @property
+    def native_value(self) -> float | None:
+        trip = self._trips.trip(self._vin)
+        if not trip:
+            return None
+        if self._key == "distance":
+            return round(trip["distance_km"], 2)
+        return round(trip["duration_sec"] / 60, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        trip = self._trips.trip(self._vin) or {}
+        history = self._trips.history(self._vin)
+
+        def _ts(value):
+            return _format_dt(datetime.fromtimestamp(value, timezone.utc)) if value else None
+
+        return {
+            "trip_active": self._trips.is_active(self._vin),
+            "trip_start": _ts(trip.get("start")),
+            "trip_end": _ts(trip.get("end")),
+            "location_samples": len(history) if history is not None else 0,
+        }
+
+
+class CarChargingSessionSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Charging-session aggregate (energy, average power, duration or total energy)."""
+
+    # key -> (name, device class, state class, unit)
+    _KINDS = {
+        "energy": ("Charge Session Energy", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "kWh"),
+        "average_power": ("Charge Session Average Power", SensorDeviceClass.POWER, SensorStateClass.MEASUREMENT, "kW"),
+        "duration": ("Charge Session Duration", SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, "min"),
+        "total_energy": ("Charged Energy Total", SensorDeviceClass.ENERGY, SensorStateClass.TOTAL_INCREASING, "kWh"),
+    }
+
+    def __init__(self, coordinator, entry_id: str, vin: str, sessions, key: str, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._sessions = sessions
+        self._key = key
+        label, device_class, state_class, unit = self._KINDS[key]
+        self._label = label
+        self._attr_unique_id = f"ha_opencarwings_charge_{key}_{vin}"
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} {self._label}"
+
+    @property
+    def native_value(self) -> float | None:
+        if self._key == "total_energy":
+            return round(self._sessions.total_energy_wh(self._vin) / 1000, 3)
+        session = self._sessions.session(self._vin)
+        if not session:
+            return None
+        if self._key == "energy":
+            return round(session["energy_wh"] / 1000, 3)
+        if self._key == "average_power":
+            avg = session["average_kw"]
+            return round(avg, 2) if avg is not None else None
+        return round(session["duration_sec"] / 60, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        session = self._sessions.session(self._vin) or {}
+
+        def _ts(value):
+            return _format_dt(datetime.fromtimestamp(value, timezone.utc)) if value else None
+
+        return {
+            "session_active": self._sessions.is_active(self._vin),
+            "session_start": _ts(session.get("start")),
+            "session_end": _ts(session.get("end")),
+            "soc_start": session.get("soc_start"),
+            "soc_end": session.get("soc_end"),
+            "quick_charge": session.get("quick_charge"),
+        }
+
+
+class CarBatteryHealthSensor(OpenCarwingsCarEntity, SensorEntity):
+    """Battery state of health, usable capacity or projected capacity (one year ahead)."""
+
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    # key -> (name, health field, device class, unit)
+    _KINDS = {
+        "soh": ("Battery State of Health", "soh", None, PERCENTAGE),
+        "usable_capacity": ("Battery Usable Capacity", "usable_kwh", SensorDeviceClass.ENERGY_STORAGE, "kWh"),
+        "projected_capacity": ("Battery Projected Capacity", "projected_kwh", SensorDeviceClass.ENERGY_STORAGE, "kWh"),
+    }
+
+    def __init__(self, coordinator, entry_id: str, vin: str, battery, key: str, seed_car: dict | None = None) -> None:
+        super().__init__(coordinator, entry_id, vin, seed_car)
+        self._battery = battery
+        self._key = key
+        label, field, device_class, unit = self._KINDS[key]
+        self._label = label
+        self._field = field
+        self._attr_unique_id = f"ha_opencarwings_battery_{key}_{vin}"
+        if device_class:
+            self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+
+    @property
+    def name(self) -> str:
+        car = self._get_car()
+        prefix = car.get("nickname") or car.get("model_name") or "Car"
+        return f"{prefix} {self._label}"
+
+    @property
+    def native_value(self) -> float | None:
+        return _round_1(self._battery.health(self._vin).get(self._field))
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        health = self._battery.health(self._vin)
+        return {
+            "cap_bars": health.get("cap_bars"),
+            "soh_trend_per_year": _round_1(health.get("soh_trend_per_year")),
+            "capacity_trend_kwh_per_year": _round_1(health.get("capacity_trend_kwh_per_year")),
+            "samples": health.get("samples", 0),
+        }
+
 
 # -----------------------------
 # Car list sensor
@@ -381,6 +756,11 @@ async def async_setup_entry(hass, entry, async_add_entities):
         for spec in CAR_SENSORS:
             entities.append(CarValueSensor(coordinator, entry.entry_id, vin, spec, seed_car=car))
 
+        # Predicted range (alongside the car's own range estimates)
+        estimator = data.get("range")
+        if estimator is not None:
+            entities.append(CarPredictedRangeSensor(coordinator, entry.entry_id, vin, estimator, seed_car=car))
+
         # Status
         entities.append(CarStatusSensor(coordinator, entry.entry_id, vin, seed_car=car))
 
@@ -388,5 +768,46 @@ async def async_setup_entry(hass, entry, async_add_entities):
         entities.append(CarLastUpdatedSensor(coordinator, entry.entry_id, vin, seed_car=car))
         entities.append(CarLastRequestedSensor(coordinator, entry.entry_id, vin, seed_car=car))
         entities.append(CarVINSensor(coordinator, entry.entry_id, vin, seed_car=car))
+        details = data.get("details")
+        if details is not None:
+            entities.append(CarDetailFailuresSensor(coordinator, entry.entry_id, vin, details, seed_car=car))
+
+        # Command status and round-trip latency
+        commands = data.get("commands")
+        if commands is not None:
+            entities.append(CarLastCommandSensor(coordinator, entry.entry_id, vin, commands, seed_car=car))
+            for key in CarCommandLatencySensor._KINDS:
+                entities.append(CarCommandLatencySensor(coordinator, entry.entry_id, vin, commands, key, seed_car=car))
+
+        # Trips (only when location history is tracked for this entry)
+        trips = data.get("trips")
+        if trips is not None:
+            entities.append(CarTripSensor(coordinator, entry.entry_id, vin, trips, "distance", seed_car=car))
+            entities.append(CarTripSensor(coordinator, entry.entry_id, vin, trips, "duration", seed_car=car))
+
+        # Charging sessions
+        sessions = data.get("charging")
+        if sessions is not None:
+            for key in CarChargingSessionSensor._KINDS:
+                entities.append(CarChargingSessionSensor(coordinator, entry.entry_id, vin, sessions, key, seed_car=car))
+
+        # Battery health trends
+        battery = data.get("battery")
+        if battery is not None:
+            for key in CarBatteryHealthSensor._KINDS:
+                entities.append(CarBatteryHealthSensor(coordinator, entry.entry_id, vin, battery, key, seed_car=car))
+
+        # Alerts (only when the alerts subsystem is running for this entry)
+        alert_feed = data.get("alerts")
+        alerts_coordinator = data.get("alerts_coordinator")
+        if alert_feed is not None and alerts_coordinator is not None:
+            entities.append(CarLastAlertSensor(alerts_coordinator, entry.entry_id, vin, alert_feed, seed_car=car))
+
+    # Route main-coordinator updates through the entry's single listener
+    dispatcher = data.get("dispatcher")
+    if dispatcher is not None:
+        for entity in entities:
+            if isinstance(entity, OpenCarwingsCarEntity) and entity.coordinator is dispatcher.coordinator:
+                entity._dispatcher = dispatcher
 
     async_add_entities(entities)
@@ -0,0 +1,240 @@
+"""Domain services for the OpenCARWINGS integration."""
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+
+import voluptuous as vol
+
+from . import DOMAIN
+from .commands import COMMAND_TYPES, async_send_command, resolve_command_type
+from .timers import TIMER_FIELDS
+
+_LOGGER = logging.getLogger(__name__)
+
+_BOOLEAN = vol.Boolean()
+# Writable CommandTimerSetting fields (openapi.json); the id is coerced so a string
+# from YAML or the UI matches the cached integer id instead of creating a new timer
+SET_TIMER_SCHEMA = vol.Schema(
+    {
+        vol.Required("vin"): vol.All(vol.Coerce(str), vol.Strip, vol.Length(min=1)),
+        vol.Optional("entry_id"): str,
+        vol.Optional("id"): vol.Coerce(int),
+        vol.Optional("name"): vol.All(str, vol.Length(min=1, max=32)),
+        vol.Optional("enabled"): _BOOLEAN,
+        vol.Optional("timer_type"): vol.All(vol.Coerce(int), vol.In((0, 1))),
+        vol.Optional("command_type"): vol.All(vol.Coerce(int), vol.Range(min=0, max=5)),
+        vol.Optional("time"): vol.All(str, vol.Match(r"^\d{1,2}:\d{2}(:\d{2})?$")),
+        vol.Optional("date"): vol.Any(None, vol.All(str, vol.Match(r"^\d{4}-\d{2}-\d{2}$"))),
+        **{vol.Optional(f"weekday_{day}"): _BOOLEAN for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+    }
+)
+
+
+def _vin_list(value) -> list[str]:
+    """One VIN, a comma separated string of VINs or a list of VINs."""
+    if isinstance(value, str):
+        value = value.split(",")
+    vins = [str(v).strip() for v in vol.Schema([vol.Any(str, int)])(value)]
+    vins = list(dict.fromkeys(v for v in vins if v))
+    if not vins:
+        raise vol.Invalid("at least one VIN is required")
+    return vins
+
+
+def _command_type(value) -> int:
+    try:
+        return resolve_command_type(value)
+    except ValueError as err:
+        raise vol.Invalid(f"{err}; use one of {', '.join(COMMAND_TYPES.values())}") from err
+
+
+SEND_COMMAND_SCHEMA = vol.Schema(
+    {
+        vol.Required("vin"): _vin_list,
+        vol.Required("command_type"): _command_type,
+        vol.Optional("entry_id"): str,
+    }
+)
+
+
+def _entry_datas(hass) -> list[dict]:
+    """Per-entry data dicts (skipping non-dict sentinel values stored in hass.data, like flags)."""
+    return [d for d in hass.data.get(DOMAIN, {}).values() if isinstance(d, dict)]
+
+
+def _owns_vin(data: dict, vin: str) -> bool:
+    coord = data.get("coordinator")
+    cars = (getattr(coord, "data", None) if coord else None) or data.get("cars") or []
+    return any(isinstance(c, dict) and str(c.get("vin")) == vin for c in cars)
+
+
+def _entry_data_for_vin(hass, vin: str, entry_id: str | None = None) -> dict | None:
+    """Find the entry data that owns a VIN (optionally restricted to one entry)."""
+    if entry_id:
+        data = hass.data.get(DOMAIN, {}).get(entry_id)
+        return data if isinstance(data, dict) and _owns_vin(data, vin) else None
+    for data in _entry_datas(hass):
+        if _owns_vin(data, vin):
+            return data
+    return None
+
+
+def _register(hass, name: str, handler, **kwargs) -> None:
+    """Register a domain service once per hass instance."""
+    flag = f"_service_{name}_registered"
+    if hass.data[DOMAIN].get(flag):
+        return
+    try:
+        hass.services.async_register(DOMAIN, name, handler, **kwargs)
+        hass.data[DOMAIN][flag] = True
+    except Exception:
+        # If hass.services isn't available in tests/stubs, ignore
+        _LOGGER.debug("Could not register %s service (services not available in hass stub)", name)
+
+
+def async_setup_services(hass) -> None:
+    """Register the integration's services."""
+
+    async def _handle_refresh(call):
+        """Handle service call to refresh OpenCARWINGS data."""
+        entry_id = (call.data or {}).get("entry_id") if call else None
+        if entry_id:
+            data = hass.data.get(DOMAIN, {}).get(entry_id)
+            if not data:
+                _LOGGER.warning("Refresh requested for unknown entry %s", entry_id)
+                return
+            coord = data.get("coordinator")
+            if coord:
+                await coord.async_request_refresh()
+        else:
+            # refresh all coordinators
+            for d in _entry_datas(hass):
+                coord = d.get("coordinator")
+                if coord:
+                    await coord.async_request_refresh()
+
+    async def _handle_set_timer(call):
+        """Create or update a server-side command timer for a car."""
+        data = dict(call.data or {})
+        vin = str(data.get("vin") or "")
+        entry_data = _entry_data_for_vin(hass, vin, data.get("entry_id"))
+        if not vin or not entry_data or not entry_data.get("timers"):
+            _LOGGER.warning("Timer update requested for unknown car %s", vin)
+            return
+
+        timer = {k: v for k, v in data.items() if k in TIMER_FIELDS or k == "id"}
+        await entry_data["timers"].async_set_timer(vin, timer)
+
+        # Let timer entities pick up the new cached state without a refresh (and the
+        # switch platform add an entity for a new timer)
+        coord = entry_data.get("coordinator")
+        if coord and hasattr(coord, "async_update_listeners"):
+            coord.async_update_listeners()
+
+    async def _handle_probe_location(call):
+        """Refresh only the GPS location of a single car."""
+        data = dict(call.data or {})
+        vin = str(data.get("vin") or "")
+        entry_data = _entry_data_for_vin(hass, vin, data.get("entry_id"))
+        if not vin or not entry_data or not entry_data.get("location_prober"):
+            _LOGGER.warning("Location probe requested for unknown car %s", vin)
+            return
+        await entry_data["location_prober"].async_probe(vin)
+
+    async def _handle_import_statistics(call):
+        """Re-import all locally cached hourly statistics into the recorder."""
+        entry_id = (call.data or {}).get("entry_id") if call else None
+        for entry_data in _entry_datas(hass):
+            if entry_id and hass.data[DOMAIN].get(entry_id) is not entry_data:
+                continue
+            statistics = entry_data.get("statistics")
+            if statistics is not None:
+                statistics.async_flush(full=True)
+
+    async def _handle_export_trace(call):
+        """Write the buffered refresh traces as Chrome trace-event JSON.
+
+        One file per entry in the config directory; the traces are also returned
+        as the service response.
+        """
+        entry_id = (call.data or {}).get("entry_id") if call else None
+        response = {}
+        for key, entry_data in hass.data.get(DOMAIN, {}).items():
+            if not isinstance(entry_data, dict) or (entry_id and key != entry_id):
+                continue
+            tracer = entry_data.get("tracer")
+            if tracer is None:
+                continue
+            trace = tracer.export()
+            response[key] = trace
+            config = getattr(hass, "config", None)
+            if config is None or not hasattr(hass, "async_add_executor_job"):
+                continue
+            path = config.path(f"{DOMAIN}_trace_{key}.json")
+            await hass.async_add_executor_job(_write_json, path, trace)
+            _LOGGER.info("Wrote %d OpenCARWINGS refresh traces to %s", len(tracer), path)
+        return response
+
+    async def _handle_send_command(call):
+        """Send one command to many cars at once, then refresh each entry once.
+
+        The commands go out concurrently; the client's concurrency limit and the
+        fleet request budget pace them. Returns the outcome per VIN.
+        """
+        data = call.data
+        command_type = data["command_type"]
+        targets = []
+        response = {}
+        for vin in data["vin"]:
+            entry_data = _entry_data_for_vin(hass, vin, data.get("entry_id"))
+            if entry_data is None or entry_data.get("client") is None:
+                _LOGGER.warning("Command requested for unknown car %s", vin)
+                response[vin] = "unknown car"
+                continue
+            targets.append((vin, entry_data))
+
+        results = await asyncio.gather(
+            *(async_send_command(entry_data, vin, command_type) for vin, entry_data in targets),
+            return_exceptions=True,
+        )
+        refresh = []
+        for (vin, entry_data), result in zip(targets, results):
+            if isinstance(result, Exception):
+                _LOGGER.warning("Could not send %s to %s: %s", COMMAND_TYPES[command_type], vin, result)
+                response[vin] = str(result) or type(result).__name__
+                continue
+            response[vin] = "sent"
+            coord = entry_data.get("coordinator")
+            if coord is not None and coord not in refresh:
+                refresh.append(coord)
+
+        # One refresh per entry for the whole batch (not one per car)
+        for coord in refresh:
+            try:
+                await coord.async_request_refresh()
+            except Exception as err:  # pragma: no cover - coordinator failure
+                _LOGGER.debug("Refresh after commands failed: %s", err)
+        return response
+
+    _register(hass, "refresh", _handle_refresh)
+    _register(hass, "set_timer", _handle_set_timer, schema=SET_TIMER_SCHEMA)
+    _register(hass, "probe_location", _handle_probe_location)
+    _register(hass, "import_statistics", _handle_import_statistics)
+    _register(hass, "export_trace", _handle_export_trace, **_optional_response())
+    _register(hass, "send_command", _handle_send_command, schema=SEND_COMMAND_SCHEMA, **_optional_response())
+
+
+def _optional_response() -> dict:
+    """`supports_response` for services that can return data (newer Home Assistant)."""
+    try:
+        from homeassistant.core import SupportsResponse
+    except Exception:  # pragma: no cover - older Home Assistant / test stubs
+        return {}
+    return {"supports_response": SupportsResponse.OPTIONAL}
+
+
+def _write_json(path: str, data) -> None:
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(data, fp)
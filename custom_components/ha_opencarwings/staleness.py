@@ -0,0 +1,98 @@
+"""Stale-while-revalidate serving of the last good car snapshot.
+
+When a coordinator refresh fails, the last good car dict of every VIN is served again
+instead of raising `UpdateFailed`, so entities keep their state (with its age exposed)
+rather than flapping to unavailable on every transient API error. Retries back off
+exponentially from the scan interval, but never past the moment the next served
+car expires: a car whose data is older than the configured maximum staleness is
+dropped from the snapshot by that retry and its entities report unavailable. Once every car has expired the failure is raised as before.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+# Minutes a car's last good data may be served while refreshes fail (0: no limit)
+DEFAULT_MAX_STALENESS_MIN = 120
+# Upper bound for the retry backoff, as a multiple of the scan interval
+MAX_BACKOFF_FACTOR = 8
+# Retry this long after the first served car expires (expiry is "older than")
+EXPIRY_MARGIN = timedelta(seconds=1)
+
+
+class StaleDataCache:
+    """Last good car dict per VIN, with refresh failure count and retry backoff."""
+
+    def __init__(self, max_staleness_min: float, scan_interval: timedelta) -> None:
+        self.max_staleness = timedelta(minutes=max_staleness_min) if max_staleness_min else None
+        self.scan_interval = scan_interval
+        # vin -> (car dict, time it was last refreshed successfully)
+        self._cars: dict[str, tuple[dict, datetime]] = {}
+        self.failures = 0
+        self.last_error: str | None = None
+
+    @staticmethod
+    def _now(now: datetime | None) -> datetime:
+        return now or datetime.now(timezone.utc)
+
+    def record(self, cars: list, now: datetime | None = None) -> list:
+        """Remember a successfully fetched snapshot (cars no longer listed are dropped)."""
+        now = self._now(now)
+        self._cars = {
+            str(c["vin"]): (c, now) for c in cars or [] if isinstance(c, dict) and c.get("vin")
+        }
+        self.failures = 0
+        self.last_error = None
+        return cars
+
+    def serve(self, err: Exception, now: datetime | None = None) -> list:
+        """Last good snapshot of the cars still within the maximum staleness.
+
+        Re-raises `err` when nothing is left to serve.
+        """
+        now = self._now(now)
+        self.failures += 1
+        self.last_error = str(err)
+        cars = [car for vin, (car, _) in self._cars.items() if not self.expired(vin, now)]
+        if not cars:
+            raise err
+        return cars
+
+    @property
+    def stale(self) -> bool:
+        """True while the served data comes from before the last failed refresh."""
+        return self.failures > 0
+
+    def age(self, vin: str, now: datetime | None = None) -> timedelta | None:
+        entry = self._cars.get(vin)
+        if entry is None:
+            return None
+        return self._now(now) - entry[1]
+
+    def expired(self, vin: str, now: datetime | None = None) -> bool:
+        """True when the last good data of `vin` is older than the maximum staleness."""
+        age = self.age(vin, now)
+        return self.max_staleness is not None and age is not None and age > self.max_staleness
+
+    def next_interval(self, now: datetime | None = None) -> timedelta:
+        """Scan interval doubled per consecutive failure (capped), reset on success.
+
+        While stale data is served, the retry comes no later than just after the
+        first served car expires, so expired data doesn't outlive the limit.
+        """
+        interval = self.scan_interval * min(2 ** self.failures, MAX_BACKOFF_FACTOR)
+        if not self.failures or self.max_staleness is None:
+            return interval
+        now = self._now(now)
+        expiries = [ts + self.max_staleness for _, ts in self._cars.values() if ts + self.max_staleness >= now]
+        if not expiries:
+            return interval
+        return min(interval, min(expiries) - now + EXPIRY_MARGIN)
+
+    def attributes(self, vin: str, now: datetime | None = None) -> dict:
+        """Staleness state attributes for the entities of `vin`."""
+        age = self.age(vin, now)
+        return {
+            "data_age": round(age.total_seconds()) if age is not None else None,
+            "stale": self.stale,
+            "refresh_failures": self.failures,
+        }
@@ -0,0 +1,193 @@
+"""Hourly long-term statistics for SoC, range and odometer.
+
+Samples are folded into per-car hourly buckets (mean/min/max). Closed hours are kept
+in a persisted local cache and pushed to the recorder's external statistics in one bulk
+call per statistic, rather than as one state write per poll. Hours that were not
+imported yet (e.g. after a restart) are imported from the cache at startup, and the
+whole cache can be re-imported on demand.
+"""
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+
+from .store import async_load
+from .util import parse_ts
+
+_LOGGER = logging.getLogger(__name__)
+
+STATISTICS_SOURCE = "ha_opencarwings"
+
+# metric -> (ev_info key or None for top-level, friendly name, unit)
+STATISTIC_METRICS = {
+    "soc": ("soc", "State of Charge", "%"),
+    "range_acon": ("range_acon", "Range (A/C on)", "km"),
+    "range_acoff": ("range_acoff", "Range (A/C off)", "km"),
+    "odometer": (None, "Odometer", "km"),
+}
+
+# Car fields read by the aggregator (see fields.py)
+CAR_FIELDS = ("ev_info.last_updated", "nickname", "model_name") + tuple(
+    f"ev_info.{key}" if key else metric for metric, (key, _name, _unit) in STATISTIC_METRICS.items()
+)
+
+HOUR = 3600
+# Closed hours kept in the local cache
+CACHE_RETENTION_HOURS = 24 * 90
+SAVE_DELAY = 120
+
+
+def statistic_id(metric: str, vin: str) -> str:
+    object_id = "".join(ch if ch.isalnum() else "_" for ch in f"{metric}_{vin}".lower())
+    return f"{STATISTICS_SOURCE}:{object_id}"
+
+
+def _metric_value(car: dict, metric: str) -> float | None:
+    key = STATISTIC_METRICS[metric][0]
+    value = (car.get("ev_info") or {}).get(key) if key else car.get(metric)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+class StatisticsAggregator:
+    """Hourly mean/min/max buckets per statistic id, with bulk external imports."""
+
+    def __init__(self, hass, store=None) -> None:
+        self.hass = hass
+        self._store = store
+        # statistic id -> {"hour": int, "n": int, "sum": float, "min": float, "max": float}
+        self._open: dict[str, dict] = {}
+        # statistic id -> list of closed hourly rows [hour, mean, min, max]
+        self._hours: dict[str, list[list]] = {}
+        # statistic id -> last hour already handed to the recorder
+        self._imported: dict[str, int] = {}
+        # statistic id -> (metric, vin, name prefix)
+        self._meta: dict[str, tuple[str, str, str]] = {}
+        self._last_key: dict[str, object] = {}
+
+    async def async_load(self) -> None:
+        data = await async_load(self._store)
+        self._hours = {k: list(v) for k, v in (data.get("hours") or {}).items()}
+        self._imported = {k: int(v) for k, v in (data.get("imported") or {}).items()}
+        self._meta = {k: tuple(v) for k, v in (data.get("meta") or {}).items()}
+
+    def _data_to_save(self) -> dict:
+        return {"hours": self._hours, "imported": self._imported, "meta": self._meta}
+
+    def pending(self, stat_id: str) -> list[list]:
+        """Closed hours not yet imported for a statistic id."""
+        done = self._imported.get(stat_id, -1)
+        return [row for row in self._hours.get(stat_id, []) if row[0] > done]
+
+    def _close(self, stat_id: str, bucket: dict) -> None:
+        rows = self._hours.setdefault(stat_id, [])
+        rows.append([bucket["hour"], bucket["sum"] / bucket["n"], bucket["min"], bucket["max"]])
+        if len(rows) > CACHE_RETENTION_HOURS:
+            del rows[: len(rows) - CACHE_RETENTION_HOURS]
+
+    def add_sample(self, stat_id: str, ts: float, value: float) -> bool:
+        """Fold a sample into its hour; returns True when an hour was closed."""
+        hour = int(ts // HOUR)
+        bucket = self._open.get(stat_id)
+        closed = False
+        if bucket is not None and hour < bucket["hour"]:
+            return False
+        if bucket is not None and hour != bucket["hour"]:
+            self._close(stat_id, bucket)
+            bucket = None
+            closed = True
+        if bucket is None:
+            self._open[stat_id] = {"hour": hour, "n": 1, "sum": value, "min": value, "max": value}
+            return closed
+        bucket["n"] += 1
+        bucket["sum"] += value
+        bucket["min"] = min(bucket["min"], value)
+        bucket["max"] = max(bucket["max"], value)
+        return closed
+
+    def update(self, cars: list, now: datetime | None = None) -> bool:
+        """Feed one coordinator snapshot; returns True when hours are ready to import."""
+        closed = False
+        for car in cars or []:
+            if not isinstance(car, dict) or not car.get("vin"):
+                continue
+            vin = str(car["vin"])
+            ev = car.get("ev_info") or {}
+            raw_ts = ev.get("last_updated")
+            key = (raw_ts, car.get("odometer"))
+            if raw_ts and self._last_key.get(vin) == key:
+                continue
+            self._last_key[vin] = key
+            parsed = parse_ts(raw_ts) if isinstance(raw_ts, str) else None
+            if parsed is not None and parsed.tzinfo is None:
+                parsed = parsed.replace(tzinfo=timezone.utc)
+            ts = (parsed or now or datetime.now(timezone.utc)).timestamp()
+            prefix = car.get("nickname") or car.get("model_name") or vin
+
+            for metric in STATISTIC_METRICS:
+                value = _metric_value(car, metric)
+                if value is None:
+                    continue
+                stat_id = statistic_id(metric, vin)
+                self._meta[stat_id] = (metric, vin, prefix)
+                closed |= self.add_sample(stat_id, ts, value)
+        return closed
+
+    def _metadata(self, stat_id: str) -> dict:
+        metric, _vin, prefix = self._meta[stat_id]
+        _key, name, unit = STATISTIC_METRICS[metric]
+        metadata = {
+            "has_mean": True,
+            "has_sum": False,
+            "name": f"{prefix} {name}",
+            "source": STATISTICS_SOURCE,
+            "statistic_id": stat_id,
+            "unit_of_measurement": unit,
+        }
+        try:
+            from homeassistant.components.recorder.models import StatisticMeanType
+
+            metadata["mean_type"] = StatisticMeanType.ARITHMETIC
+        except Exception:  # older Home Assistant: has_mean is enough
+            pass
+        return metadata
+
+    def async_flush(self, full: bool = False) -> int:
+        """Import pending hours (or the whole cache with `full`) in one call per statistic."""
+        try:
+            from homeassistant.components.recorder.statistics import async_add_external_statistics
+        except Exception:  # pragma: no cover - recorder not available in test stubs
+            _LOGGER.debug("Recorder statistics API unavailable; keeping hours in the local cache")
+            return 0
+
+        imported = 0
+        for stat_id in list(self._hours):
+            if stat_id not in self._meta:
+                continue
+            rows = self._hours[stat_id] if full else self.pending(stat_id)
+            if not rows:
+                continue
+            stats = [
+                {
+                    "start": datetime.fromtimestamp(hour * HOUR, timezone.utc),
+                    "mean": mean,
+                    "min": low,
+                    "max": high,
+                }
+                for hour, mean, low, high in rows
+            ]
+            try:
+                async_add_external_statistics(self.hass, self._metadata(stat_id), stats)
+            except Exception:
+                _LOGGER.exception("Could not import statistics for %s", stat_id)
+                continue
+            self._imported[stat_id] = max(self._imported.get(stat_id, -1), rows[-1][0])
+            imported += len(stats)
+
+        if self._store is not None:
+            self._store.async_delay_save(self._data_to_save, SAVE_DELAY)
+        return imported
@@ -0,0 +1,33 @@
+"""Thin wrapper around Home Assistant's JSON storage helper."""
+from __future__ import annotations
+
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+
+
+def async_create_store(hass, key: str):
+    """Return a `Store` for `key`, or None when storage isn't available (tests/stubs)."""
+    try:
+        from homeassistant.helpers.storage import Store
+    except Exception:  # pragma: no cover - storage helper not available in test stubs
+        return None
+    try:
+        return Store(hass, STORAGE_VERSION, key)
+    except Exception:  # pragma: no cover - defensive
+        _LOGGER.debug("Could not create store %s", key)
+        return None
+
+
+async def async_load(store) -> dict:
+    """Load stored data (an empty dict when nothing was saved or loading fails)."""
+    if store is None:
+        return {}
+    try:
+        data = await store.async_load()
+    except Exception:  # pragma: no cover - corrupt file or I/O error
+        _LOGGER.warning("Could not load stored OpenCARWINGS data from %s", getattr(store, "key", store))
+        return {}
+    return data if isinstance(data, dict) else {}
@@ -1,15 +1,28 @@
 """Switch platform to control car climate (A/C) as a simple switch."""
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from typing import Any
 import logging
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import DOMAIN
+from .commands import async_send_command
+from .util import parse_ts
 
 _LOGGER = logging.getLogger(__name__)
 
+# Car fields read by the switches (see fields.py)
+CAR_FIELDS = (
+    "vin", "nickname", "model_name", "make", "ev_info.ac_status", "ev_info.last_updated", "timer_commands"
+)
+
+# How long a commanded A/C state is shown while the car hasn't confirmed it
+OPTIMISTIC_WINDOW = timedelta(minutes=10)
+
 
 async def async_setup_entry(hass, entry, async_add_entities):
     data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
@@ -18,23 +31,115 @@ async def async_setup_entry(hass, entry, async_add_entities):
     entities = []
     for car in cars:
         if car.get("vin"):
-            ent = CarACSwitch(entry.entry_id, car)
+            ent = CarACSwitch(entry.entry_id, car, data.get("coordinator"))
             # Tests call entity methods directly; set hass here for testability
             ent.hass = hass
             entities.append(ent)
 
+    # One switch per server-side command timer (enable/disable the schedule)
+    timer_cache = data.get("timers")
+    coordinator = data.get("coordinator")
+    known_timers: set = set()
+
+    def _new_timer_switches(car_list: list) -> list:
+        new = []
+        for car in car_list:
+            vin = car.get("vin") if isinstance(car, dict) else None
+            if not vin:
+                continue
+            for timer in timer_cache.timers(vin):
+                if (vin, timer["id"]) in known_timers:
+                    continue
+                known_timers.add((vin, timer["id"]))
+                ent = CarTimerSwitch(coordinator, entry.entry_id, car, timer_cache, timer["id"])
+                ent.hass = hass
+                new.append(ent)
+        return new
+
+    if timer_cache is not None:
+        entities.extend(_new_timer_switches(cars))
+
     async_add_entities(entities)
 
+    if timer_cache is not None and coordinator is not None:
+        @callback
+        def _async_add_new_timers() -> None:
+            # Timers created by the set_timer service or on the server since setup
+            new = _new_timer_switches(coordinator.data or cars)
+            if new:
+                async_add_entities(new)
+
+        unsub = coordinator.async_add_listener(_async_add_new_timers)
+        if hasattr(entry, "async_on_unload"):
+            entry.async_on_unload(unsub)
+
+
+class CarACSwitch(CoordinatorEntity, SwitchEntity):
+    """Represents the car A/C as a switch.
 
-class CarACSwitch(SwitchEntity):
-    """Represents the car A/C as a switch."""
+    The state is `ev_info.ac_status` from the coordinator data. After a command the
+    commanded state is shown (optimistically) until the car confirms it, the car
+    reports newer data once the command is no longer pending, or the optimistic
+    window runs out; then the reported state wins again.
+    """
 
-    def __init__(self, entry_id: str, car: dict) -> None:
+    def __init__(self, entry_id: str, car: dict, coordinator=None) -> None:
+        super().__init__(coordinator)
         self._entry_id = entry_id
         self._car = car
         self._vin = car.get("vin")
-        # state: True = on, False = off (no real-time state unless refreshed)
-        self._is_on = False
+        # Commanded state and when it was sent (None: show the reported state)
+        self._optimistic: bool | None = None
+        self._optimistic_since: datetime | None = None
+
+    def _get_car(self) -> dict:
+        for c in getattr(self.coordinator, "data", None) or []:
+            if isinstance(c, dict) and c.get("vin") == self._vin:
+                return {**self._car, **c}
+        return self._car
+
+    def _ev(self) -> dict:
+        ev = self._get_car().get("ev_info")
+        return ev if isinstance(ev, dict) else {}
+
+    def _command_pending(self) -> bool:
+        hass = getattr(self, "hass", None)
+        data = hass.data.get(DOMAIN, {}).get(self._entry_id, {}) if hass is not None else {}
+        commands = data.get("commands")
+        return commands is not None and commands.is_pending(self._vin)
+
+    def _reconcile(self, now: datetime | None = None) -> None:
+        """Drop the optimistic state once the reported state is conclusive."""
+        if self._optimistic is None:
+            return
+        now = now or datetime.now(timezone.utc)
+        ev = self._ev()
+        reported = ev.get("ac_status")
+        updated = parse_ts(ev.get("last_updated"))
+        if reported is not None and bool(reported) == self._optimistic:
+            conclusive = True  # confirmed
+        elif updated is not None and updated > self._optimistic_since and not self._command_pending():
+            conclusive = True  # the car reported after the command was carried out
+        else:
+            conclusive = now - self._optimistic_since > OPTIMISTIC_WINDOW
+        if conclusive:
+            self._optimistic = None
+            self._optimistic_since = None
+
+    async def async_added_to_hass(self) -> None:
+        if self.coordinator is not None:
+            await super().async_added_to_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        self._reconcile()
+        self.async_write_ha_state()
+
+    @property
+    def available(self) -> bool:
+        if self.coordinator is None:
+            return True
+        return getattr(super(), "available", True)
 
     @property
     def name(self) -> str:
@@ -46,7 +151,23 @@ class CarACSwitch(SwitchEntity):
 
     @property
     def is_on(self) -> bool:
-        return self._is_on
+        self._reconcile()
+        if self._optimistic is not None:
+            return self._optimistic
+        return bool(self._ev().get("ac_status"))
+
+    @property
+    def assumed_state(self) -> bool:
+        return self._optimistic is not None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        ev = self._ev()
+        return {
+            "reported_ac_status": ev.get("ac_status"),
+            "reported_at": ev.get("last_updated"),
+            "optimistic_since": self._optimistic_since.isoformat() if self._optimistic_since else None,
+        }
 
     @property
     def device_info(self) -> dict[str, Any]:
@@ -57,27 +178,101 @@ class CarACSwitch(SwitchEntity):
             "model": self._car.get("model_name"),
         }
 
+    async def _async_command(self, command_type: int, state: bool) -> None:
+        await async_send_command(self.hass.data[DOMAIN][self._entry_id], self._vin, command_type)
+        self._optimistic = state
+        self._optimistic_since = datetime.now(timezone.utc)
+        if self.coordinator is not None:
+            self.async_write_ha_state()
+
     async def async_turn_on(self, **kwargs) -> None:
         """Turn A/C on by sending command_type 3 to `/api/command/{vin}/`."""
-        client = hass_client(self.hass, self._entry_id)
         try:
-            await client.async_request("POST", f"/api/command/{self._vin}/", json={"vin": self._vin, "command_type": 3})
-            self._is_on = True
+            await self._async_command(3, True)
         except Exception:  # pragma: no cover - network
             _LOGGER.exception("Failed to turn A/C on for %s", self._vin)
             raise
 
     async def async_turn_off(self, **kwargs) -> None:
         """Turn A/C off by sending command_type 4."""
-        client = hass_client(self.hass, self._entry_id)
         try:
-            await client.async_request("POST", f"/api/command/{self._vin}/", json={"vin": self._vin, "command_type": 4})
-            self._is_on = False
+            await self._async_command(4, False)
         except Exception:  # pragma: no cover - network
             _LOGGER.exception("Failed to turn A/C off for %s", self._vin)
             raise
 
 
+class CarTimerSwitch(CoordinatorEntity, SwitchEntity):
+    """Enables/disables a server-side command timer (`/api/car/{vin}/timers/`)."""
+
+    def __init__(self, coordinator, entry_id: str, car: dict, timer_cache, timer_id: int) -> None:
+        super().__init__(coordinator)
+        self._entry_id = entry_id
+        self._car = car
+        self._vin = car.get("vin")
+        self._timers = timer_cache
+        self._timer_id = timer_id
+
+    def _timer(self) -> dict:
+        return self._timers.get(self._vin, self._timer_id) or {}
+
+    @property
+    def name(self) -> str:
+        prefix = self._car.get("nickname") or self._car.get("model_name") or "Car"
+        return f"{prefix} Timer {self._timer().get('name') or self._timer_id}"
+
+    @property
+    def unique_id(self) -> str:
+        return f"ha_opencarwings_timer_{self._vin}_{self._timer_id}"
+
+    @property
+    def available(self) -> bool:
+        return bool(self._timer())
+
+    @property
+    def is_on(self) -> bool:
+        return bool(self._timer().get("enabled"))
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        return {
+            "identifiers": {(DOMAIN, self._vin)},
+            "name": self._car.get("model_name"),
+            "manufacturer": self._car.get("make"),
+            "model": self._car.get("model_name"),
+        }
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        timer = self._timer()
+        days = [d for d in ("mon", "tue", "wed", "thu", "fri", "sat", "sun") if timer.get(f"weekday_{d}")]
+        return {
+            "timer_id": self._timer_id,
+            "time": timer.get("time"),
+            "date": timer.get("date"),
+            "weekdays": days,
+            "command_type": timer.get("command_type"),
+            "command_type_display": timer.get("command_type_display"),
+            "timer_type_display": timer.get("timer_type_display"),
+            "last_command_execution": timer.get("last_command_execution"),
+            "last_command_result_display": timer.get("last_command_result_display"),
+        }
+
+    async def _async_set_enabled(self, enabled: bool) -> None:
+        try:
+            await self._timers.async_set_timer(self._vin, {"id": self._timer_id, "enabled": enabled})
+        except Exception:  # pragma: no cover - network
+            _LOGGER.exception("Failed to update timer %s for %s", self._timer_id, self._vin)
+            raise
+        self.async_write_ha_state()
+
+    async def async_turn_on(self, **kwargs) -> None:
+        await self._async_set_enabled(True)
+
+    async def async_turn_off(self, **kwargs) -> None:
+        await self._async_set_enabled(False)
+
+
 def hass_client(hass, entry_id: str):
     """Helper to get the API client stored in hass.data."""
     return hass.data[DOMAIN][entry_id]["client"]
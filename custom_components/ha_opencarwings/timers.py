@@ -0,0 +1,113 @@
+"""Local cache of server-side command timers (`/api/car/{vin}/timers/`).
+
+Timers run on the OpenCARWINGS server, so schedules don't need a Home Assistant
+automation (and a cloud round-trip) per fire. The car detail already embeds a
+`timer_commands` array; the cache only re-fetches the timer list when that array
+changes, and writes back only the timers whose fields actually differ.
+"""
+from __future__ import annotations
+
+import json
+import logging
+
+from .api import RequestError
+
+_LOGGER = logging.getLogger(__name__)
+
+# Car fields read by the cache (see fields.py)
+CAR_FIELDS = ("timer_commands",)
+
+# Writable fields of CommandTimerSetting (everything else is read-only/display)
+TIMER_FIELDS = (
+    "name",
+    "enabled",
+    "timer_type",
+    "command_type",
+    "weekday_mon",
+    "weekday_tue",
+    "weekday_wed",
+    "weekday_thu",
+    "weekday_fri",
+    "weekday_sat",
+    "weekday_sun",
+    "time",
+    "date",
+)
+
+
+def _signature(timer_commands) -> str:
+    """Cheap change marker for the `timer_commands` embedded in car detail."""
+    try:
+        return json.dumps(timer_commands, sort_keys=True, default=str)
+    except Exception:
+        return repr(timer_commands)
+
+
+class TimerCache:
+    """Per-VIN cache of command timers, keyed by timer id."""
+
+    def __init__(self, client) -> None:
+        self._client = client
+        self._timers: dict[str, dict[int, dict]] = {}
+        self._signatures: dict[str, str] = {}
+
+    def timers(self, vin: str) -> list[dict]:
+        return list(self._timers.get(vin, {}).values())
+
+    def get(self, vin: str, timer_id) -> dict | None:
+        return self._timers.get(vin, {}).get(timer_id)
+
+    def _store(self, vin: str, timers: list) -> None:
+        self._timers[vin] = {
+            t["id"]: t for t in timers if isinstance(t, dict) and t.get("id") is not None
+        }
+
+    async def async_sync(self, vin: str, car: dict) -> bool:
+        """Re-fetch the timers of a car if its `timer_commands` changed.
+
+        Returns True when the cache was refreshed from the server.
+        """
+        timer_commands = car.get("timer_commands") if isinstance(car, dict) else None
+        if vin in self._timers:
+            # Without the embedded array (lite list payload) we can't tell; keep the cache
+            if timer_commands is None:
+                return False
+            if self._signatures.get(vin) == _signature(timer_commands):
+                return False
+
+        if vin in self._timers:
+            # The embedded array changed: skip the response cache
+            timers = await self._client.async_get_timers(vin, cache=False)
+        else:
+            timers = await self._client.async_get_timers(vin)
+        self._store(vin, timers)
+        self._signatures[vin] = _signature(timer_commands)
+        return True
+
+    async def async_set_timer(self, vin: str, timer: dict) -> dict:
+        """Create a timer (no `id`) or update one, writing only if something changed."""
+        changes = {k: v for k, v in timer.items() if k in TIMER_FIELDS}
+        timer_id = timer.get("id")
+
+        if timer_id is None:
+            created = await self._client.async_create_timer(vin, changes)
+            if isinstance(created, dict) and created.get("id") is not None:
+                self._timers.setdefault(vin, {})[created["id"]] = created
+            return created
+
+        current = self.get(vin, timer_id)
+        if current is None:
+            raise RequestError(f"Unknown timer {timer_id} for {vin}")
+
+        diff = {k: v for k, v in changes.items() if current.get(k) != v}
+        if not diff:
+            _LOGGER.debug("Timer %s for %s unchanged; skipping write", timer_id, vin)
+            return current
+
+        # PUT needs the full writable body; only timers that differ are written
+        payload = {k: current.get(k) for k in TIMER_FIELDS if k in current}
+        payload.update(diff)
+        updated = await self._client.async_update_timer(vin, timer_id, payload)
+        merged = updated if isinstance(updated, dict) and updated.get("id") is not None else {**current, **diff}
+        self._timers.setdefault(vin, {})[timer_id] = merged
+        return merged
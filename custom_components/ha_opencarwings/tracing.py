@@ -0,0 +1,144 @@
+"""Per-refresh span traces, exportable as Chrome trace-event JSON.
+
+A coordinator refresh opens a trace; spans recorded while it runs (token refresh,
+list and detail requests, decoding, merge, subsystem processing) are attached to it
+through a context variable, so requests issued by the refresh's own tasks land in its
+trace while concurrent work (watch mode, location probes) does not. The listener
+fan-out and the entity state writes that follow the refresh are added by the
+dispatcher. The last traces are kept in a ring buffer and can be loaded into
+`chrome://tracing` or Perfetto from the `export_trace` service or the diagnostics.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+
+# Refresh traces kept per entry
+DEFAULT_MAX_TRACES = 20
+# Spans kept per trace (entity writes of large fleets are truncated)
+MAX_SPANS_PER_TRACE = 2000
+
+_CURRENT: ContextVar["RefreshTrace | None"] = ContextVar("opencarwings_trace", default=None)
+
+
+def _now_us() -> float:
+    return time.perf_counter() * 1_000_000
+
+
+class RefreshTrace:
+    """Spans of one coordinator refresh."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.wall_time = time.time()
+        self.start_us = _now_us()
+        self.end_us: float | None = None
+        # (name, category, start µs, duration µs, lane, args)
+        self.spans: list[tuple[str, str, float, float, int, dict]] = []
+        self.dropped = 0
+        self._lanes: dict[int, int] = {}
+
+    def _lane(self) -> int:
+        """Small per-trace lane number of the current task (concurrent spans get their own)."""
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        return self._lanes.setdefault(id(task), len(self._lanes) + 1)
+
+    @contextmanager
+    def span(self, name: str, category: str = "refresh", **args):
+        start = _now_us()
+        lane = self._lane()
+        try:
+            yield
+        except BaseException as err:
+            args["error"] = repr(err)
+            raise
+        finally:
+            if len(self.spans) < MAX_SPANS_PER_TRACE:
+                self.spans.append((name, category, start, _now_us() - start, lane, args))
+            else:
+                self.dropped += 1
+
+    def finish(self) -> None:
+        if self.end_us is None:
+            self.end_us = _now_us()
+
+
+@contextmanager
+def span(name: str, category: str = "api", **args):
+    """Record a span in the trace of the refresh running in this context (if any)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, category, **args):
+        yield
+
+
+class RefreshTracer:
+    """Ring buffer of the most recent refresh traces of one config entry."""
+
+    def __init__(self, max_traces: int = DEFAULT_MAX_TRACES) -> None:
+        self._traces: deque[RefreshTrace] = deque(maxlen=max_traces)
+        # Finished refresh whose listener fan-out hasn't been recorded yet
+        self._fanout: RefreshTrace | None = None
+
+    def __len__(self) -> int:
+        return len(self._traces)
+
+    @contextmanager
+    def trace(self, name: str = "refresh"):
+        """Trace a refresh: spans recorded in this context go to a new trace."""
+        trace = RefreshTrace(name)
+        self._traces.append(trace)
+        self._fanout = None
+        token = _CURRENT.set(trace)
+        try:
+            with trace.span(name, "coordinator"):
+                yield trace
+        finally:
+            _CURRENT.reset(token)
+            trace.finish()
+            self._fanout = trace
+
+    def take_fanout(self) -> RefreshTrace | None:
+        """The just-finished refresh, for the listener fan-out that follows it (once)."""
+        trace, self._fanout = self._fanout, None
+        return trace
+
+    def export(self) -> dict:
+        """All buffered traces as Chrome trace-event JSON (one process per refresh)."""
+        events: list[dict] = []
+        for pid, trace in enumerate(self._traces, start=1):
+            events.append({
+                "name": "process_name",
+                "ph": "M",
+                "pid": pid,
+                "args": {"name": f"{trace.name} {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(trace.wall_time))}"},
+            })
+            for name, category, start, duration, lane, args in trace.spans:
+                events.append({
+                    "name": name,
+                    "cat": category,
+                    "ph": "X",
+                    "ts": round(start, 1),
+                    "dur": round(duration, 1),
+                    "pid": pid,
+                    "tid": lane,
+                    "args": args,
+                })
+            if trace.dropped:
+                events.append({
+                    "name": f"{trace.dropped} spans dropped",
+                    "ph": "i",
+                    "s": "p",
+                    "ts": round(trace.end_us or trace.start_us, 1),
+                    "pid": pid,
+                    "tid": 1,
+                })
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
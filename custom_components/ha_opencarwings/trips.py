@@ -0,0 +1,217 @@
+"""Location history and incremental trip segmentation per car.
+
+Every refresh (and every location probe) contributes at most one (timestamp, lat, lon)
+sample per car. Samples go into a fixed-size, array-backed ring buffer, and a small state
+machine updates the current trip's distance and duration per sample, so no history ever
+has to be replayed from the recorder.
+"""
+from __future__ import annotations
+
+from array import array
+from datetime import datetime, timezone
+import math
+
+from .util import car_lat_lon, parse_ts
+
+# Samples kept per car
+DEFAULT_HISTORY_SIZE = 512
+# A position change below this is GPS jitter, not movement
+DEFAULT_MIN_MOVE_KM = 0.05
+# Without car_running information, a trip ends after this long without movement
+DEFAULT_STOP_AFTER_SEC = 600
+
+_EARTH_RADIUS_KM = 6371.0088
+
+# Car fields read by the trip tracker (see fields.py)
+CAR_FIELDS = ("location", "last_location", "ev_info.last_location", "ev_info.car_running")
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class LocationHistory:
+    """Fixed-capacity ring buffer of (timestamp, lat, lon) samples.
+
+    Backed by three preallocated `array('d')` columns, so memory stays constant no
+    matter how long Home Assistant runs.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE) -> None:
+        self._capacity = capacity
+        self._ts = array("d", [0.0]) * capacity
+        self._lat = array("d", [0.0]) * capacity
+        self._lon = array("d", [0.0]) * capacity
+        self._head = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, ts: float, lat: float, lon: float) -> None:
+        i = self._head
+        self._ts[i] = ts
+        self._lat[i] = lat
+        self._lon[i] = lon
+        self._head = (i + 1) % self._capacity
+        if self._count < self._capacity:
+            self._count += 1
+
+    def last(self) -> tuple[float, float, float] | None:
+        if not self._count:
+            return None
+        i = (self._head - 1) % self._capacity
+        return self._ts[i], self._lat[i], self._lon[i]
+
+    def samples(self) -> list[tuple[float, float, float]]:
+        """All samples, oldest first."""
+        start = (self._head - self._count) % self._capacity
+        out = []
+        for k in range(self._count):
+            i = (start + k) % self._capacity
+            out.append((self._ts[i], self._lat[i], self._lon[i]))
+        return out
+
+
+class TripSegmenter:
+    """Detect trip start/stop from `car_running` and position deltas, one sample at a time."""
+
+    def __init__(self, min_move_km: float = DEFAULT_MIN_MOVE_KM, stop_after_sec: float = DEFAULT_STOP_AFTER_SEC) -> None:
+        self._min_move_km = min_move_km
+        self._stop_after_sec = stop_after_sec
+        self._prev: tuple[float, float, float] | None = None
+        self.active = False
+        self.start_ts: float | None = None
+        self.last_move_ts: float | None = None
+        self.distance_km = 0.0
+        self.last_trip: dict | None = None
+
+    def add(self, ts: float, lat: float, lon: float, running: bool | None = None) -> None:
+        prev = self._prev
+        step = haversine_km(prev[1], prev[2], lat, lon) if prev else 0.0
+        moved = step >= self._min_move_km
+        self._prev = (ts, lat, lon)
+
+        if not self.active:
+            if running or moved:
+                self.active = True
+                # If we only noticed the movement now, the trip began at the previous fix
+                self.start_ts = prev[0] if moved and prev else ts
+                self.distance_km = step if moved else 0.0
+                self.last_move_ts = ts
+            return
+
+        if moved:
+            self.distance_km += step
+            self.last_move_ts = ts
+        elif running:
+            self.last_move_ts = ts
+
+        if not moved and (running is False or ts - (self.last_move_ts or ts) >= self._stop_after_sec):
+            self._end()
+
+    def idle(self, ts: float, running: bool | None = None) -> None:
+        """No new fix by `ts`: end the trip once the car reports it stopped, or after
+        the stop timeout without movement unless it still reports running."""
+        if not self.active or running is True:
+            return
+        if running is False or ts - (self.last_move_ts or ts) >= self._stop_after_sec:
+            self._end()
+
+    def _end(self) -> None:
+        end_ts = self.last_move_ts or self.start_ts
+        self.last_trip = {
+            "start": self.start_ts,
+            "end": end_ts,
+            "distance_km": self.distance_km,
+            "duration_sec": max(0.0, (end_ts or 0.0) - (self.start_ts or 0.0)),
+        }
+        self.active = False
+        self.start_ts = None
+        self.distance_km = 0.0
+
+    @property
+    def duration_sec(self) -> float:
+        if self.active and self.start_ts is not None and self.last_move_ts is not None:
+            return max(0.0, self.last_move_ts - self.start_ts)
+        return 0.0
+
+    def current(self) -> dict | None:
+        """The trip in progress, or else the last finished one."""
+        if self.active:
+            return {
+                "start": self.start_ts,
+                "end": None,
+                "distance_km": self.distance_km,
+                "duration_sec": self.duration_sec,
+            }
+        return self.last_trip
+
+
+class TripTracker:
+    """Per-VIN location history and trip segmentation, fed from refreshes and probes."""
+
+    def __init__(self, capacity: int = DEFAULT_HISTORY_SIZE) -> None:
+        self._capacity = capacity
+        self._history: dict[str, LocationHistory] = {}
+        self._segmenters: dict[str, TripSegmenter] = {}
+        self._last_key: dict[str, tuple] = {}
+
+    def history(self, vin: str) -> LocationHistory | None:
+        return self._history.get(vin)
+
+    def trip(self, vin: str) -> dict | None:
+        seg = self._segmenters.get(vin)
+        return seg.current() if seg else None
+
+    def is_active(self, vin: str) -> bool:
+        seg = self._segmenters.get(vin)
+        return bool(seg and seg.active)
+
+    def add_location(self, vin: str, location: dict, running: bool | None = None, now: datetime | None = None) -> bool:
+        """Add one sample from a LocationInfo-like dict. Returns False for duplicates."""
+        lat, lon = car_lat_lon({"location": location})
+        if lat is None or lon is None:
+            return False
+
+        raw_ts = location.get("last_updated") if isinstance(location, dict) else None
+        parsed = parse_ts(raw_ts) if isinstance(raw_ts, str) else None
+        # The same fix reported by consecutive polls is not a new sample
+        key = (raw_ts, lat, lon) if parsed else (None, lat, lon, running)
+        if self._last_key.get(vin) == key:
+            # The last fix may have shown movement: don't keep the trip open forever
+            seg = self._segmenters.get(vin)
+            if seg is not None:
+                seg.idle((now or datetime.now(timezone.utc)).timestamp(), running)
+            return False
+        self._last_key[vin] = key
+
+        if parsed is not None and parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        ts = (parsed or now or datetime.now(timezone.utc)).timestamp()
+
+        history = self._history.setdefault(vin, LocationHistory(self._capacity))
+        last = history.last()
+        if last is not None and ts < last[0]:
+            # Older than what we already have (e.g. stale list data after a probe)
+            return False
+        history.append(ts, lat, lon)
+        self._segmenters.setdefault(vin, TripSegmenter()).add(ts, lat, lon, running)
+        return True
+
+    def update(self, cars: list, now: datetime | None = None) -> None:
+        """Feed one coordinator snapshot (list of car dicts)."""
+        for car in cars or []:
+            if not isinstance(car, dict) or not car.get("vin"):
+                continue
+            loc = car.get("location") or car.get("last_location")
+            if isinstance(loc, list):
+                loc = loc[0] if loc else None
+            if not isinstance(loc, dict):
+                continue
+            running = (car.get("ev_info") or {}).get("car_running")
+            self.add_location(str(car["vin"]), loc, running, now=now)
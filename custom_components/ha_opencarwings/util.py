@@ -0,0 +1,181 @@
+"""Small helpers shared by the OpenCARWINGS platforms and subsystems."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime, timezone
+import json
+import math
+import re
+
+try:
+    import orjson
+except Exception:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Name of the JSON decoder in use (shown in diagnostics and benchmarks)
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+
+def json_loads(data: bytes | str):
+    """Decode a JSON document with orjson when installed, the stdlib otherwise."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Bytes that matter to the array splitter outside / inside of strings
+_ARRAY_TOKENS = re.compile(rb'["\[\]{},]')
+_STRING_TOKENS = re.compile(rb'["\\]')
+
+
+class JsonArrayStream:
+    """Split a streamed top-level JSON array into the raw bytes of its elements.
+
+    Chunks are fed as they arrive; each complete element is returned as soon as its
+    closing bracket (or the following comma for scalars) has been seen, so it can be
+    decoded while the rest of the array is still downloading. Only structural bytes
+    are inspected, using regex jumps rather than a per-byte loop.
+    """
+
+    def __init__(self) -> None:
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_str = False
+        self._opened = False
+        # Start of the current top-level element (None once it has been emitted)
+        self._seg: int | None = None
+        self.closed = False
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        buf = self._buf
+        buf += chunk
+        out: list[bytes] = []
+        i = self._pos
+        while not self.closed:
+            if self._in_str:
+                m = _STRING_TOKENS.search(buf, i)
+                if m is None:
+                    i = len(buf)
+                    break
+                i = m.start()
+                if buf[i] == 0x5C:  # backslash: skip the escaped byte
+                    if i + 1 >= len(buf):
+                        break
+                    i += 2
+                    continue
+                self._in_str = False
+                i += 1
+                continue
+
+            m = _ARRAY_TOKENS.search(buf, i)
+            if m is None:
+                i = len(buf)
+                break
+            i = m.start()
+            c = buf[i]
+            if not self._opened:
+                if c != 0x5B or buf[:i].strip():
+                    raise ValueError("Expected a JSON array")
+                self._opened = True
+                self._seg = i + 1
+            elif c == 0x22:
+                self._in_str = True
+            elif c in (0x7B, 0x5B):
+                self._depth += 1
+            elif c in (0x7D, 0x5D) and self._depth > 0:
+                self._depth -= 1
+                if self._depth == 0 and self._seg is not None:
+                    out.append(bytes(buf[self._seg : i + 1]))
+                    self._seg = None
+            elif self._depth == 0 and c in (0x2C, 0x5D):
+                if self._seg is not None and buf[self._seg : i].strip():
+                    out.append(bytes(buf[self._seg : i]).strip())
+                self._seg = i + 1
+                self.closed = c == 0x5D
+            elif self._depth == 0:
+                raise ValueError("Unexpected closing bracket in JSON array")
+            i += 1
+
+        # Drop everything before the element in progress
+        keep = i if self._seg is None else min(self._seg, i)
+        if keep:
+            del buf[:keep]
+            i -= keep
+            if self._seg is not None:
+                self._seg -= keep
+        self._pos = i
+        return out
+
+
+class LatencyWindow:
+    """The most recent latency samples (ms) with nearest-rank percentiles."""
+
+    def __init__(self, size: int = 100, min_samples: int = 20) -> None:
+        self._samples: deque[float] = deque(maxlen=size)
+        self.min_samples = min_samples
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency_ms: float) -> None:
+        self._samples.append(latency_ms)
+
+    def percentile(self, pct: float) -> float | None:
+        """`pct` percentile of the window, None until `min_samples` were recorded."""
+        if not self._samples or len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[max(math.ceil(pct / 100 * len(ordered)) - 1, 0)]
+
+
+def parse_ts(value: str | None) -> datetime | None:
+    if not value:
+        return None
+    try:
+        # support ISO8601 like `2026-01-04T12:00:00Z` or with microseconds `...10.419903Z`
+        if value.endswith("Z"):
+            try:
+                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").replace(tzinfo=timezone.utc)
+            except ValueError:
+                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+        return datetime.fromisoformat(value)
+    except Exception:
+        return None
+
+
+def format_dt(dt: datetime | None) -> str | None:
+    if not dt:
+        return None
+    try:
+        ts = dt.isoformat()
+        if ts.endswith("+00:00"):
+            ts = ts.replace("+00:00", "Z")
+        return ts
+    except Exception:
+        return None
+
+
+def car_lat_lon(car: dict) -> tuple[float | None, float | None]:
+    """Latitude/longitude of a car dict, accepting the various location payload shapes."""
+    # Look for various forms of last location in the car data.
+    loc = car.get("last_location") or car.get("location")
+    if loc is None and isinstance(car.get("ev_info"), dict):
+        loc = car.get("ev_info", {}).get("last_location")
+
+    # If the last_location is a list, use the first element.
+    if isinstance(loc, list) and len(loc) > 0:
+        loc = loc[0]
+
+    if isinstance(loc, dict):
+        lat = loc.get("lat") or loc.get("latitude")
+        lon = loc.get("lon") or loc.get("longitude")
+        if lat is not None and lon is not None:
+            # Accept commas as decimal separators ("53,0")
+            try:
+                lat_f = float(str(lat).replace(",", "."))
+                lon_f = float(str(lon).replace(",", "."))
+                return lat_f, lon_f
+            except Exception:
+                return None, None
+    return None, None
@@ -20,3 +20,13 @@ class Entity:
     @property
     def state(self):
         return None
+
+    async def async_added_to_hass(self):
+        pass
+
+    def async_on_remove(self, func):
+        self.__dict__.setdefault("_on_remove", []).append(func)
+
+    def async_write_ha_state(self):
+        # no-op: tests read entity properties directly
+        pass
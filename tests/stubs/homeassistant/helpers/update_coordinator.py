@@ -1,5 +1,7 @@
 import asyncio
 
+from homeassistant.helpers.entity import Entity
+
 class UpdateFailed(Exception):
     pass
 
@@ -17,6 +19,11 @@ class DataUpdateCoordinator:
         # perform initial fetch
         self.data = await self.update_method()
 
+    async def async_refresh(self):
+        self.data = await self.update_method()
+        for listener in list(self._listeners):
+            listener()
+
     def async_add_listener(self, listener):
         self._listeners.append(listener)
 
@@ -28,18 +35,42 @@ class DataUpdateCoordinator:
 
         return _remove
 
+    def async_set_updated_data(self, data):
+        self.data = data
+        for listener in list(self._listeners):
+            listener()
+
     async def async_request_refresh(self):
         self.data = await self.update_method()
         for listener in list(self._listeners):
             listener()
 
 
-class CoordinatorEntity:
-    """Minimal CoordinatorEntity stub used in tests."""
+class BaseCoordinatorEntity(Entity):
+    """Stub of Home Assistant's BaseCoordinatorEntity: registers the coordinator listener."""
 
-    def __init__(self, coordinator):
+    def __init__(self, coordinator, context=None):
         self.coordinator = coordinator
+        self.coordinator_context = context
+
+    @property
+    def should_poll(self):
+        return False
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_listener(self._handle_coordinator_update))
+
+    def _handle_coordinator_update(self):
+        raise NotImplementedError
+
+
+class CoordinatorEntity(BaseCoordinatorEntity):
+    """Stub of Home Assistant's CoordinatorEntity: availability and state write per update."""
+
+    @property
+    def available(self):
+        return self.coordinator.last_update_success
 
-    def async_write_ha_state(self):
-        # no-op: tests call listener functions directly
-        pass
+    def _handle_coordinator_update(self):
+        self.async_write_ha_state()
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.ha_opencarwings import switch as switch_mod
+from custom_components.ha_opencarwings.commands import CommandTracker
+
+
+def _ts(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class Coordinator:
+    def __init__(self, ac_status, last_updated):
+        self.last_update_success = True
+        self.set(ac_status, last_updated)
+
+    def set(self, ac_status, last_updated):
+        self.data = [{"vin": "VIN1", "ev_info": {"ac_status": ac_status, "last_updated": _ts(last_updated)}}]
+
+
+class Client:
+    def __init__(self):
+        self.calls = []
+
+    async def async_request(self, method, path, **kwargs):
+        self.calls.append((method, path, kwargs))
+        return type("R", (), {"status": 200})()
+
+
+def _switch(coordinator, commands=None):
+    data = {"client": Client(), "coordinator": coordinator, "cars": [{"vin": "VIN1", "model_name": "Leaf"}]}
+    if commands is not None:
+        data["commands"] = commands
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": data}}})()
+    sw = switch_mod.CarACSwitch("e1", data["cars"][0], coordinator)
+    sw.hass = hass
+    return sw
+
+
+def test_state_follows_reported_ac_status():
+    now = datetime.now(timezone.utc)
+    coordinator = Coordinator(True, now)
+    sw = _switch(coordinator)
+    # e.g. after a restart with climate running
+    assert sw.is_on is True
+    coordinator.set(False, now)
+    assert sw.is_on is False
+    assert sw.extra_state_attributes["reported_ac_status"] is False
+
+
+@pytest.mark.asyncio
+async def test_optimistic_state_until_car_confirms():
+    earlier = datetime.now(timezone.utc) - timedelta(minutes=5)
+    coordinator = Coordinator(False, earlier)
+    sw = _switch(coordinator)
+
+    await sw.async_turn_on()
+    assert sw.is_on is True
+    assert sw.assumed_state is True
+    # a refresh without news from the car keeps the commanded state
+    sw._handle_coordinator_update()
+    assert sw.is_on is True
+
+    coordinator.set(True, datetime.now(timezone.utc))
+    sw._handle_coordinator_update()
+    assert sw.is_on is True
+    assert sw.assumed_state is False
+
+
+@pytest.mark.asyncio
+async def test_reported_state_wins_once_command_is_done_or_window_expires():
+    commands = CommandTracker()
+    coordinator = Coordinator(False, datetime.now(timezone.utc) - timedelta(minutes=5))
+    sw = _switch(coordinator, commands)
+
+    await sw.async_turn_on()
+    assert commands.is_pending("VIN1")
+    # newer data while the command is still pending: keep showing "on"
+    coordinator.set(False, datetime.now(timezone.utc) + timedelta(seconds=1))
+    sw._handle_coordinator_update()
+    assert sw.is_on is True
+
+    # the command is done and the car still reports off (e.g. it failed)
+    commands.update([{"vin": "VIN1", "command_request_time": "t2", "command_requested": False}])
+    assert not commands.is_pending("VIN1")
+    sw._handle_coordinator_update()
+    assert sw.is_on is False
+
+    await sw.async_turn_on()
+    sw._optimistic_since -= switch_mod.OPTIMISTIC_WINDOW + timedelta(seconds=1)
+    coordinator.set(False, datetime.now(timezone.utc) - timedelta(hours=1))
+    assert sw.is_on is False
@@ -0,0 +1,92 @@
+import pytest
+
+from custom_components.ha_opencarwings import alerts as alerts_mod
+from custom_components.ha_opencarwings import sensor as sensor_mod
+
+
+class BusStub:
+    def __init__(self):
+        self.events = []
+
+    def async_fire(self, event_type, data=None):
+        self.events.append((event_type, data))
+
+
+class AlertsClient:
+    def __init__(self, alerts):
+        self.alerts = alerts
+        self.calls = []
+
+    async def async_get_alerts(self, vin):
+        self.calls.append(vin)
+        return list(self.alerts.get(vin, []))
+
+
+def _alert(alert_id, type_display="Charge finished", ts="2026-01-04T12:00:00Z"):
+    return {"id": alert_id, "type": 1, "type_display": type_display, "timestamp": ts}
+
+
+@pytest.mark.asyncio
+async def test_first_poll_seeds_cursor_without_events():
+    bus = BusStub()
+    hass = type("H", (), {"bus": bus})()
+    client = AlertsClient({"VIN1": [_alert(1), _alert(2)]})
+    feed = alerts_mod.AlertFeed(hass, client)
+
+    new = await feed.async_poll("VIN1")
+
+    assert new == []
+    assert bus.events == []
+    assert feed.cursor("VIN1")[0] == 2
+    assert feed.latest("VIN1")["id"] == 2
+
+
+@pytest.mark.asyncio
+async def test_only_new_alerts_fire_events_in_order():
+    bus = BusStub()
+    hass = type("H", (), {"bus": bus})()
+    client = AlertsClient({"VIN1": [_alert(1)]})
+    feed = alerts_mod.AlertFeed(hass, client)
+    await feed.async_poll("VIN1")
+
+    client.alerts["VIN1"] = [_alert(3, "Plugged in"), _alert(2, "Charge finished"), _alert(1)]
+    new = await feed.async_poll("VIN1")
+
+    assert [a["id"] for a in new] == [2, 3]
+    assert [e[1]["id"] for e in bus.events] == [2, 3]
+    assert bus.events[0][0] == alerts_mod.EVENT_ALERT
+    assert bus.events[0][1]["vin"] == "VIN1"
+
+    # Polling again with nothing new is a no-op
+    assert await feed.async_poll("VIN1") == []
+    assert len(bus.events) == 2
+
+
+def test_ring_buffer_is_bounded_newest_first():
+    feed = alerts_mod.AlertFeed(type("H", (), {})(), None, buffer_size=3)
+    feed.process("VIN1", [])
+    feed.process("VIN1", [_alert(i) for i in range(1, 6)])
+
+    assert [a["id"] for a in feed.recent("VIN1")] == [5, 4, 3]
+
+
+@pytest.mark.asyncio
+async def test_last_alert_sensor_created_with_alerts_subsystem():
+    feed = alerts_mod.AlertFeed(type("H", (), {})(), None)
+    feed.process("VIN1", [_alert(7, "Plugged in")])
+    alerts_coord = type("C", (), {"data": {"VIN1": feed.recent("VIN1")}})()
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "alerts": feed,
+        "alerts_coordinator": alerts_coord,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    sensor = next(x for x in added if x.unique_id == "ha_opencarwings_last_alert_VIN1")
+    assert sensor.name == "MyCar Last Alert"
+    assert sensor.native_value == "Plugged in"
+    assert sensor.extra_state_attributes["alert_id"] == 7
@@ -126,3 +126,45 @@ async def test_request_network_error(monkeypatch):
     client = api.OpenCarWingsAPI(hass=None)
     with pytest.raises(api.RequestError):
         await client.async_request("GET", "/api/car/")
+
+
+@pytest.mark.asyncio
+async def test_check_connection_accepts_401_and_rejects_server_errors(monkeypatch):
+    mock_session = MockSession()
+    mock_session.requests.append(MockResponse(401, {}, "not authenticated"))
+    mock_session.requests.append(MockResponse(502, {}, "bad gateway"))
+
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: mock_session,
+    )
+
+    client = api.OpenCarWingsAPI(hass=None)
+    assert await client.async_check_connection() >= 0
+    with pytest.raises(api.RequestError):
+        await client.async_check_connection()
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_caps_requests_in_flight(monkeypatch):
+    in_flight = 0
+    peak = 0
+
+    class SlowSession:
+        async def request(self, method, url, headers=None, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return MockResponse(200, {"vin": url.rstrip("/").rsplit("/", 1)[-1]})
+
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: SlowSession(),
+    )
+
+    client = api.OpenCarWingsAPI(hass=None)
+    client.set_concurrency_limit(2)
+    await asyncio.gather(*(client.async_get_car_by_vin(f"VIN{i}") for i in range(6)))
+    assert peak == 2
@@ -0,0 +1,80 @@
+from datetime import datetime, timezone
+
+import pytest
+
+from custom_components.ha_opencarwings import battery as battery_mod
+from custom_components.ha_opencarwings import sensor as sensor_mod
+
+DAY = 86400
+
+
+def test_trend_fit_is_exact_for_linear_data():
+    series = battery_mod.BatterySeries()
+    for d in range(10):
+        series.add(d * DAY, {"soh": 90 - 0.01 * d, "max_gids": 250 - 0.05 * d})
+
+    fit = series.fit()
+    assert fit["soh"][0] == pytest.approx(-0.01)
+    assert fit["max_gids"][0] == pytest.approx(-0.05)
+    assert fit["gids"] is None
+    assert series.project("soh", 20 * DAY) == pytest.approx(89.8)
+
+
+def test_samples_in_same_bucket_are_averaged():
+    series = battery_mod.BatterySeries()
+    series.add(0, {"soh": 90})
+    series.add(60, {"soh": 92})
+    series.add(120, {"soh": 94})
+
+    assert len(series) == 1
+    assert series.latest()["soh"] == pytest.approx(92)
+
+
+def test_eviction_keeps_running_sums_consistent():
+    series = battery_mod.BatterySeries(capacity=5)
+    for d in range(12):
+        series.add(d * DAY, {"soh": 100 - d * d * 0.1})
+
+    reference = battery_mod.BatterySeries(capacity=5, origin=series._origin)
+    for d in range(7, 12):
+        reference.add(d * DAY, {"soh": 100 - d * d * 0.1})
+
+    assert len(series) == 5
+    assert series.fit()["soh"][0] == pytest.approx(reference.fit()["soh"][0])
+
+
+def test_series_roundtrip_through_storage_format():
+    series = battery_mod.BatterySeries()
+    for d in range(4):
+        series.add(d * DAY, {"soh": 90 - d, "cap_bars": 12})
+
+    restored = battery_mod.BatterySeries.from_dict(series.as_dict())
+    assert len(restored) == 4
+    assert restored.fit()["soh"][0] == pytest.approx(series.fit()["soh"][0])
+    assert restored.latest()["cap_bars"] == 12
+
+
+@pytest.mark.asyncio
+async def test_battery_health_sensors():
+    tracker = battery_mod.BatteryHealthTracker()
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc).timestamp()
+    for d in range(30):
+        ts = datetime.fromtimestamp(start + d * DAY, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        tracker.update([{"vin": "VIN1", "ev_info": {"last_updated": ts, "soh": 85, "cap_bars": 11, "max_gids": 240 - d * 0.1}}])
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "battery": tracker,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    soh = next(x for x in added if x.unique_id == "ha_opencarwings_battery_soh_VIN1")
+    usable = next(x for x in added if x.unique_id == "ha_opencarwings_battery_usable_capacity_VIN1")
+    projected = next(x for x in added if x.unique_id == "ha_opencarwings_battery_projected_capacity_VIN1")
+    assert soh.native_value == 85
+    assert usable.native_value == pytest.approx(round(237.1 * battery_mod.WH_PER_GID / 1000, 1))
+    assert projected.native_value < usable.native_value
+    assert usable.extra_state_attributes["samples"] == 30
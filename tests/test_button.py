@@ -129,7 +129,8 @@ async def test_car_refresh_button_calls_api(monkeypatch):
 
         async def async_request(self, method, path, **kwargs):
             calls.append((method, path, kwargs))
-            class R: pass
+            class R:
+                status = 200
             return R()
 
     hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"client": MockClient(None), "cars": [{"vin": "VIN1", "model_name": "M1"}]}}}})()
@@ -177,7 +178,7 @@ async def test_car_refresh_button_triggers_coordinator_refresh(monkeypatch):
         async def async_request(self, method, path, **kwargs):
             calls.append((method, path, kwargs))
             class R:  # pragma: no cover - simple stub response
-                pass
+                status = 200
             return R()
 
     coord = FakeCoordinator()
@@ -264,7 +265,8 @@ async def test_car_chargestart_button_calls_api(monkeypatch):
 
         async def async_request(self, method, path, **kwargs):
             calls.append((method, path, kwargs))
-            class R: pass
+            class R:
+                status = 200
             return R()
 
     hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"client": MockClient(None), "cars": [{"vin": "VIN1", "model_name": "M1"}]}}}})()
@@ -312,7 +314,7 @@ async def test_car_chargestart_button_triggers_coordinator_refresh(monkeypatch):
         async def async_request(self, method, path, **kwargs):
             calls.append((method, path, kwargs))
             class R:  # pragma: no cover - simple stub response
-                pass
+                status = 200
             return R()
 
     coord = FakeCoordinator()
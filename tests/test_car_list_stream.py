@@ -0,0 +1,104 @@
+import asyncio
+import importlib
+import json
+
+import pytest
+
+from custom_components.ha_opencarwings import api
+from custom_components.ha_opencarwings.util import JsonArrayStream
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+CARS = [
+    {"vin": "VIN1", "nickname": "a]b}\"c\\", "route_plans": [[1, 2], {"x": []}]},
+    {"vin": "VIN2", "nickname": "x,y"},
+]
+
+
+class StreamContent:
+    def __init__(self, body: bytes, size: int):
+        self._body = body
+        self._size = size
+
+    async def iter_chunked(self, n):
+        for i in range(0, len(self._body), self._size):
+            yield self._body[i : i + self._size]
+
+
+class StreamResponse:
+    status = 200
+
+    def __init__(self, body: bytes, size: int = 5):
+        self.content = StreamContent(body, size)
+
+
+def test_splitter_emits_elements_across_any_chunk_boundary():
+    body = json.dumps(CARS + [5, "s,]", None], indent=1).encode()
+    for size in range(1, 12):
+        splitter = JsonArrayStream()
+        out = []
+        for i in range(0, len(body), size):
+            out += splitter.feed(body[i : i + size])
+        assert [json.loads(x) for x in out] == CARS + [5, "s,]", None]
+        assert splitter.closed
+
+
+@pytest.mark.asyncio
+async def test_iter_cars_streams_and_projects():
+    client = api.OpenCarWingsAPI(hass=None)
+    body = json.dumps(CARS).encode()
+
+    async def _request(self, method, url, headers=None, **kwargs):
+        return StreamResponse(body)
+
+    client._session = type("S", (), {"request": _request})()
+    client.car_projection = {"vin": True, "nickname": True}
+
+    cars = [car async for car in client.async_iter_cars()]
+    assert cars == [{"vin": "VIN1", "nickname": CARS[0]["nickname"]}, {"vin": "VIN2", "nickname": "x,y"}]
+
+    # a body cut off mid-array is an error, not a short list
+    async def _truncated(self, method, url, headers=None, **kwargs):
+        return StreamResponse(body[:-10])
+
+    client._session = type("S", (), {"request": _truncated})()
+    with pytest.raises(api.RequestError):
+        [car async for car in client.async_iter_cars()]
+
+
+class StreamingClient:
+    def __init__(self, hass=None, base_url=None):
+        self.detail_started = asyncio.Event()
+        self.list_done = False
+
+    def set_tokens(self, access, refresh):
+        pass
+
+    async def async_iter_cars(self):
+        yield {"vin": "VIN1", "nickname": "One"}
+        # the detail fetch for VIN1 runs while the rest of the list downloads
+        await asyncio.wait_for(self.detail_started.wait(), 1)
+        yield {"vin": "VIN2", "nickname": "Two"}
+        self.list_done = True
+
+    async def async_get_car_by_vin(self, vin):
+        if vin == "VIN1":
+            assert not self.list_done
+            self.detail_started.set()
+        return {"vin": vin, "odometer": 100 if vin == "VIN1" else 200}
+
+
+@pytest.mark.asyncio
+async def test_setup_overlaps_detail_fetches_with_list_download(monkeypatch):
+    async def _forward(self, entry, platforms):
+        return None
+
+    config_entries = type("C", (), {"async_start_reauth": lambda x: None, "async_forward_entry_setups": _forward})()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries})()
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", StreamingClient)
+
+    entry = type("E", (), {"entry_id": "e1", "data": {"access_token": "a", "refresh_token": "r"}, "title": "t"})()
+    assert await module_init.async_setup_entry(hass, entry)
+
+    cars = hass.data["ha_opencarwings"]["e1"]["cars"]
+    assert [(c["vin"], c["nickname"], c["odometer"]) for c in cars] == [("VIN1", "One", 100), ("VIN2", "Two", 200)]
@@ -0,0 +1,107 @@
+import pytest
+
+from custom_components.ha_opencarwings import charging as charging_mod
+from custom_components.ha_opencarwings import sensor as sensor_mod
+
+
+def _ev(ts, charging, wh=None, gids=None, soc=None, plugged=True, quick=False):
+    ev = {"last_updated": ts, "charging": charging, "quick_charging": quick, "plugged_in": plugged, "soc": soc}
+    if wh is not None:
+        ev["wh_content"] = wh
+    if gids is not None:
+        ev["gids"] = gids
+    return ev
+
+
+def test_session_accumulates_energy_and_average_rate():
+    tracker = charging_mod.ChargingSessionTracker()
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:00:00Z", False, wh=10000, soc=40))
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:30:00Z", True, wh=10000, soc=40))
+    assert tracker.is_active("VIN1")
+
+    tracker.add_sample("VIN1", _ev("2026-01-04T11:30:00Z", True, wh=13000, soc=55))
+    # the same report seen again by the next poll is not counted twice
+    tracker.add_sample("VIN1", _ev("2026-01-04T11:30:00Z", True, wh=13000, soc=55))
+    tracker.add_sample("VIN1", _ev("2026-01-04T12:30:00Z", False, wh=16000, soc=70))
+
+    assert not tracker.is_active("VIN1")
+    session = tracker.session("VIN1")
+    assert session["energy_wh"] == 6000
+    assert session["duration_sec"] == 2 * 3600
+    assert session["average_kw"] == pytest.approx(3.0)
+    assert (session["soc_start"], session["soc_end"]) == (40, 70)
+    assert tracker.total_energy_wh("VIN1") == 6000
+
+
+def test_gids_fallback_and_unplug_ends_session():
+    tracker = charging_mod.ChargingSessionTracker()
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:00:00Z", True, gids=100, quick=True))
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:20:00Z", True, gids=120, quick=True))
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:30:00Z", True, gids=130, plugged=False))
+
+    session = tracker.session("VIN1")
+    assert not tracker.is_active("VIN1")
+    assert session["energy_wh"] == pytest.approx(30 * charging_mod.WH_PER_GID)
+    assert session["quick_charge"] is True
+
+    # a new session starts from zero while the total keeps growing
+    tracker.add_sample("VIN1", _ev("2026-01-04T11:00:00Z", True, gids=130))
+    tracker.add_sample("VIN1", _ev("2026-01-04T11:10:00Z", True, gids=140))
+    assert tracker.session("VIN1")["energy_wh"] == pytest.approx(10 * charging_mod.WH_PER_GID)
+    assert tracker.total_energy_wh("VIN1") == pytest.approx(40 * charging_mod.WH_PER_GID)
+
+
+class FakeStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.saved = None
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.saved = data_func()
+
+
+@pytest.mark.asyncio
+async def test_total_survives_restart_and_counts_energy_into_first_charging_sample():
+    store = FakeStore()
+    tracker = charging_mod.ChargingSessionTracker(store)
+    tracker.update([{"vin": "VIN1", "ev_info": _ev("2026-01-04T10:00:00Z", False, wh=10000)}])
+    # the car reports charging for the first time with energy already added
+    tracker.update([{"vin": "VIN1", "ev_info": _ev("2026-01-04T10:30:00Z", True, wh=11000)}])
+    assert tracker.session("VIN1")["energy_wh"] == 1000
+    assert store.saved == {"VIN1": {"total_wh": 1000, "last_wh": 11000}}
+
+    store.data = store.saved
+    restarted = charging_mod.ChargingSessionTracker(store)
+    await restarted.async_load()
+    assert restarted.total_energy_wh("VIN1") == 1000
+    restarted.update([{"vin": "VIN1", "ev_info": _ev("2026-01-04T11:00:00Z", True, wh=12500)}])
+    assert restarted.total_energy_wh("VIN1") == 2500
+
+
+@pytest.mark.asyncio
+async def test_charging_sensors_have_statistics_state_class():
+    tracker = charging_mod.ChargingSessionTracker()
+    tracker.add_sample("VIN1", _ev("2026-01-04T10:00:00Z", True, wh=1000))
+    tracker.add_sample("VIN1", _ev("2026-01-04T11:00:00Z", True, wh=4500))
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "charging": tracker,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    energy = next(x for x in added if x.unique_id == "ha_opencarwings_charge_energy_VIN1")
+    power = next(x for x in added if x.unique_id == "ha_opencarwings_charge_average_power_VIN1")
+    total = next(x for x in added if x.unique_id == "ha_opencarwings_charge_total_energy_VIN1")
+    assert energy.native_value == 3.5
+    assert power.native_value == 3.5
+    assert total.native_value == 3.5
+    assert energy._attr_state_class == "total_increasing"
+    assert power._attr_state_class == "measurement"
+    assert energy.extra_state_attributes["session_active"] is True
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta, timezone
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings.commands import CommandTracker
+from custom_components.ha_opencarwings.details import DetailCache
+from custom_components.ha_opencarwings.sensor import CarCommandLatencySensor, CarLastCommandSensor
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+T0 = datetime(2026, 1, 4, 12, 0, tzinfo=timezone.utc)
+
+
+def _ts(dt):
+    return dt.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _car(requested_at, requested=False, connected=None, result_display="Success", command_type=3):
+    return {
+        "vin": "VIN1",
+        "command_type": command_type,
+        "command_request_time": _ts(requested_at),
+        "command_requested": requested,
+        "command_result": 1 if not requested else 0,
+        "command_result_display": result_display,
+        "last_connection": _ts(connected) if connected else None,
+    }
+
+
+def test_sent_command_is_pending_until_reported_done():
+    tracker = CommandTracker()
+    # first sight of an old command: status only, no latency sample
+    tracker.update([_car(T0 - timedelta(days=1), connected=T0 - timedelta(days=1))], now=T0)
+    assert not tracker.is_pending("VIN1")
+    assert tracker.status("VIN1")["last_latency"] is None
+
+    tracker.record_sent("VIN1", 4, now=T0)
+    assert tracker.pending_vins() == ["VIN1"]
+    assert tracker.status("VIN1")["command"] == "A/C off"
+
+    tracker.update([_car(T0, requested=True, command_type=4)], now=T0 + timedelta(seconds=30))
+    assert tracker.is_pending("VIN1")
+    done = T0 + timedelta(seconds=75)
+    tracker.update([_car(T0, connected=done, command_type=4)], now=T0 + timedelta(minutes=2))
+    assert not tracker.is_pending("VIN1")
+    assert tracker.status("VIN1")["last_latency"] == 75
+    assert tracker.status("VIN1")["result_display"] == "Success"
+
+
+def test_latency_percentiles_over_recent_commands():
+    tracker = CommandTracker()
+    tracker.update([_car(T0)], now=T0)
+    start = T0
+    for seconds in (40, 60, 80, 300):
+        start += timedelta(hours=1)
+        tracker.update([_car(start, connected=start + timedelta(seconds=seconds))], now=start + timedelta(hours=0.5))
+    assert tracker.latency("VIN1", 50) == 60
+    assert tracker.latency("VIN1", 95) == 300
+
+    # a command without a usable connection time is measured up to the poll
+    start += timedelta(hours=1)
+    tracker.update([_car(start)], now=start + timedelta(seconds=90))
+    assert tracker.status("VIN1")["last_latency"] == 90
+    assert tracker.status("VIN1")["latency_samples"] == 5
+
+
+def test_command_sensors_report_status_and_latency():
+    tracker = CommandTracker()
+    tracker.update([_car(T0)], now=T0)
+    coordinator = type("C", (), {"data": [_car(T0)], "stale_cache": None})()
+    status = CarLastCommandSensor(coordinator, "e1", "VIN1", tracker)
+    p95 = CarCommandLatencySensor(coordinator, "e1", "VIN1", tracker, "p95")
+    assert status.native_value == "Success"
+    assert p95.native_value is None
+
+    tracker.record_sent("VIN1", 2)
+    assert status.native_value == "pending"
+    assert status.extra_state_attributes["command"] == "Charge start"
+
+
+def test_pending_command_forces_detail_fetch():
+    tracker = CommandTracker()
+    cache = DetailCache(None, None, static_refresh_min=60)
+    cache.force_due = tracker.is_pending
+    listed = {"vin": "VIN1", "last_connection": "t1"}
+    cache.is_due(listed)
+    cache.resolve([listed], ["VIN1"], [{"vin": "VIN1"}])
+    assert not cache.is_due(listed)
+
+    tracker.record_sent("VIN1", 1)
+    assert cache.is_due(listed)
+
+
+@pytest.mark.asyncio
+async def test_switch_records_sent_command(monkeypatch):
+    from custom_components.ha_opencarwings import switch as switch_mod
+
+    class Client:
+        async def async_request(self, method, path, **kwargs):
+            return type("R", (), {"status": 200})()
+
+    tracker = CommandTracker()
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"client": Client(), "commands": tracker}}}})()
+    sw = switch_mod.CarACSwitch("e1", {"vin": "VIN1"})
+    sw.hass = hass
+    await sw.async_turn_on()
+    assert tracker.is_pending("VIN1")
+    assert tracker.status("VIN1")["command_type"] == 3
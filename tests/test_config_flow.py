@@ -1,4 +1,5 @@
 import pytest
+import voluptuous as vol
 
 from custom_components.ha_opencarwings.config_flow import OpenCARWINGSConfigFlow
 from custom_components.ha_opencarwings import config_flow as cfg
@@ -49,3 +50,129 @@ async def test_config_flow_auth_failure(monkeypatch):
     # On auth failure, the form is shown with errors
     assert result["type"] == "form"
     assert "base" in result.get("errors", {})
+
+
+class ProbeClient:
+    probes = 0
+    instances = 0
+
+    def __init__(self, hass=None, base_url=None):
+        self.base_url = base_url
+        ProbeClient.instances += 1
+
+    async def async_check_connection(self):
+        ProbeClient.probes += 1
+        if "down" in self.base_url:
+            raise cfg.RequestError("unreachable")
+        return 1500.0
+
+    async def async_obtain_token(self, username, password):
+        if username == "good":
+            return {"access": "ax", "refresh": "rx"}
+        raise cfg.AuthenticationError("auth")
+
+
+@pytest.fixture
+def probe_client(monkeypatch):
+    ProbeClient.probes = 0
+    ProbeClient.instances = 0
+    monkeypatch.setattr(cfg, "OpenCarWingsAPI", ProbeClient)
+    return ProbeClient
+
+
+@pytest.mark.asyncio
+async def test_config_flow_unreachable_url_skips_token_exchange(probe_client):
+    flow = OpenCARWINGSConfigFlow()
+    result = await flow.async_step_user({"username": "good", "password": "p", "api_base_url": "https://down.example"})
+
+    assert result["type"] == "form"
+    assert result["errors"] == {"api_base_url": "cannot_connect"}
+
+
+@pytest.mark.asyncio
+async def test_config_flow_probe_cached_and_latency_recorded(probe_client):
+    flow = OpenCARWINGSConfigFlow()
+    url = "https://slow.example"
+    result = await flow.async_step_user({"username": "bad", "password": "p", "api_base_url": url})
+    assert result["errors"] == {"base": "auth"}
+
+    result = await flow.async_step_user({"username": "good", "password": "p", "api_base_url": url, "scan_interval": 15})
+
+    assert result["type"] == "create_entry"
+    assert probe_client.probes == 1
+    assert probe_client.instances == 1
+    assert result["data"]["api_latency_ms"] == 1500
+    # slow server: default scan interval raised, fewer parallel requests
+    assert result["data"]["scan_interval"] == 30
+    assert result["data"]["max_concurrent_requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_options_flow_validates_changed_base_url(probe_client):
+    entry = type("E", (), {"options": {}, "data": {"api_base_url": "https://ok.example", "scan_interval": 15}})()
+    flow = cfg.OptionsFlowHandler(entry)
+
+    result = await flow.async_step_init({"scan_interval": 5, "api_base_url": "https://down.example", "max_concurrent_requests": 2})
+    assert result["type"] == "form"
+    assert result["errors"] == {"api_base_url": "cannot_connect"}
+
+    result = await flow.async_step_init({"scan_interval": 5, "api_base_url": "https://ok.example", "max_concurrent_requests": 2})
+    assert result["type"] == "create_entry"
+    assert result["data"]["max_concurrent_requests"] == 2
+
+
+@pytest.mark.asyncio
+async def test_options_form_exposes_tuning_options():
+    entry = type("E", (), {"options": {}, "data": {"scan_interval": 15}})()
+    result = await cfg.OptionsFlowHandler(entry).async_step_init()
+    schema = result["data_schema"]
+    defaults = {str(key): key.default() for key in schema.schema if key.default is not vol.UNDEFINED}
+    assert defaults["alerts_scan_interval"] == 5
+    assert defaults["probe_interval_running"] == 60
+    assert defaults["stream_car_list"] is True
+    # unset: the fleet default applies (fleet.py)
+    assert "max_requests_per_minute" not in defaults
+    assert defaults["static_refresh_interval"] == 60
+    assert defaults["detail_retry_interval"] == 60
+    assert defaults["hedge_budget_pct"] == 0
+    assert defaults["watch_interval"] == 0
+    assert defaults["json_offload_bytes"] == 64 * 1024
+    assert (defaults["response_cache"], defaults["persist_car_detail"]) == (True, False)
+
+    validated = schema({
+        "scan_interval": 15,
+        "api_base_url": "https://ok.example",
+        "max_concurrent_requests": "4",
+        "max_staleness": "120",
+        "static_refresh_interval": "30",
+        "detail_retry_interval": "0",
+        "hedge_budget_pct": "5",
+        "watch_interval": "60",
+        "json_offload_bytes": "32768",
+        "alerts_scan_interval": "2",
+        "probe_interval_running": "0",
+        "stream_car_list": False,
+        "response_cache": True,
+        "persist_car_detail": False,
+    })
+    assert validated["static_refresh_interval"] == 30
+    assert validated["detail_retry_interval"] == 0
+    assert validated["hedge_budget_pct"] == 5
+    assert validated["watch_interval"] == 60
+    assert validated["json_offload_bytes"] == 32768
+    assert validated["alerts_scan_interval"] == 2
+    assert validated["probe_interval_running"] == 0
+    assert validated["stream_car_list"] is False
+    with pytest.raises(vol.Invalid):
+        schema({**validated, "hedge_budget_pct": 150})
+    with pytest.raises(vol.Invalid):
+        schema({**validated, "json_offload_bytes": 10})
+    assert schema({**validated, "max_requests_per_minute": "30"})["max_requests_per_minute"] == 30
+
+
+@pytest.mark.asyncio
+async def test_clearing_the_request_budget_restores_the_default():
+    entry = type("E", (), {"options": {"max_requests_per_minute": 30}, "data": {}})()
+    flow = cfg.OptionsFlowHandler(entry)
+    result = await flow.async_step_init({"api_base_url": cfg.DEFAULT_API_BASE_URL, "scan_interval": 15})
+    assert "max_requests_per_minute" not in result["data"]
@@ -0,0 +1,105 @@
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings.api import RequestError
+from custom_components.ha_opencarwings.details import DetailCache
+
+
+class FlakyDetailClient:
+    def __init__(self):
+        self.failing = set()
+        self.calls = []
+
+    async def async_get_car_by_vin(self, vin):
+        self.calls.append(vin)
+        if vin in self.failing:
+            raise RequestError("timeout")
+        return {"vin": vin, "odometer": 1000, "ev_info": {"soc": 40}}
+
+
+class FakeCoordinator:
+    def __init__(self, data):
+        self.data = data
+        self.published = []
+
+    def async_set_updated_data(self, data):
+        self.data = data
+        self.published.append(data)
+
+
+def _listed(vin, soc):
+    return {"vin": vin, "ev_info": {"soc": soc}}
+
+
+@pytest.mark.asyncio
+async def test_failed_detail_keeps_last_good_under_fresh_list_entry():
+    client = FlakyDetailClient()
+    cache = DetailCache(None, client)
+    cars = [_listed("VIN1", 40), _listed("VIN2", 60)]
+    await cache.async_fetch(cars, ["VIN1", "VIN2"])
+
+    client.failing = {"VIN2"}
+    cars = [_listed("VIN1", 41), _listed("VIN2", 70)]
+    details = await cache.async_fetch(cars, ["VIN1", "VIN2"])
+    await cache.async_fetch(cars, ["VIN1", "VIN2"])
+
+    # list data is fresher than the cached detail, the detail fills odometer
+    assert details[1] == {"vin": "VIN2", "odometer": 1000, "ev_info": {"soc": 70}}
+    assert cache.failing_vins() == ["VIN2"]
+    assert cache.streak("VIN2") == 2 and cache.streak("VIN1") == 0
+    attrs = cache.attributes("VIN2")
+    assert attrs["total_failures"] == 2
+    assert attrs["last_error"] == "timeout"
+    assert attrs["serving_last_good"] is True
+
+
+@pytest.mark.asyncio
+async def test_failure_without_previous_detail_is_passed_through():
+    client = FlakyDetailClient()
+    client.failing = {"VIN1"}
+    cache = DetailCache(None, client)
+    details = await cache.async_fetch([_listed("VIN1", 40)], ["VIN1"])
+    assert isinstance(details[0], RequestError)
+    assert cache.attributes("VIN1")["serving_last_good"] is False
+
+
+@pytest.mark.asyncio
+async def test_retry_fetches_only_failing_vins():
+    client = FlakyDetailClient()
+    client.failing = {"VIN2"}
+    coord = FakeCoordinator([_listed("VIN1", 40), _listed("VIN2", 60)])
+    processed = []
+
+    async def _process(cars):
+        processed.append(cars)
+
+    cache = DetailCache(None, client, coordinator=coord, process=_process)
+    await cache.async_fetch(coord.data, ["VIN1", "VIN2"])
+    client.calls.clear()
+
+    assert await cache.async_retry_failed() == []
+    client.failing = set()
+    assert await cache.async_retry_failed() == ["VIN2"]
+    assert client.calls == ["VIN2", "VIN2"]
+    assert coord.data[1]["odometer"] == 1000
+    assert processed == [coord.data]
+    # nothing left to retry
+    assert await cache.async_retry_failed() == []
+    assert client.calls == ["VIN2", "VIN2"]
+
+
+@pytest.mark.asyncio
+async def test_detail_failures_sensor():
+    client = FlakyDetailClient()
+    client.failing = {"VIN1"}
+    cache = DetailCache(None, client)
+    coord = FakeCoordinator([_listed("VIN1", 40)])
+    await cache.async_fetch(coord.data, ["VIN1"])
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"coordinator": coord, "details": cache}}}})()
+    entry = type("E", (), {"entry_id": "e1"})()
+
+    added = []
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+    sensor = next(e for e in added if e.unique_id == "ha_opencarwings_detail_failures_VIN1")
+    assert sensor.native_value == 1
+    assert sensor.extra_state_attributes["total_failures"] == 1
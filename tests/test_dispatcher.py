@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings.dispatcher import CarUpdateDispatcher
+
+
+class FakeCoordinator:
+    def __init__(self, data):
+        self.data = data
+        self._listeners = []
+
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def notify(self):
+        for listener in list(self._listeners):
+            listener()
+
+
+class Recorder:
+    def __init__(self):
+        self.writes = 0
+
+    def async_write_ha_state(self):
+        self.writes += 1
+
+
+@pytest.mark.asyncio
+async def test_updates_in_one_iteration_are_written_once():
+    coord = FakeCoordinator([{"vin": "VIN1"}])
+    dispatcher = CarUpdateDispatcher(None, coord)
+    entities = [Recorder() for _ in range(5)]
+    removers = [dispatcher.async_register("VIN1", e) for e in entities]
+
+    assert len(coord._listeners) == 1
+
+    coord.notify()
+    coord.notify()
+    assert all(e.writes == 0 for e in entities)
+    await asyncio.sleep(0)
+    assert [e.writes for e in entities] == [1] * 5
+
+    for remove in removers:
+        remove()
+    assert coord._listeners == []
+
+
+def test_snapshot_indexed_once_per_data_object():
+    seed = {"vin": "VIN1", "odometer": 10}
+    coord = FakeCoordinator([{"vin": "VIN1", "ev_info": {"soc": 50}}, {"vin": "VIN2"}])
+    dispatcher = CarUpdateDispatcher(None, coord)
+
+    car = dispatcher.car("VIN1", seed)
+    assert car == {"vin": "VIN1", "odometer": 10, "ev_info": {"soc": 50}}
+    assert dispatcher.car("VIN1", seed) is car
+    assert dispatcher.version == 1
+
+    coord.data = [{"vin": "VIN1", "ev_info": {"soc": 60}}]
+    assert dispatcher.car("VIN1", seed)["ev_info"]["soc"] == 60
+    assert dispatcher.car("VIN2", {"vin": "VIN2", "nickname": "seed"}) == {"vin": "VIN2", "nickname": "seed"}
+    assert dispatcher.version == 2
+
+
+@pytest.mark.asyncio
+async def test_car_sensors_share_the_dispatcher_listener():
+    coord = FakeCoordinator([{"vin": "VIN1", "ev_info": {"soc": 70}}])
+    dispatcher = CarUpdateDispatcher(None, coord)
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"coordinator": coord, "dispatcher": dispatcher}}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    car_entities = [e for e in added if isinstance(e, sensor_mod.OpenCarwingsCarEntity)]
+    for entity in car_entities:
+        await entity.async_added_to_hass()
+
+    assert len(coord._listeners) == 1
+    assert dispatcher.entity_count == len(car_entities)
+
+    soc = next(x for x in added if x.unique_id == "ha_opencarwings_soc_VIN1")
+    coord.data = [{"vin": "VIN1", "ev_info": {"soc": 80}}]
+    coord.notify()
+    assert soc.native_value == 80
+
+
+@pytest.mark.asyncio
+async def test_car_sensor_is_written_once_per_update():
+    coord = FakeCoordinator([{"vin": "VIN1", "ev_info": {"soc": 70}}])
+    dispatcher = CarUpdateDispatcher(None, coord)
+    spec = sensor_mod.CAR_SENSORS[0]
+    entity = sensor_mod.CarValueSensor(coord, "e1", "VIN1", spec)
+    entity._dispatcher = dispatcher
+    writes = []
+    entity.async_write_ha_state = lambda: writes.append(1)
+    await entity.async_added_to_hass()
+
+    # the coordinator's listeners only include the dispatcher, and a direct
+    # coordinator callback doesn't write on its own
+    assert coord._listeners == [dispatcher._handle_coordinator_update]
+    entity._handle_coordinator_update()
+    coord.notify()
+    await asyncio.sleep(0)
+    assert len(writes) == 1
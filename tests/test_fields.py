@@ -0,0 +1,96 @@
+import json
+
+import pytest
+
+from custom_components.ha_opencarwings import api
+from custom_components.ha_opencarwings import diagnostics
+from custom_components.ha_opencarwings import fields
+
+
+DETAIL = {
+    "vin": "VIN1",
+    "nickname": "MyCar",
+    "odometer": 1234,
+    "ev_info": {"soc": 80, "range_acon": 100, "internal_counter": 7},
+    "location": {"lat": 1.0, "lon": 2.0, "home": True},
+    "route_plans": [{"points": [[0, 0]] * 100}],
+    "tcu_configuration": {"dial_code": "x", "apn_password": "apn-secret"},
+    "tcu_pass": "tcu-secret",
+}
+
+
+class RawResponse:
+    status = 200
+
+    def __init__(self, body):
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+
+class RawSession:
+    async def request(self, method, url, headers=None, **kwargs):
+        return RawResponse(json.dumps(DETAIL).encode())
+
+
+def test_build_projection_whole_subtree_wins():
+    tree = fields.build_projection(["ev_info.soc", "location", "location.lat", "ev_info.range_acon"])
+    assert tree == {"ev_info": {"soc": True, "range_acon": True}, "location": True}
+
+    out = fields.project(DETAIL, tree)
+    assert out == {"ev_info": {"soc": 80, "range_acon": 100}, "location": DETAIL["location"]}
+
+
+def test_car_fields_cover_platform_specs():
+    paths = fields.car_field_paths()
+    for path in ("vin", "nickname", "odometer", "ev_info.soc", "ev_info.range_acoff", "location", "timer_commands"):
+        assert path in paths
+    assert "route_plans" not in paths
+
+
+@pytest.mark.asyncio
+async def test_detail_projected_after_decode_unless_full(monkeypatch):
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: RawSession(),
+    )
+    client = api.OpenCarWingsAPI(hass=None)
+    client.car_projection = fields.car_projection()
+
+    detail = await client.async_get_car_by_vin("VIN1")
+    assert "route_plans" not in detail and "tcu_configuration" not in detail
+    assert detail["ev_info"] == {"soc": 80, "range_acon": 100}
+    assert detail["odometer"] == 1234
+
+    full = await client.async_get_car_by_vin("VIN1", full=True)
+    assert full == DETAIL
+
+
+@pytest.mark.asyncio
+async def test_diagnostics_fetch_full_detail_and_redact(monkeypatch):
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: RawSession(),
+    )
+    client = api.OpenCarWingsAPI(hass=None)
+    client.car_projection = fields.car_projection()
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"client": client, "cars": [{"vin": "VIN1"}]}}}})()
+    entry = type("E", (), {"entry_id": "e1", "data": {"access_token": "secret", "api_base_url": "x"}, "options": {}})()
+
+    diag = await diagnostics.async_get_config_entry_diagnostics(hass, entry)
+
+    assert diag["entry"]["access_token"] == "**REDACTED**"
+    full = diag["car_details"]["VIN1"]
+    # the full detail is there, minus credentials and positions
+    assert full["odometer"] == 1234 and full["tcu_configuration"]["dial_code"] == "x"
+    assert full["route_plans"] == "**REDACTED**"
+    assert full["tcu_pass"] == full["tcu_configuration"]["apn_password"] == "**REDACTED**"
+    assert full["location"] == {"lat": "**REDACTED**", "lon": "**REDACTED**", "home": True}
+    assert "ev_info.soc" in diag["projected_fields"]
+    assert fields.projection_paths(fields.build_projection(["vin", "ev_info.soc", "location"])) == [
+        "ev_info.soc",
+        "location",
+        "vin",
+    ]
@@ -0,0 +1,185 @@
+import asyncio
+from datetime import timedelta
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings.fleet import (
+    PRIORITY_ACTIVE,
+    PRIORITY_NORMAL,
+    FleetScheduler,
+    RequestBudget,
+)
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeCoordinator:
+    def __init__(self, cars=None):
+        self.data = cars or []
+        self.refreshes = 0
+
+    async def async_refresh(self):
+        self.refreshes += 1
+
+
+def _car(vin, charging=False):
+    return {"vin": vin, "ev_info": {"charging": charging, "car_running": False}}
+
+
+def test_polls_spread_evenly_and_keep_their_phase():
+    clock = Clock()
+    fleet = FleetScheduler(None, clock=clock)
+    for entry_id in ("a", "b", "c"):
+        fleet.async_register(entry_id, FakeCoordinator(), timedelta(minutes=15), 60)
+        fleet.refreshed(entry_id)
+
+    # 900 s interval, three entries: one poll every 300 s
+    assert [fleet.next_due(e) - 1000 for e in ("a", "b", "c")] == [900, 1200, 600]
+    # a manual refresh in between doesn't shift the entry off its slot
+    clock.now += 700
+    fleet.refreshed("c")
+    assert fleet.next_due("c") - 1000 == 1500
+
+    fleet.async_unregister("b")
+    assert fleet.next_due("c") - 1000 == 1350
+    assert len(fleet) == 2
+
+
+def test_default_budget_applies_only_to_several_entries():
+    fleet = FleetScheduler(None)
+    fleet.async_register("a", FakeCoordinator(), timedelta(minutes=15))
+    assert fleet.budget.per_minute == 0
+    fleet.async_register("b", FakeCoordinator(), timedelta(minutes=15))
+    assert fleet.budget.per_minute == 60
+    # an explicit 0 lifts the limit for that entry only
+    fleet.async_register("c", FakeCoordinator(), timedelta(minutes=15), 0)
+    assert fleet.budget.per_minute == 60
+    fleet.async_unregister("b")
+    fleet.async_unregister("c")
+    assert fleet.budget.per_minute == 0
+
+
+@pytest.mark.asyncio
+async def test_due_entries_with_active_cars_refresh_first():
+    clock = Clock()
+    fleet = FleetScheduler(None, clock=clock)
+    idle, active = FakeCoordinator([_car("V1")]), FakeCoordinator([_car("V2", charging=True)])
+    fleet.async_register("idle", idle, timedelta(minutes=1), 60)
+    fleet.async_register("active", active, timedelta(minutes=1), 60)
+    fleet.refreshed("idle")
+    fleet.refreshed("active")
+
+    assert await fleet.async_tick() == []
+    clock.now += 120
+    assert await fleet.async_tick() == ["active", "idle"]
+    assert (idle.refreshes, active.refreshes) == (1, 1)
+    assert fleet.stats()["entries"]["active"]["active_cars"] is True
+
+
+@pytest.mark.asyncio
+async def test_budget_serves_active_requests_first():
+    budget = RequestBudget(1200)  # 20 tokens per second
+    budget._tokens = 0
+    order = []
+
+    async def request(name, priority):
+        await budget.async_acquire(priority)
+        order.append(name)
+
+    await asyncio.gather(request("normal", PRIORITY_NORMAL), request("active", PRIORITY_ACTIVE))
+    assert order == ["active", "normal"]
+    assert budget.waited == 2
+
+    unlimited = RequestBudget(0)
+    await asyncio.wait_for(asyncio.gather(*(unlimited.async_acquire() for _ in range(100))), 1)
+
+
+@pytest.mark.asyncio
+async def test_lifting_the_budget_releases_queued_requests():
+    budget = RequestBudget(1)  # one request per minute
+    budget._tokens = 0
+    waiters = [asyncio.ensure_future(budget.async_acquire()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert budget.queued == 3
+
+    budget.set_rate(0)
+    await asyncio.wait_for(asyncio.gather(*waiters), 1)
+    assert budget.queued == 0 and budget._wake_handle is None
+
+
+@pytest.mark.asyncio
+async def test_entries_share_one_scheduler_and_budget(monkeypatch):
+    class Client:
+        def __init__(self, hass=None, base_url=None):
+            self.request_budget = None
+
+        def set_tokens(self, access, refresh):
+            pass
+
+        async def async_get_cars(self):
+            return [_car("VIN1")]
+
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", Client)
+
+    async def _forward(entry, platforms):
+        return None
+
+    async def _unload(entry, platforms):
+        return True
+
+    config_entries = type(
+        "C",
+        (),
+        {"async_forward_entry_setups": staticmethod(_forward), "async_unload_platforms": staticmethod(_unload)},
+    )()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries})()
+    entries = [
+        type("E", (), {"entry_id": entry_id, "data": {}, "options": opts, "title": "t"})()
+        for entry_id, opts in (("e1", {}), ("e2", {"max_requests_per_minute": 30}))
+    ]
+    for entry in entries:
+        assert await module_init.async_setup_entry(hass, entry)
+
+    domain = hass.data["ha_opencarwings"]
+    fleet = domain["fleet"]
+    assert domain["e1"]["client"].request_budget is domain["e2"]["client"].request_budget is fleet.budget
+    # the strictest configured budget applies to all entries
+    assert fleet.budget.per_minute == 30
+
+    await module_init.async_unload_entry(hass, entries[1])
+    # a single account without a configured budget is not throttled
+    assert fleet.budget.per_minute == 0
+    await module_init.async_unload_entry(hass, entries[0])
+    assert "fleet" not in domain
+
+
+@pytest.mark.asyncio
+async def test_entry_failing_authentication_leaves_the_fleet(monkeypatch):
+    class Client:
+        def __init__(self, hass=None, base_url=None):
+            self.request_budget = None
+
+        def set_tokens(self, access, refresh):
+            pass
+
+        async def async_get_cars(self):
+            raise module_init.AuthenticationError("expired")
+
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", Client)
+    reauth = []
+    config_entries = type("C", (), {"async_start_reauth": staticmethod(reauth.append)})()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries})()
+    entry = type("E", (), {"entry_id": "e1", "data": {}, "options": {}, "title": "t"})()
+
+    assert await module_init.async_setup_entry(hass, entry) is False
+    assert reauth == ["e1"]
+    assert "fleet" not in hass.data["ha_opencarwings"]
@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from custom_components.ha_opencarwings import api
+from custom_components.ha_opencarwings.util import LatencyWindow
+
+
+class MockResponse:
+    def __init__(self, vin):
+        self.status = 200
+        self._json = {"vin": vin}
+
+    async def json(self):
+        return self._json
+
+
+class DelaySession:
+    """Answers car detail requests after the next queued delay (seconds)."""
+
+    def __init__(self, delays):
+        self.delays = list(delays)
+        self.calls = 0
+
+    async def request(self, method, url, headers=None, **kwargs):
+        self.calls += 1
+        await asyncio.sleep(self.delays.pop(0) if self.delays else 0)
+        return MockResponse(url.rstrip("/").rsplit("/", 1)[-1])
+
+
+def _client(monkeypatch, session, budget_pct):
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: session,
+    )
+    client = api.OpenCarWingsAPI(hass=None)
+    client.set_hedging(budget_pct)
+    # a warmed-up latency history with p95 of 10 ms
+    client.detail_latency = LatencyWindow(min_samples=1)
+    for _ in range(20):
+        client.detail_latency.add(10)
+    return client
+
+
+def test_latency_window_percentiles():
+    window = LatencyWindow(size=10, min_samples=5)
+    for ms in range(1, 5):
+        window.add(ms)
+    assert window.percentile(95) is None
+    for ms in range(5, 21):
+        window.add(ms)  # only the last 10 samples (11..20) are kept
+    assert len(window) == 10
+    assert window.percentile(50) == 15
+    assert window.percentile(95) == 20
+
+
+@pytest.mark.asyncio
+async def test_slow_detail_request_is_hedged(monkeypatch):
+    session = DelaySession([1.0, 0])
+    client = _client(monkeypatch, session, budget_pct=100)
+
+    assert await asyncio.wait_for(client.async_get_car_by_vin("VIN1"), 0.5) == {"vin": "VIN1"}
+    assert session.calls == 2
+    assert (client.hedged_requests, client.hedge_wins) == (1, 1)
+
+
+@pytest.mark.asyncio
+async def test_hedging_stays_within_budget(monkeypatch):
+    session = DelaySession([0.05] * 20)
+    client = _client(monkeypatch, session, budget_pct=10)
+
+    await asyncio.gather(*(client.async_get_car_by_vin(f"VIN{i}") for i in range(10)))
+    # 10 requests at 10% earn a single hedge
+    assert client.detail_requests == 10
+    assert client.hedged_requests == 1
+    assert session.calls == 11
+
+
+@pytest.mark.asyncio
+async def test_fast_requests_and_disabled_hedging_send_once(monkeypatch):
+    session = DelaySession([0.05])
+    client = _client(monkeypatch, session, budget_pct=0)
+    await client.async_get_car_by_vin("VIN1")
+
+    client.set_hedging(100)
+    await client.async_get_car_by_vin("VIN2")
+    assert session.calls == 2
+    assert client.hedged_requests == 0
@@ -0,0 +1,88 @@
+import json
+
+import pytest
+
+from custom_components.ha_opencarwings import api
+from custom_components.ha_opencarwings import _merge_car_details
+
+
+class RawResponse:
+    def __init__(self, body: bytes, status=200):
+        self.status = status
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+
+class RawSession:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def request(self, method, url, headers=None, **kwargs):
+        return RawResponse(self.body)
+
+
+class ExecutorHass:
+    def __init__(self):
+        self.jobs = []
+
+    async def async_add_executor_job(self, func, *args):
+        self.jobs.append(func)
+        return func(*args)
+
+
+def _client(monkeypatch, body: bytes, hass=None):
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: RawSession(body),
+    )
+    return api.OpenCarWingsAPI(hass=hass)
+
+
+@pytest.mark.asyncio
+async def test_small_payload_decoded_inline(monkeypatch):
+    hass = ExecutorHass()
+    client = _client(monkeypatch, json.dumps([{"vin": "VIN1"}]).encode(), hass)
+
+    cars = await client.async_get_cars()
+
+    assert cars == [{"vin": "VIN1"}]
+    assert hass.jobs == []
+    assert client.bytes_decoded > 0
+
+
+@pytest.mark.asyncio
+async def test_large_payload_decoded_in_executor(monkeypatch):
+    hass = ExecutorHass()
+    body = json.dumps({"vin": "VIN1", "tcu_configuration": {"x": "y" * 1000}}).encode()
+    client = _client(monkeypatch, body, hass)
+    client.offload_threshold = 512
+
+    detail = await client.async_get_car_by_vin("VIN1")
+
+    assert detail["vin"] == "VIN1"
+    assert len(hass.jobs) == 1
+
+
+@pytest.mark.asyncio
+async def test_invalid_json_raises_request_error(monkeypatch):
+    client = _client(monkeypatch, b"<html>oops</html>")
+    with pytest.raises(api.RequestError):
+        await client.async_get_cars()
+
+
+def test_merge_car_details_detail_wins_and_keeps_order():
+    cars = [{"vin": "B", "nickname": "b"}, {"vin": "A", "nickname": "a"}, {"nickname": "no vin"}]
+    details = [{"vin": "A", "odometer": 10}, RuntimeError("boom"), {"vin": "B", "nickname": "bee"}]
+
+    merged = _merge_car_details(cars, details)
+
+    assert merged == [
+        {"vin": "B", "nickname": "bee"},
+        {"vin": "A", "nickname": "a", "odometer": 10},
+        {"nickname": "no vin"},
+    ]
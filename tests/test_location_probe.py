@@ -0,0 +1,83 @@
+import pytest
+
+from custom_components.ha_opencarwings import button as button_mod
+from custom_components.ha_opencarwings import device_tracker as tracker_mod
+from custom_components.ha_opencarwings import location as location_mod
+
+
+class ProbeClient:
+    def __init__(self, payload):
+        self.payload = payload
+        self.probed = []
+
+    async def async_probe_location(self, vin):
+        self.probed.append(vin)
+        return self.payload
+
+
+async def _setup_trackers(hass):
+    trackers = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await tracker_mod.async_setup_entry(hass, entry, trackers.extend)
+    return trackers
+
+
+def test_extract_location_formats():
+    assert location_mod.extract_location({"lat": "50.1", "lon": "20.1"}) == {"lat": "50.1", "lon": "20.1"}
+    assert location_mod.extract_location({"location": {"lat": "1", "lon": "2"}}) == {"lat": "1", "lon": "2"}
+    assert location_mod.extract_location({"message": "queued"}) is None
+    assert location_mod.extract_location(None) is None
+
+
+@pytest.mark.asyncio
+async def test_probe_updates_only_that_tracker():
+    client = ProbeClient({"location": {"lat": "52.0", "lon": "21.0", "last_updated": "2026-01-04T12:00:00Z"}})
+    prober = location_mod.LocationProber(None, client)
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [
+            {"vin": "VIN1", "last_location": {"lat": "50.0", "lon": "20.0"}},
+            {"vin": "VIN2", "location": {"lat": "40.0", "lon": "10.0"}},
+        ],
+        "location_prober": prober,
+    }}}})()
+    t1, t2 = await _setup_trackers(hass)
+
+    await prober.async_probe("VIN1")
+
+    assert client.probed == ["VIN1"]
+    assert (t1.latitude, t1.longitude) == (52.0, 21.0)
+    assert (t2.latitude, t2.longitude) == (40.0, 10.0)
+
+
+@pytest.mark.asyncio
+async def test_scheduled_probe_targets_running_cars_only():
+    client = ProbeClient({"lat": "1.0", "lon": "2.0"})
+    coord = type("C", (), {"data": [
+        {"vin": "VIN1", "ev_info": {"car_running": True}},
+        {"vin": "VIN2", "ev_info": {"car_running": False}},
+    ]})()
+    prober = location_mod.LocationProber(None, client, coord)
+
+    await prober._async_probe_running()
+
+    assert client.probed == ["VIN1"]
+
+
+@pytest.mark.asyncio
+async def test_location_probe_button():
+    client = ProbeClient({"lat": "1.0", "lon": "2.0"})
+    prober = location_mod.LocationProber(None, client)
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "coordinator": None,
+        "location_prober": prober,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await button_mod.async_setup_entry(hass, entry, added.extend)
+
+    btn = next(x for x in added if x.unique_id == "ha_opencarwings_car_locate_VIN1")
+    assert btn.name == "Refresh location for MyCar"
+    await btn.async_press()
+    assert client.probed == ["VIN1"]
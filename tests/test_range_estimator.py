@@ -0,0 +1,50 @@
+import pytest
+
+from custom_components.ha_opencarwings import range_estimator as range_mod
+from custom_components.ha_opencarwings import sensor as sensor_mod
+
+
+def test_learns_km_per_percent_with_ewma():
+    est = range_mod.RangeEstimator(alpha=0.5)
+    est.add_sample("VIN1", 1000, 80)
+    # 1% used: not enough to learn from yet
+    assert est.add_sample("VIN1", 1005, 79) is False
+    assert est.add_sample("VIN1", 1020, 76) is True
+    assert est.km_per_pct("VIN1") == pytest.approx(5.0)
+
+    assert est.add_sample("VIN1", 1050, 71) is True
+    assert est.km_per_pct("VIN1") == pytest.approx(5.5)
+    assert est.predict("VIN1", 50) == pytest.approx(275.0)
+    assert est.samples("VIN1") == 2
+
+
+def test_charging_resets_anchor_and_glitches_are_rejected():
+    est = range_mod.RangeEstimator()
+    est.add_sample("VIN1", 1000, 50)
+    # charged in between: no observation, new anchor
+    assert est.add_sample("VIN1", 1010, 90) is False
+    # implausible 100 km per percent
+    assert est.add_sample("VIN1", 1510, 85) is False
+    assert est.km_per_pct("VIN1") is None
+    assert est.predict("VIN1", 85) is None
+
+
+@pytest.mark.asyncio
+async def test_predicted_range_sensor():
+    est = range_mod.RangeEstimator()
+    est.update([{"vin": "VIN1", "odometer": 1000, "ev_info": {"soc": 80}}])
+    est.update([{"vin": "VIN1", "odometer": 1040, "ev_info": {"soc": 70}}])
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar", "odometer": 1040, "ev_info": {"soc": 70}}],
+        "range": est,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    sensor = next(x for x in added if x.unique_id == "ha_opencarwings_predicted_range_VIN1")
+    assert sensor.name == "MyCar Predicted Range"
+    assert sensor.native_value == 280.0
+    assert sensor.extra_state_attributes["km_per_percent"] == 4.0
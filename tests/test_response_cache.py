@@ -0,0 +1,127 @@
+import time
+
+import pytest
+
+from custom_components.ha_opencarwings import api
+from custom_components.ha_opencarwings.cache import ResponseCache
+
+
+class BodyResponse:
+    def __init__(self, body, status=200):
+        self.status = status
+        self._body = body
+
+    async def read(self):
+        return self._body
+
+    async def text(self):
+        return self._body.decode()
+
+
+class CountingSession:
+    def __init__(self):
+        self.calls = []
+
+    async def request(self, method, url, headers=None, **kwargs):
+        self.calls.append((method, url))
+        if "/api/alerts/" in url:
+            return BodyResponse(b"[]")
+        return BodyResponse(b'{"vin": "VIN1", "odometer": %d}' % len(self.calls))
+
+
+class FakeStore:
+    def __init__(self, data=None):
+        self.data = data
+        self.saved = None
+
+    async def async_load(self):
+        return self.data
+
+    def async_delay_save(self, data_func, delay):
+        self.saved = data_func()
+
+
+def _client(monkeypatch, cache):
+    session = CountingSession()
+    monkeypatch.setattr(
+        "homeassistant.helpers.aiohttp_client.async_get_clientsession",
+        lambda hass: session,
+    )
+    client = api.OpenCarWingsAPI(hass=None)
+    client.response_cache = cache
+    return client, session
+
+
+@pytest.mark.asyncio
+async def test_detail_is_served_from_cache_until_bypassed_or_written(monkeypatch):
+    client, session = _client(monkeypatch, ResponseCache())
+
+    first = await client.async_get_car_by_vin("VIN1")
+    assert await client.async_get_car_by_vin("VIN1") == first
+    assert (await client.async_get_car_by_vin("VIN1", full=True))["odometer"] == first["odometer"]
+    assert len(session.calls) == 1
+
+    # per-call bypass fetches (and re-caches) a fresh response
+    fresh = await client.async_get_car_by_vin("VIN1", cache=False)
+    assert fresh["odometer"] == 2
+    assert await client.async_get_car_by_vin("VIN1") == fresh
+
+    # a command for the car drops its cached responses
+    await client.async_request("POST", "/api/command/VIN1/", json={"command_type": 1})
+    assert (await client.async_get_car_by_vin("VIN1"))["odometer"] == 4
+
+    # endpoints without a TTL are never cached
+    await client.async_get_alerts("VIN1")
+    await client.async_get_alerts("VIN1")
+    stats = client.response_cache.stats()
+    assert (stats["hits"], stats["misses"], stats["bypasses"]) == (3, 2, 1)
+    assert len(session.calls) == 6
+
+
+def test_lru_evicts_least_recently_used_and_bounds_bytes():
+    cache = ResponseCache(max_entries=2, max_bytes=10)
+    cache.put("/api/car/A/", b"aaaa")
+    cache.put("/api/car/B/", b"bbbb")
+    assert cache.get("/api/car/A/") == b"aaaa"  # A is now most recent
+    cache.put("/api/car/C/", b"cccc")
+    assert cache.get("/api/car/B/") is None
+    cache.put("/api/car/D/", b"dddddddd")  # over max_bytes: evicts until it fits
+    assert cache.stats()["entries"] == 1
+    assert cache.stats()["evictions"] == 3
+    cache.put("/api/car/", b"[]")  # the car list is not cacheable
+    assert cache.get("/api/car/") is None
+
+
+@pytest.mark.asyncio
+async def test_cache_persists_fresh_timer_entries_only():
+    store = FakeStore()
+    cache = ResponseCache(store)
+    cache.put("/api/car/VIN1/timers/", b"[]")
+    # car detail bodies hold TCU/APN credentials: kept in memory, not on disk
+    cache.put("/api/car/VIN1/", b'{"vin": "VIN1", "tcu_pass": "secret"}')
+    assert cache.get("/api/car/VIN1/") is not None
+    assert list(store.saved["entries"]) == ["/api/car/VIN1/timers/"]
+
+    expired = time.time() - 1
+    store.data = {
+        "entries": {
+            **store.saved["entries"],
+            "/api/car/VIN2/timers/": [expired, "[]"],
+            # left behind by an older version
+            "/api/car/VIN1/": [time.time() + 30, '{"tcu_pass": "secret"}'],
+        }
+    }
+    store.saved = None
+    restored = ResponseCache(store)
+    await restored.async_load()
+    assert restored.get("/api/car/VIN1/timers/") == b"[]"
+    assert restored.get("/api/car/VIN2/timers/") is None
+    assert restored.get("/api/car/VIN1/") is None
+    assert list(store.saved["entries"]) == ["/api/car/VIN1/timers/"]
+
+
+def test_car_detail_persistence_is_opt_in():
+    store = FakeStore()
+    cache = ResponseCache(store, persist_car_detail=True)
+    cache.put("/api/car/VIN1/", b'{"vin": "VIN1"}')
+    assert list(store.saved["entries"]) == ["/api/car/VIN1/"]
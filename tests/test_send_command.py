@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+import voluptuous as vol
+
+from custom_components.ha_opencarwings.commands import CommandTracker, resolve_command_type
+from custom_components.ha_opencarwings.services import async_setup_services
+
+
+class ServicesStub:
+    def __init__(self):
+        self.handlers = {}
+
+    def async_register(self, domain, service, handler, schema=None, **kwargs):
+        self.handlers[service] = (handler, schema)
+
+    async def async_call(self, service, data):
+        handler, schema = self.handlers[service]
+        return await handler(type("Call", (), {"data": schema(data) if schema else data})())
+
+
+class Response:
+    def __init__(self, status, body=""):
+        self.status = status
+        self._body = body
+
+    async def text(self):
+        return self._body
+
+
+class Client:
+    def __init__(self, fail=(), statuses=None):
+        self.posts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail = fail
+        self.statuses = statuses or {}
+
+    async def async_request(self, method, path, **kwargs):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        vin = kwargs["json"]["vin"]
+        if vin in self.fail:
+            raise RuntimeError("car offline")
+        self.posts.append((method, path, kwargs["json"]))
+        return Response(*self.statuses.get(vin, (200,)))
+
+
+class Coordinator:
+    def __init__(self, vins):
+        self.data = [{"vin": vin} for vin in vins]
+        self.refreshes = 0
+
+    async def async_request_refresh(self):
+        self.refreshes += 1
+
+
+def _entry(vins, fail=(), statuses=None):
+    return {"client": Client(fail, statuses), "coordinator": Coordinator(vins), "commands": CommandTracker()}
+
+
+def test_command_type_by_number_or_name():
+    assert resolve_command_type(5) == 5
+    assert resolve_command_type("3") == 3
+    assert resolve_command_type("Read configuration") == 5
+    assert resolve_command_type("ac_off") == 4
+    for bad in ("No command", 0, 9, "warp", None):
+        with pytest.raises(ValueError):
+            resolve_command_type(bad)
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatches_concurrently_and_refreshes_each_entry_once():
+    e1, e2 = _entry(["VIN1", "VIN2"]), _entry(["VIN3"], fail=("VIN3",))
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": e1, "e2": e2}}, "services": ServicesStub()})()
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        "send_command", {"vin": ["VIN1", "VIN2", "VIN3", "NOPE"], "command_type": "A/C on"}
+    )
+    assert response == {"VIN1": "sent", "VIN2": "sent", "VIN3": "car offline", "NOPE": "unknown car"}
+    assert [json for _, _, json in e1["client"].posts] == [
+        {"vin": "VIN1", "command_type": 3},
+        {"vin": "VIN2", "command_type": 3},
+    ]
+    assert e1["client"].max_in_flight == 2
+    assert e1["commands"].pending_vins() == ["VIN1", "VIN2"]
+    # one coalesced refresh for the entry with sent commands, none for the failed one
+    assert (e1["coordinator"].refreshes, e2["coordinator"].refreshes) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_invalid_calls_are_rejected_and_send_nothing():
+    e1 = _entry(["VIN1"])
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": e1}}, "services": ServicesStub()})()
+    async_setup_services(hass)
+
+    for data in ({"vin": "VIN1", "command_type": "honk"}, {"vin": " , ", "command_type": 1}, {"command_type": 1}):
+        with pytest.raises(vol.Invalid):
+            await hass.services.async_call("send_command", data)
+    assert e1["client"].posts == []
+    assert e1["coordinator"].refreshes == 0
+
+
+@pytest.mark.asyncio
+async def test_entry_id_only_targets_its_own_cars():
+    e1, e2 = _entry(["VIN1"]), _entry(["VIN2"])
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": e1, "e2": e2}}, "services": ServicesStub()})()
+    async_setup_services(hass)
+
+    response = await hass.services.async_call(
+        "send_command", {"vin": "VIN1, VIN2, VIN9", "command_type": "ac_off", "entry_id": "e1"}
+    )
+    assert response == {"VIN1": "sent", "VIN2": "unknown car", "VIN9": "unknown car"}
+    assert [json["vin"] for _, _, json in e1["client"].posts] == ["VIN1"]
+    assert e2["client"].posts == []
+
+
+@pytest.mark.asyncio
+async def test_rejected_commands_report_the_error_and_are_not_pending():
+    e1 = _entry(
+        ["VIN1", "VIN2", "VIN3"],
+        statuses={"VIN1": (400, '{"command_type": ["invalid"]}'), "VIN2": (404, "Not found")},
+    )
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": e1}}, "services": ServicesStub()})()
+    async_setup_services(hass)
+
+    response = await hass.services.async_call("send_command", {"vin": ["VIN1", "VIN2", "VIN3"], "command_type": 1})
+    assert response["VIN1"] == 'Failed sending command: 400 {"command_type": ["invalid"]}'
+    assert response["VIN2"] == "Failed sending command: 404 Not found"
+    assert response["VIN3"] == "sent"
+    assert e1["commands"].pending_vins() == ["VIN3"]
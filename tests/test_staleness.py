@@ -0,0 +1,115 @@
+from datetime import datetime, timedelta, timezone
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings.api import RequestError
+from custom_components.ha_opencarwings.staleness import StaleDataCache
+from homeassistant.helpers.update_coordinator import UpdateFailed
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+T0 = datetime(2026, 1, 4, 12, 0, tzinfo=timezone.utc)
+
+
+class FlakyClient:
+    def __init__(self, hass=None, base_url=None):
+        self.fail = False
+
+    def set_tokens(self, access, refresh):
+        pass
+
+    async def async_get_cars(self):
+        if self.fail:
+            raise RequestError("server error 502")
+        return [{"vin": "VIN1", "ev_info": {"soc": 50}}]
+
+
+def _hass():
+    async def _forward(entry, platforms):
+        return None
+
+    config_entries = type("C", (), {"async_forward_entry_setups": staticmethod(_forward)})()
+    return type("H", (), {"data": {}, "config_entries": config_entries})()
+
+
+def test_serve_drops_expired_cars_and_backs_off():
+    cache = StaleDataCache(60, timedelta(minutes=15))
+    cache.record([{"vin": "VIN1"}, {"vin": "VIN2"}], now=T0)
+    cache.record([{"vin": "VIN1"}], now=T0)  # VIN2 no longer listed
+    assert cache.serve(RequestError("down"), now=T0 + timedelta(minutes=30)) == [{"vin": "VIN1"}]
+    assert cache.next_interval() == timedelta(minutes=30)
+    assert cache.attributes("VIN1", now=T0 + timedelta(minutes=30)) == {
+        "data_age": 1800,
+        "stale": True,
+        "refresh_failures": 1,
+    }
+
+    for _ in range(4):
+        cache.serve(RequestError("down"), now=T0 + timedelta(minutes=45))
+    assert cache.next_interval() == timedelta(minutes=120)  # capped at 8x
+
+    err = RequestError("still down")
+    with pytest.raises(RequestError):
+        cache.serve(err, now=T0 + timedelta(minutes=61))
+    assert cache.expired("VIN1", now=T0 + timedelta(minutes=61))
+
+
+def test_backoff_retries_when_the_served_data_expires():
+    cache = StaleDataCache(90, timedelta(minutes=60))
+    cache.record([{"vin": "VIN1"}], now=T0)
+    now = T0 + timedelta(minutes=60)
+    cache.serve(RequestError("down"), now=now)
+    # 2x backoff would be 120 min, but the data expires 30 min from now
+    assert cache.next_interval(now=now) == timedelta(minutes=30, seconds=1)
+    retry = now + cache.next_interval(now=now)
+    with pytest.raises(RequestError):
+        cache.serve(RequestError("still down"), now=retry)
+
+    unlimited = StaleDataCache(0, timedelta(minutes=60))
+    unlimited.record([{"vin": "VIN1"}], now=T0)
+    unlimited.serve(RequestError("down"), now=now)
+    assert unlimited.next_interval(now=now) == timedelta(minutes=120)
+
+
+def test_no_limit_when_max_staleness_is_zero():
+    cache = StaleDataCache(0, timedelta(minutes=15))
+    cache.record([{"vin": "VIN1"}], now=T0)
+    assert cache.serve(RequestError("down"), now=T0 + timedelta(days=30)) == [{"vin": "VIN1"}]
+    assert not cache.expired("VIN1", now=T0 + timedelta(days=30))
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_serves_last_good_data(monkeypatch):
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", FlakyClient)
+    hass = _hass()
+    entry = type("E", (), {"entry_id": "e1", "data": {}, "options": {"scan_interval": 10}, "title": "t"})()
+    assert await module_init.async_setup_entry(hass, entry)
+    data = hass.data["ha_opencarwings"]["e1"]
+    coordinator = data["coordinator"]
+
+    data["client"].fail = True
+    await coordinator.async_refresh()
+    assert coordinator.data == [{"vin": "VIN1", "ev_info": {"soc": 50}}]
+    assert coordinator.update_interval == timedelta(minutes=20)
+
+    added = []
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+    soc = next(e for e in added if e.unique_id == "ha_opencarwings_soc_VIN1")
+    assert soc.native_value == 50
+    assert soc.available
+    status = next(e for e in added if e.unique_id == "ha_opencarwings_status_VIN1")
+    assert status.extra_state_attributes["data_age"] >= 0
+
+    # past the maximum staleness the failure surfaces and the car's entities go unavailable
+    coordinator.stale_cache.max_staleness = timedelta(0)
+    with pytest.raises(UpdateFailed):
+        await coordinator.async_refresh()
+    assert not soc.available
+
+    coordinator.stale_cache.max_staleness = timedelta(minutes=120)
+    data["client"].fail = False
+    await coordinator.async_refresh()
+    assert soc.available
+    assert coordinator.update_interval == timedelta(minutes=10)
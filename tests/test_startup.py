@@ -0,0 +1,71 @@
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings import diagnostics
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+
+class MockClient:
+    def __init__(self, hass=None, base_url=None):
+        pass
+
+    def set_tokens(self, access, refresh):
+        pass
+
+    async def async_get_cars(self):
+        return [{"vin": "VIN1", "ev_info": {"soc": 50}}]
+
+    async def async_get_car_by_vin(self, vin, full=False):
+        return {"vin": vin, "odometer": 10}
+
+
+class ImportExecutorHass:
+    def __init__(self):
+        self.data = {}
+        self.import_jobs = []
+        self.config_entries = type("C", (), {"async_forward_entry_setups": self._forward})()
+
+    async def _forward(self, entry, platforms):
+        return None
+
+    async def async_add_import_executor_job(self, func, *args):
+        self.import_jobs.append(func)
+        return func(*args)
+
+
+def _entry(options):
+    return type("E", (), {"entry_id": "e1", "data": {}, "options": options, "title": "t"})()
+
+
+@pytest.mark.asyncio
+async def test_setup_records_timings_and_imports_off_loop(monkeypatch):
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", MockClient)
+    hass = ImportExecutorHass()
+
+    assert await module_init.async_setup_entry(hass, _entry({}))
+
+    data = hass.data["ha_opencarwings"]["e1"]
+    timings = data["setup_timings"]
+    for phase in ("client_ms", "first_refresh_ms", "platforms_ms", "total_ms"):
+        assert timings[phase] >= 0
+    # the field projection (which imports the platforms) ran in the import executor
+    assert module_init.car_projection in hass.import_jobs
+    # watch mode is opt-in and not set up by default
+    assert "watcher" not in data
+
+    diag = await diagnostics.async_get_config_entry_diagnostics(hass, _entry({}))
+    assert diag["setup_timings"] == timings
+
+
+@pytest.mark.asyncio
+async def test_watch_mode_set_up_only_when_enabled(monkeypatch):
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", MockClient)
+    hass = ImportExecutorHass()
+
+    assert await module_init.async_setup_entry(hass, _entry({"watch_interval": 30}))
+
+    data = hass.data["ha_opencarwings"]["e1"]
+    assert type(data["watcher"]).__name__ == "CarWatcher"
+    assert "command_request_time" in data["client"].__dict__.get("car_projection", {})
@@ -0,0 +1,97 @@
+from datetime import datetime, timedelta, timezone
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings.details import DetailCache
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+
+def _listed(vin, last_updated, soc, last_connection=None):
+    return {
+        "vin": vin,
+        "last_connection": last_connection or last_updated,
+        "ev_info": {"soc": soc, "last_updated": last_updated},
+    }
+
+
+class ListClient:
+    """Lite list with dynamic data; detail adds the odometer (counts detail calls)."""
+
+    def __init__(self, hass=None, base_url=None):
+        self.cars = [_listed("VIN1", "t1", 50), _listed("VIN2", "t1", 60)]
+        self.detail_calls = []
+
+    def set_tokens(self, access, refresh):
+        pass
+
+    async def async_get_cars(self):
+        return [dict(c) for c in self.cars]
+
+    async def async_get_car_by_vin(self, vin):
+        self.detail_calls.append(vin)
+        return {"vin": vin, "odometer": 1000 + len(self.detail_calls), "ev_info": {"soc": 0}}
+
+
+class StreamingListClient(ListClient):
+    async def async_iter_cars(self):
+        for car in await self.async_get_cars():
+            yield car
+
+
+def test_detail_due_on_first_sight_change_or_age():
+    cache = DetailCache(None, None, static_refresh_min=60)
+    car = _listed("VIN1", "t1", 50)
+    assert cache.is_due(car)
+    cache.resolve([car], ["VIN1"], [{"vin": "VIN1", "odometer": 5}])
+
+    assert not cache.is_due(_listed("VIN1", "t1", 51))
+    # a TCU contact without new car data doesn't make the detail due
+    assert not cache.is_due(_listed("VIN1", "t1", 51, last_connection="c2"))
+    # the fresh list entry wins over the reused detail
+    assert cache.reuse(_listed("VIN1", "t1", 51)) == {**_listed("VIN1", "t1", 51), "odometer": 5}
+    assert cache.is_due(_listed("VIN1", "t2", 51))
+    later = datetime.now(timezone.utc) + timedelta(minutes=61)
+    assert cache.is_due(_listed("VIN1", "t2", 51), now=later)
+
+    every_poll = DetailCache(None, None, static_refresh_min=0)
+    every_poll.resolve([car], ["VIN1"], [{"vin": "VIN1"}])
+    every_poll.is_due(car)
+    assert every_poll.is_due(car)
+
+
+async def _setup(monkeypatch, client_cls):
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", client_cls)
+
+    async def _forward(entry, platforms):
+        return None
+
+    config_entries = type("C", (), {"async_forward_entry_setups": staticmethod(_forward)})()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries})()
+    entry = type("E", (), {"entry_id": "e1", "data": {}, "options": {}, "title": "t"})()
+    assert await module_init.async_setup_entry(hass, entry)
+    return hass.data["ha_opencarwings"]["e1"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("client_cls", [ListClient, StreamingListClient])
+async def test_steady_state_refresh_is_the_list_call_only(monkeypatch, client_cls):
+    data = await _setup(monkeypatch, client_cls)
+    client, coordinator = data["client"], data["coordinator"]
+    assert sorted(client.detail_calls) == ["VIN1", "VIN2"]
+
+    # nothing reported by the cars: dynamic data from the list, static detail reused
+    client.cars = [_listed("VIN1", "t1", 55), _listed("VIN2", "t1", 65)]
+    await coordinator.async_refresh()
+    assert len(client.detail_calls) == 2
+    cars = {c["vin"]: c for c in coordinator.data}
+    assert cars["VIN1"]["ev_info"]["soc"] == 55
+    assert cars["VIN1"]["odometer"] in (1001, 1002)
+
+    # VIN2 connected since: only its detail is fetched again
+    client.cars = [_listed("VIN1", "t1", 55), _listed("VIN2", "t2", 70)]
+    await coordinator.async_refresh()
+    assert client.detail_calls[2:] == ["VIN2"]
+    assert {c["vin"]: c for c in coordinator.data}["VIN2"]["odometer"] == 1003
+    assert data["details"].detail_reuses == 3
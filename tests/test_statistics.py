@@ -0,0 +1,75 @@
+import sys
+import types
+
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings import statistics as stats_mod
+
+
+def _car(ts, soc, odometer=None):
+    car = {"vin": "VIN1", "nickname": "MyCar", "ev_info": {"last_updated": ts, "soc": soc}}
+    if odometer is not None:
+        car["odometer"] = odometer
+    return car
+
+
+@pytest.fixture
+def recorder_calls(monkeypatch):
+    calls = []
+    recorder = types.ModuleType("homeassistant.components.recorder")
+    statistics = types.ModuleType("homeassistant.components.recorder.statistics")
+    statistics.async_add_external_statistics = lambda hass, metadata, stats: calls.append((metadata, stats))
+    monkeypatch.setitem(sys.modules, "homeassistant.components.recorder", recorder)
+    monkeypatch.setitem(sys.modules, "homeassistant.components.recorder.statistics", statistics)
+    return calls
+
+
+def test_hourly_buckets_mean_min_max():
+    agg = stats_mod.StatisticsAggregator(None)
+    assert agg.update([_car("2026-01-04T10:05:00Z", 40)]) is False
+    assert agg.update([_car("2026-01-04T10:35:00Z", 50)]) is False
+    # repeated report from the next poll is ignored
+    assert agg.update([_car("2026-01-04T10:35:00Z", 50)]) is False
+    assert agg.update([_car("2026-01-04T10:50:00Z", 60)]) is False
+    assert agg.update([_car("2026-01-04T11:05:00Z", 65)]) is True
+
+    rows = agg.pending(stats_mod.statistic_id("soc", "VIN1"))
+    assert len(rows) == 1
+    _hour, mean, low, high = rows[0]
+    assert (mean, low, high) == (50, 40, 60)
+
+
+def test_flush_imports_pending_hours_in_one_call(recorder_calls):
+    agg = stats_mod.StatisticsAggregator(None)
+    for hour in range(10, 14):
+        agg.update([_car(f"2026-01-04T{hour}:00:00Z", 40 + hour, odometer=1000 + hour)])
+
+    imported = agg.async_flush()
+
+    soc_calls = [c for c in recorder_calls if c[0]["statistic_id"] == "ha_opencarwings:soc_vin1"]
+    assert len(soc_calls) == 1
+    metadata, stats = soc_calls[0]
+    assert metadata["source"] == "ha_opencarwings"
+    assert metadata["name"] == "MyCar State of Charge"
+    assert [s["mean"] for s in stats] == [50, 51, 52]
+    assert stats[0]["start"].isoformat() == "2026-01-04T10:00:00+00:00"
+    assert imported == 6  # 3 closed hours x (soc, odometer)
+
+    # nothing pending afterwards; a full re-import replays the local cache
+    recorder_calls.clear()
+    assert agg.async_flush() == 0
+    assert agg.async_flush(full=True) == 6
+
+
+@pytest.mark.asyncio
+async def test_car_value_sensors_have_state_class():
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"cars": [{"vin": "VIN1", "ev_info": {"soc": 50}}]}}}})()
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    by_id = {x.unique_id: x for x in added}
+    assert by_id["ha_opencarwings_soc_VIN1"]._attr_state_class == "measurement"
+    assert by_id["ha_opencarwings_range_acoff_VIN1"]._attr_state_class == "measurement"
+    assert by_id["ha_opencarwings_odometer_VIN1"]._attr_state_class == "total_increasing"
@@ -12,7 +12,8 @@ async def test_ac_switch_calls_api(monkeypatch):
 
         async def async_request(self, method, path, **kwargs):
             calls.append((method, path, kwargs))
-            class R: pass
+            class R:
+                status = 200
             return R()
 
     hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {"client": MockClient(None), "cars": [{"vin": "VIN1", "model_name": "M1"}]}}}})()
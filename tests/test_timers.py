@@ -0,0 +1,169 @@
+import pytest
+
+from custom_components.ha_opencarwings import switch as switch_mod
+from custom_components.ha_opencarwings import timers as timers_mod
+
+
+def _timer(timer_id=1, enabled=True, time="07:30"):
+    return {
+        "id": timer_id,
+        "name": "Morning",
+        "enabled": enabled,
+        "timer_type": 1,
+        "command_type": 3,
+        "weekday_mon": True,
+        "time": time,
+        "command_type_display": "A/C on",
+    }
+
+
+class TimersClient:
+    def __init__(self, timers):
+        self.timers = timers
+        self.gets = 0
+        self.puts = []
+        self.posts = []
+
+    async def async_get_timers(self, vin, cache=True):
+        self.gets += 1
+        self.cached_gets = getattr(self, "cached_gets", 0) + cache
+        return [dict(t) for t in self.timers]
+
+    async def async_update_timer(self, vin, timer_id, timer):
+        self.puts.append((vin, timer_id, timer))
+        return {**timer, "id": timer_id}
+
+    async def async_create_timer(self, vin, timer):
+        self.posts.append((vin, timer))
+        return {**timer, "id": 99}
+
+
+@pytest.mark.asyncio
+async def test_sync_refetches_only_when_timer_commands_change():
+    client = TimersClient([_timer()])
+    cache = timers_mod.TimerCache(client)
+    car = {"vin": "VIN1", "timer_commands": [_timer()]}
+
+    assert await cache.async_sync("VIN1", car) is True
+    assert await cache.async_sync("VIN1", car) is False
+    # lite list payload without timer_commands keeps the cache
+    assert await cache.async_sync("VIN1", {"vin": "VIN1"}) is False
+    assert client.gets == 1
+
+    car_changed = {"vin": "VIN1", "timer_commands": [_timer(time="08:00")]}
+    assert await cache.async_sync("VIN1", car_changed) is True
+    assert client.gets == 2
+    # the first fetch may come from the response cache, the change-driven one may not
+    assert client.cached_gets == 1
+
+
+@pytest.mark.asyncio
+async def test_set_timer_writes_only_diffs():
+    client = TimersClient([_timer()])
+    cache = timers_mod.TimerCache(client)
+    await cache.async_sync("VIN1", {"vin": "VIN1", "timer_commands": []})
+
+    # unchanged -> no write
+    await cache.async_set_timer("VIN1", {"id": 1, "enabled": True, "time": "07:30"})
+    assert client.puts == []
+
+    # changed -> one PUT carrying the full writable body
+    await cache.async_set_timer("VIN1", {"id": 1, "enabled": False})
+    assert len(client.puts) == 1
+    _, timer_id, payload = client.puts[0]
+    assert timer_id == 1
+    assert payload["enabled"] is False
+    assert payload["time"] == "07:30"
+    assert "command_type_display" not in payload
+    assert cache.get("VIN1", 1)["enabled"] is False
+
+    # no id -> POST
+    await cache.async_set_timer("VIN1", {"name": "Evening", "time": "18:00"})
+    assert client.posts == [("VIN1", {"name": "Evening", "time": "18:00"})]
+    assert cache.get("VIN1", 99)["name"] == "Evening"
+
+
+@pytest.mark.asyncio
+async def test_timer_switch_created_and_toggles():
+    client = TimersClient([_timer()])
+    cache = timers_mod.TimerCache(client)
+    await cache.async_sync("VIN1", {"vin": "VIN1"})
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "timers": cache,
+        "coordinator": None,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await switch_mod.async_setup_entry(hass, entry, added.extend)
+
+    timer_sw = next(x for x in added if x.unique_id == "ha_opencarwings_timer_VIN1_1")
+    assert timer_sw.name == "MyCar Timer Morning"
+    assert timer_sw.is_on is True
+    assert timer_sw.extra_state_attributes["weekdays"] == ["mon"]
+
+    await timer_sw.async_turn_off()
+    assert timer_sw.is_on is False
+    assert client.puts[-1][2]["enabled"] is False
+
+
+class ServicesStub:
+    """Validates the call data with the registered schema, like Home Assistant."""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def async_register(self, domain, service, handler, schema=None, **kwargs):
+        self.handlers[service] = (handler, schema)
+
+    async def async_call(self, service, data):
+        handler, schema = self.handlers[service]
+        return await handler(type("Call", (), {"data": schema(data) if schema else data})())
+
+
+class ListenerCoordinator:
+    def __init__(self, data):
+        self.data = data
+        self._listeners = []
+
+    def async_add_listener(self, listener):
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def async_update_listeners(self):
+        for listener in list(self._listeners):
+            listener()
+
+
+@pytest.mark.asyncio
+async def test_set_timer_service_coerces_id_and_adds_switch_for_new_timer():
+    import voluptuous as vol
+
+    from custom_components.ha_opencarwings.services import async_setup_services
+
+    client = TimersClient([_timer()])
+    cache = timers_mod.TimerCache(client)
+    await cache.async_sync("VIN1", {"vin": "VIN1"})
+    coordinator = ListenerCoordinator([{"vin": "VIN1", "nickname": "MyCar"}])
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": coordinator.data, "timers": cache, "coordinator": coordinator,
+    }}}, "services": ServicesStub()})()
+    async_setup_services(hass)
+
+    added = []
+    await switch_mod.async_setup_entry(hass, type("E", (), {"entry_id": "e1"})(), added.extend)
+    assert [x.unique_id for x in added if isinstance(x, switch_mod.CarTimerSwitch)] == ["ha_opencarwings_timer_VIN1_1"]
+
+    # a string id from YAML/UI updates the existing timer instead of creating one
+    await hass.services.async_call("set_timer", {"vin": "VIN1", "id": "1", "enabled": "off"})
+    assert client.posts == [] and client.puts[-1][1] == 1
+    assert cache.get("VIN1", 1)["enabled"] is False
+
+    await hass.services.async_call("set_timer", {"vin": "VIN1", "name": "Evening", "time": "18:00"})
+    new = [x for x in added if isinstance(x, switch_mod.CarTimerSwitch)]
+    assert [x.unique_id for x in new] == ["ha_opencarwings_timer_VIN1_1", "ha_opencarwings_timer_VIN1_99"]
+
+    with pytest.raises(vol.Invalid):
+        await hass.services.async_call("set_timer", {"vin": "VIN1", "time": "7 o'clock"})
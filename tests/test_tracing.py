@@ -0,0 +1,107 @@
+import asyncio
+import importlib
+
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings.dispatcher import CarUpdateDispatcher
+from custom_components.ha_opencarwings.tracing import RefreshTracer, span
+
+module_init = importlib.import_module("custom_components.ha_opencarwings")
+
+
+class ServicesStub:
+    def __init__(self):
+        self.handlers = {}
+
+    def async_register(self, domain, service, handler, **kwargs):
+        self.handlers[service] = handler
+
+
+class TracedClient:
+    def __init__(self, hass=None, base_url=None):
+        pass
+
+    def set_tokens(self, access, refresh):
+        pass
+
+    async def async_get_cars(self):
+        with span("GET /api/car/"):
+            await asyncio.sleep(0)
+        return [{"vin": "VIN1", "ev_info": {"soc": 50}}, {"vin": "VIN2", "ev_info": {"soc": 60}}]
+
+    async def async_get_car_by_vin(self, vin):
+        with span(f"GET /api/car/{vin}/"):
+            await asyncio.sleep(0)
+        return {"vin": vin, "odometer": 100}
+
+
+def _events(export, ph="X"):
+    return [e for e in export["traceEvents"] if e["ph"] == ph]
+
+
+def test_spans_outside_a_refresh_are_not_recorded_and_buffer_is_bounded():
+    tracer = RefreshTracer(max_traces=2)
+    with span("GET /api/probe/location/VIN1/"):
+        pass
+    for _ in range(3):
+        with tracer.trace():
+            with span("GET /api/car/"):
+                pass
+    export = tracer.export()
+    assert len(tracer) == 2
+    assert {e["pid"] for e in _events(export)} == {1, 2}
+    assert {e["name"] for e in _events(export)} == {"refresh", "GET /api/car/"}
+
+
+@pytest.mark.asyncio
+async def test_refresh_trace_covers_requests_merge_and_entity_writes(monkeypatch):
+    monkeypatch.setattr(module_init, "OpenCarWingsAPI", TracedClient)
+
+    async def _forward(entry, platforms):
+        return None
+
+    config_entries = type("C", (), {"async_forward_entry_setups": staticmethod(_forward)})()
+    hass = type("H", (), {"data": {}, "config_entries": config_entries, "services": ServicesStub()})()
+    # fetch the car detail on every poll so the traced refresh includes it
+    options = {"static_refresh_interval": 0}
+    entry = type("E", (), {"entry_id": "e1", "data": {}, "options": options, "title": "t"})()
+    assert await module_init.async_setup_entry(hass, entry)
+    data = hass.data["ha_opencarwings"]["e1"]
+
+    added = []
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+    for entity in added:
+        entity.async_write_ha_state = lambda: None
+        await entity.async_added_to_hass()
+    await data["coordinator"].async_refresh()
+    await asyncio.sleep(0)  # let the batched state writes run
+
+    response = await hass.services.handlers["export_trace"](type("Call", (), {"data": {"entry_id": "e1"}})())
+    events = _events(response["e1"])
+    last = max(e["pid"] for e in events)
+    names = [e["name"] for e in events if e["pid"] == last]
+    for name in ("refresh", "GET /api/car/", "GET /api/car/VIN1/", "GET /api/car/VIN2/",
+                 "car details", "merge details", "process cars", "listener fan-out", "entity writes"):
+        assert name in names
+    assert sum(n.startswith("write ") for n in names) == len([e for e in added if getattr(e, "_dispatcher", None)])
+    # concurrent detail requests are on their own lanes
+    lanes = {e["tid"] for e in events if e["pid"] == last and e["name"].startswith("GET /api/car/VIN")}
+    assert len(lanes) == 2
+
+
+def test_updates_without_a_refresh_are_not_traced():
+    tracer = RefreshTracer()
+    coordinator = type("Coord", (), {"data": [{"vin": "VIN1"}], "async_add_listener": lambda self, cb: (lambda: None)})()
+    dispatcher = CarUpdateDispatcher(None, coordinator, tracer)
+    written = []
+    entity = type("Ent", (), {"async_write_ha_state": lambda self: written.append(self)})()
+    dispatcher.async_register("VIN1", entity)
+
+    with tracer.trace():
+        pass
+    dispatcher._handle_coordinator_update()  # the refresh's own fan-out
+    dispatcher._handle_coordinator_update()  # e.g. a later location probe
+    spans = [e["name"] for e in _events(tracer.export())]
+    assert spans.count("listener fan-out") == 1
+    assert len(written) == 2
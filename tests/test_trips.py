@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.ha_opencarwings import sensor as sensor_mod
+from custom_components.ha_opencarwings import trips as trips_mod
+
+
+def _car(lat, lon, ts, running):
+    return {
+        "vin": "VIN1",
+        "location": {"lat": str(lat), "lon": str(lon), "last_updated": ts},
+        "ev_info": {"car_running": running},
+    }
+
+
+def test_location_history_ring_buffer_wraps():
+    hist = trips_mod.LocationHistory(capacity=3)
+    for i in range(5):
+        hist.append(float(i), 50.0 + i, 20.0)
+
+    assert len(hist) == 3
+    assert [s[0] for s in hist.samples()] == [2.0, 3.0, 4.0]
+    assert hist.last() == (4.0, 54.0, 20.0)
+
+
+def test_trip_segmented_from_running_and_movement():
+    tracker = trips_mod.TripTracker()
+    tracker.update([_car(50.0, 20.0, "2026-01-04T12:00:00Z", False)])
+    assert tracker.trip("VIN1") is None
+
+    tracker.update([_car(50.0, 20.0, "2026-01-04T12:01:00Z", True)])
+    assert tracker.is_active("VIN1")
+
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:11:00Z", True)])
+    # the same fix returned by the next poll is not a new sample
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:11:00Z", True)])
+    tracker.update([_car(50.2, 20.0, "2026-01-04T12:21:00Z", True)])
+    assert len(tracker.history("VIN1")) == 4
+
+    tracker.update([_car(50.2, 20.0, "2026-01-04T12:30:00Z", False)])
+    assert not tracker.is_active("VIN1")
+
+    trip = tracker.trip("VIN1")
+    assert trip["distance_km"] == pytest.approx(22.24, abs=0.05)
+    assert trip["duration_sec"] == 20 * 60
+
+
+def test_trip_ends_after_stationary_period_without_running_flag():
+    seg = trips_mod.TripSegmenter(stop_after_sec=600)
+    seg.add(0.0, 50.0, 20.0)
+    seg.add(60.0, 50.01, 20.0)
+    assert seg.active
+    assert seg.start_ts == 0.0
+
+    seg.add(300.0, 50.01, 20.0)
+    assert seg.active
+    seg.add(700.0, 50.01, 20.0)
+    assert not seg.active
+    assert seg.last_trip["duration_sec"] == 60.0
+
+
+def test_trip_ends_when_the_last_fix_repeats():
+    t0 = datetime(2026, 1, 4, 12, 0, tzinfo=timezone.utc)
+    tracker = trips_mod.TripTracker()
+    tracker.update([_car(50.0, 20.0, "2026-01-04T12:00:00Z", None)], now=t0)
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:05:00Z", None)], now=t0 + timedelta(minutes=5))
+    assert tracker.is_active("VIN1")
+
+    # later polls return the same moving fix: the trip ends after the stop timeout
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:05:00Z", None)], now=t0 + timedelta(minutes=10))
+    assert tracker.is_active("VIN1")
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:05:00Z", None)], now=t0 + timedelta(minutes=16))
+    assert not tracker.is_active("VIN1")
+    assert tracker.trip("VIN1")["duration_sec"] == 5 * 60
+
+    # a car reporting it stopped ends the trip right away
+    tracker.update([_car(50.2, 20.0, "2026-01-04T12:20:00Z", True)], now=t0 + timedelta(minutes=20))
+    assert tracker.is_active("VIN1")
+    tracker.update([_car(50.2, 20.0, "2026-01-04T12:20:00Z", False)], now=t0 + timedelta(minutes=21))
+    assert not tracker.is_active("VIN1")
+
+
+@pytest.mark.asyncio
+async def test_trip_sensors_created_with_trip_tracker():
+    tracker = trips_mod.TripTracker()
+    tracker.update([_car(50.0, 20.0, "2026-01-04T12:00:00Z", True)])
+    tracker.update([_car(50.1, 20.0, "2026-01-04T12:30:00Z", True)])
+
+    hass = type("H", (), {"data": {"ha_opencarwings": {"e1": {
+        "cars": [{"vin": "VIN1", "nickname": "MyCar"}],
+        "trips": tracker,
+    }}}})()
+
+    added = []
+    entry = type("E", (), {"entry_id": "e1"})()
+    await sensor_mod.async_setup_entry(hass, entry, added.extend)
+
+    dist = next(x for x in added if x.unique_id == "ha_opencarwings_trip_distance_VIN1")
+    dur = next(x for x in added if x.unique_id == "ha_opencarwings_trip_duration_VIN1")
+    assert dist.name == "MyCar Trip Distance"
+    assert dist.native_value == pytest.approx(11.12, abs=0.01)
+    assert dur.native_value == 30.0
+    assert dist.extra_state_attributes["trip_active"] is True
+    assert dist.extra_state_attributes["trip_start"] == "2026-01-04T12:00:00Z"
@@ -0,0 +1,77 @@
+import pytest
+
+from custom_components.ha_opencarwings import watch as watch_mod
+
+
+class FakeCoordinator:
+    def __init__(self, data):
+        self.data = data
+        self.published = []
+        self.refresh_requests = 0
+
+    def async_set_updated_data(self, data):
+        self.data = data
+        self.published.append(data)
+
+    async def async_request_refresh(self):
+        self.refresh_requests += 1
+
+
+class FakeClient:
+    def __init__(self, listed):
+        self.listed = listed
+        self.detail_calls = []
+
+    async def async_get_cars(self):
+        return self.listed
+
+    async def async_get_car_by_vin(self, vin, cache=True):
+        assert cache is False
+        self.detail_calls.append(vin)
+        return {"vin": vin, "odometer": 500, "command_request_time": "2026-01-04T12:05:00Z"}
+
+
+def _car(vin, last_connection, soc=50, **extra):
+    return {"vin": vin, "last_connection": last_connection, "ev_info": {"soc": soc, "last_updated": last_connection}, **extra}
+
+
+def test_car_changed_ignores_detail_only_fields():
+    known = _car("VIN1", "t1", command_request_time="c1")
+    assert watch_mod.car_changed(_car("VIN1", "t1"), known) is False
+    assert watch_mod.car_changed(_car("VIN1", "t2"), known) is True
+
+
+@pytest.mark.asyncio
+async def test_poll_fetches_detail_only_for_changed_cars():
+    coord = FakeCoordinator([_car("VIN1", "t1", odometer=100), _car("VIN2", "t1", odometer=200)])
+    client = FakeClient([_car("VIN1", "t1"), _car("VIN2", "t2", soc=80)])
+    processed = []
+
+    async def _process(cars):
+        processed.append(cars)
+
+    watcher = watch_mod.CarWatcher(None, client, coord, process=_process)
+
+    assert await watcher.async_poll() == ["VIN2"]
+    assert client.detail_calls == ["VIN2"]
+    cars = {c["vin"]: c for c in coord.data}
+    assert cars["VIN1"]["odometer"] == 100
+    assert cars["VIN2"]["odometer"] == 500
+    assert cars["VIN2"]["ev_info"]["soc"] == 80
+    assert processed == [coord.data]
+
+    # nothing changed since: list only, no detail requests, nothing published
+    assert await watcher.async_poll() == []
+    assert client.detail_calls == ["VIN2"]
+    assert len(coord.published) == 1
+
+
+@pytest.mark.asyncio
+async def test_new_car_triggers_full_refresh():
+    coord = FakeCoordinator([_car("VIN1", "t1")])
+    client = FakeClient([_car("VIN1", "t1"), _car("VIN3", "t1")])
+    watcher = watch_mod.CarWatcher(None, client, coord)
+
+    assert await watcher.async_poll() == []
+    assert coord.refresh_requests == 1
+    assert client.detail_calls == []